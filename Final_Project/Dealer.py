@@ -1,7 +1,17 @@
+import random
+
+from events import Events
+from rules import DEFAULT_RULES
+
+
 class Dealer:
-    def __init__(self):
+    def __init__(self, rules=None, shuffler=None):
         self.hand = []
         self.total = 0
+        self.rules = rules if rules is not None else DEFAULT_RULES
+        self.shuffler = shuffler  # optional ShoeShuffler for seeded, reproducible shoes
+        self.shoe_index = 0       # number of the next shoe the shuffler will produce
+        self.events = Events()    # replaced by the Game's shared Events
 
     def deal_cards(self, deck, num_cards=1):
         dealt_cards = []
@@ -10,20 +20,62 @@ class Dealer:
                 dealt_cards.append(deck.pop())
             else:
                 break
+        hook = self.events.card_drawn
+        if hook:
+            for card in dealt_cards:
+                hook(card)
         return dealt_cards
-    
-    def shuffle_deck(self, deck):
-        import random
-        random.shuffle(deck)
+
+    def shuffle_deck(self, deck, shoe_index=None):
+        """
+        Shuffle the shoe in place. With a seeded shuffler the result is shoe
+        number `shoe_index` (default: the next one), so any shoe can be regenerated.
+        """
+        if self.shuffler is None:
+            random.shuffle(deck)
+            return
+        if shoe_index is not None:
+            self.shoe_index = shoe_index
+        self.shuffler.shuffle(deck, self.shoe_index)
+        self.shoe_index += 1
 
     def get_total(self):
         total = 0
+        ace_count = 0
 
         for card in self.hand:
             total += card.point_value
+            if card.rank == 'Ace':
+                ace_count += 1
+
+        # Count Aces as 1 instead of 11 while the hand would bust
+        while total > 21 and ace_count > 0:
+            total -= 10
+            ace_count -= 1
         self.total = total
         return self.total
-    
-    def has_soft_17(self):
+
+    def is_soft(self):
+        """True when an Ace in the hand is still being counted as 11."""
+        hard_total = sum(1 if card.rank == 'Ace' else card.point_value for card in self.hand)
         has_ace = any(card.rank == 'Ace' for card in self.hand)
-        return has_ace and self.get_total() == 17
\ No newline at end of file
+        return has_ace and hard_total + 10 <= 21
+
+    def has_soft_17(self):
+        return self.get_total() == 17 and self.is_soft()
+
+    def should_hit(self):
+        """Dealer draws below 17, and on soft 17 when the rules say so."""
+        total = self.get_total()
+        if total < 17:
+            return True
+        return total == 17 and self.rules.dealer_hits_soft_17 and self.is_soft()
+
+    def play_hand(self, deck):
+        """Draw cards according to the rules until the dealer stands. Returns the final total."""
+        while self.should_hit():
+            new_card = self.deal_cards(deck, num_cards=1)
+            if not new_card:
+                break  # Deck is empty
+            self.hand.append(new_card[0])
+        return self.get_total()
@@ -1,9 +1,46 @@
+import random
+
 from card import Card
+from events import Events
+
+
+class GameSnapshot:
+    """
+    Round state captured by Game.snapshot(). Cards are never mutated, so the
+    lists are kept as tuples of the same Card objects instead of deep copies.
+    """
+    __slots__ = ('deck', 'buffer', 'dealer_hand', 'player_hands', 'current_hand_index', 'state',
+                 'doubled_down', 'game_status', 'round', 'settlement', 'shoe_index', 'rng_state')
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields[name])
+
 
 class Game:
     MAX_ROUNDS = 50
+    MIN_CARDS_PER_ROUND = 10
+
+    def __init__(self, dealer, player, rules=None, seed=None, infinite_deck=False, events=None):
+        # The table rules are shared by every participant of the game
+        self.rules = rules if rules is not None else dealer.rules
+        dealer.rules = self.rules
+        # So are the event hooks (see events.py)
+        self.events = events if events is not None else Events()
+        dealer.events = player.events = self.events
+        self.infinite_deck = infinite_deck
+        if infinite_deck:
+            # Cards are drawn i.i.d. from an endless deck: no shoe, no reshuffles
+            from infinite_deck import AliasSampler
+            self.card_sampler = AliasSampler([1.0] * 52, seed=seed)
+        elif seed is not None:
+            # Imported lazily: numpy is only needed for seeded games
+            from shuffler import ShoeShuffler
+            dealer.shuffler = ShoeShuffler.shared(seed, self.rules.shoe_size())
+        player.rules = self.rules
+        if hasattr(player.strategy, 'set_rules'):
+            player.strategy.set_rules(self.rules)
 
-    def __init__(self, dealer, player):
         self.dealer = dealer
         self.dealer_hand = dealer.hand
         
@@ -14,14 +51,33 @@ class Game:
         self.deck_count = 0
         self.initialize_deck()
 
+        # (round, dealer hand, player hands) the current settlement belongs to
+        self._settled_round = None
+        self._settlement = []
+
         self.round = 1
 
     def initialize_deck(self):
         suits = ['Hearts', 'Diamonds', 'Clubs', 'Spades']
         ranks = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'Jack', 'Queen', 'King', 'Ace']
-        self.deck = [Card(suit, rank) for suit in suits for rank in ranks]
+        if self.infinite_deck:
+            from infinite_deck import InfiniteDeck
+            self.deck = InfiniteDeck(self.card_sampler, [Card(suit, rank) for suit in suits for rank in ranks])
+        else:
+            self.deck = [Card(suit, rank)
+                         for _ in range(self.rules.num_decks)
+                         for suit in suits for rank in ranks]
         self.deck_count = len(self.deck)
 
+    def needs_shuffle(self):
+        """True once the shoe has been dealt past the rules' penetration."""
+        return len(self.deck) < max(self.rules.reshuffle_threshold(), self.MIN_CARDS_PER_ROUND)
+
+    def reshuffle(self, shoe_index=None):
+        self.initialize_deck()
+        if not self.infinite_deck:
+            self.dealer.shuffle_deck(self.deck, shoe_index)
+
     def new_round(self):
         self.dealer.hand = self.dealer.deal_cards(self.deck, num_cards=2)
         self.dealer.total = 0
@@ -33,29 +89,149 @@ class Game:
         self.player.update_state(self.dealer.hand[0])
 
         self.round += 1
+        self._settled_round = None
+        hook = self.events.deal
+        if hook:
+            hook(self.player.hands[0], self.dealer.hand[0])
+
+    def dealer_peek(self):
+        """Hole-card check: True when the dealer has a natural (only possible with an Ace or ten up)."""
+        if len(self.dealer.hand) != 2 or self.dealer.hand[0].point_value < 10:
+            return False
+        return self.dealer.get_total() == 21
+
+    def dealer_needs_to_play(self):
+        """The dealer only draws when some player hand is neither busted nor a natural."""
+        if self.dealer_peek():
+            return False
+        return any(self.player.get_total(i) <= 21 and not self.is_player_blackjack(i)
+                   for i in range(len(self.player.hands)))
+
+    def settle(self):
+        """
+        Finish the round: play the dealer if needed and settle every player hand
+        (splits and doubles included) in one pass. The dealer is played at most
+        once per deal, however often this is called; a new round, or new dealer
+        or player hand lists, make it settle afresh.
+
+        Returns:
+            list: net result of each player hand in units of the initial bet
+        """
+        if not self._is_settled():
+            self._settled_round = (self.round, self.dealer.hand, self.player.hands)
+            hook = self.events.dealer_reveal
+            if hook and len(self.dealer.hand) > 1:
+                hook(self.dealer.hand[1], self.dealer.hand)
+            if self.dealer_needs_to_play():
+                self.dealer.play_hand(self.deck)
+            self._settlement = [self.hand_reward(i) for i in range(len(self.player.hands))]
+            hook = self.events.settle
+            if hook:
+                hook(self._settlement)
+        return self._settlement
+
+    def surrender(self):
+        """Settle the round by late surrender: half the bet is lost and the dealer does not play."""
+        self._settled_round = (self.round, self.dealer.hand, self.player.hands)
+        self._settlement = [-0.5]
+        hook = self.events.settle
+        if hook:
+            hook(self._settlement)
+        return self._settlement
+
+    def _is_settled(self):
+        settled = self._settled_round
+        return (settled is not None and settled[0] == self.round
+                and settled[1] is self.dealer.hand and settled[2] is self.player.hands)
+
+    def snapshot(self):
+        """
+        Capture the round so restore() can branch from it any number of times:
+        the shoe (remaining cards in dealing order), both sides' hands and
+        per-hand flags, the settlement and the shuffling RNG (the seeded
+        shuffler's next shoe number, the `random` module's state otherwise, or
+        the infinite deck's sampler and its drawn buffer). The cards seen so
+        far, and so any running count, follow from the shoe.
+        """
+        if self.infinite_deck:
+            deck, buffer = None, tuple(self.deck._buffer)
+            rng_state = self.card_sampler.rng.bit_generator.state
+        else:
+            deck, buffer = tuple(self.deck), None
+            rng_state = random.getstate() if self.dealer.shuffler is None else None
+        settled = self._is_settled()
+        return GameSnapshot(
+            deck=deck, buffer=buffer,
+            dealer_hand=tuple(self.dealer.hand),
+            player_hands=tuple(tuple(hand) for hand in self.player.hands),
+            current_hand_index=self.player.current_hand_index,
+            state=tuple(self.player.state),
+            doubled_down=tuple(self.player.doubled_down),
+            game_status=self.player.game_status,
+            round=self.round,
+            settlement=tuple(self._settlement) if settled else None,
+            shoe_index=self.dealer.shoe_index,
+            rng_state=rng_state)
+
+    def restore(self, snapshot, rng=True):
+        """
+        Put the game back in the state captured by snapshot(); the snapshot stays reusable.
+
+        Args:
+            rng: also restore the shuffling RNG. Rollouts that deal their own
+                cards pass False, which for an infinite deck also keeps the
+                current draws instead of replaying the captured ones.
+        """
+        if self.infinite_deck:
+            if rng:
+                self.deck._buffer = list(snapshot.buffer)
+                self.card_sampler.rng.bit_generator.state = snapshot.rng_state
+        else:
+            self.deck = list(snapshot.deck)
+            if rng and snapshot.rng_state is not None:
+                random.setstate(snapshot.rng_state)
+        self.dealer.hand = list(snapshot.dealer_hand)
+        self.dealer.shoe_index = snapshot.shoe_index
+        self.player.hands = [list(hand) for hand in snapshot.player_hands]
+        self.player.current_hand_index = snapshot.current_hand_index
+        self.player.state = list(snapshot.state)
+        self.player.doubled_down = list(snapshot.doubled_down)
+        self.player.game_status = snapshot.game_status
+        self.round = snapshot.round
+        if snapshot.settlement is None:
+            self._settled_round, self._settlement = None, []
+        else:
+            self._settled_round = (self.round, self.dealer.hand, self.player.hands)
+            self._settlement = list(snapshot.settlement)
 
     def determine_winner(self):
-        player_total = self.player.get_total()
-        dealer_total = self.dealer.get_total()
+        self.settle()
+        return self.compare_hand()
 
-        # Dealer hits on soft 17 or any total less than 17
-        while (dealer_total < 17) or (dealer_total == 17 and self.dealer.has_soft_17()):
-            new_card = self.dealer.deal_cards(self.deck, num_cards=1)
-            if new_card:
-                self.dealer.hand.append(new_card[0])
-                dealer_total = self.dealer.get_total()
-            else:
-                break  # Deck is empty
+    def compare_hand(self, hand_index=None):
+        """
+        Compare one player hand against the dealer's (already played) hand.
+
+        Returns:
+            str: 'player', 'dealer' or 'draw'
+        """
+        if hand_index is None:
+            hand_index = self.player.current_hand_index
+        player_total = self.player.get_total(hand_index)
+        dealer_total = self.dealer.get_total()
+        player_blackjack = self.is_player_blackjack(hand_index)
+        dealer_blackjack = dealer_total == 21 and len(self.dealer.hand) == 2
 
         if player_total > 21:
             return 'dealer'
-        elif dealer_total > 21:
-            return 'player'
-        elif player_total == 21 and len(self.player.get_current_hand()) == 2:
-            # Player has blackjack
-            if dealer_total == 21 and len(self.dealer.hand) == 2:
+        elif player_blackjack:
+            if dealer_blackjack:
                 return 'draw'  # Both have blackjack
             return 'player'
+        elif dealer_blackjack:
+            return 'dealer'
+        elif dealer_total > 21:
+            return 'player'
         elif player_total > dealer_total:
             return 'player'
         elif dealer_total > player_total:
@@ -63,6 +239,27 @@ class Game:
         else:
             return 'draw'
 
+    def is_player_blackjack(self, hand_index=None):
+        """A natural only counts on the original two-card hand, never after a split."""
+        if hand_index is None:
+            hand_index = self.player.current_hand_index
+        hand = self.player.hands[hand_index]
+        return len(self.player.hands) == 1 and len(hand) == 2 and self.player.get_total(hand_index) == 21
+
+    def hand_reward(self, hand_index):
+        """Net result of one hand in units of the initial bet, using the rules' payouts."""
+        winner = self.compare_hand(hand_index)
+        doubled = hand_index < len(self.player.doubled_down) and self.player.doubled_down[hand_index]
+        stake = 2.0 if doubled else 1.0
+
+        if winner == 'player':
+            if self.is_player_blackjack(hand_index):
+                return self.rules.blackjack_payout
+            return stake
+        elif winner == 'dealer':
+            return -stake
+        return 0.0
+
     def print_round(self):
         """Print the current round information"""
         print(f"Round: {self.round}")
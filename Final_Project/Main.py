@@ -28,8 +28,11 @@ def main():
         game.print_round()
         
         # Player's turn - handle all hands (in case of splits)
-        for hand_index in range(len(player.hands)):
+        # (a while loop, since splitting adds hands as we go)
+        hand_index = 0
+        while hand_index < len(player.hands):
             player.current_hand_index = hand_index
+            player.update_state(dealer.hand[0])
             
             if len(player.hands) > 1:
                 print(f"\nPlaying hand {hand_index + 1} of {len(player.hands)}")
@@ -60,42 +63,22 @@ def main():
                     break
                     
                 elif action == 'split':
-                    if player.can_split() and len(player.get_current_hand()) == 2:
-                        if player.split():
-                            print("Hand split!")
-                            # Deal one card to each split hand
-                            player.get_current_hand().append(dealer.deal_cards(game.deck, 1)[0])
-                            player.hands[-1].append(dealer.deal_cards(game.deck, 1)[0])
-                            player.update_state(dealer.hand[0])
-                        else:
-                            print("Cannot split this hand.")
-                            # Fallback to hit if split fails
-                            action = 'hit'
-                            continue
-                    else:
-                        print("Cannot split. Hitting instead.")
-                        card = player.hit(game.deck)
-                        if card:
-                            player.update_state(dealer.hand[0])
-                    
-                elif action == 'double down':
-                    if len(player.get_current_hand()) == 2:
-                        if player.double_down(game.deck):
-                            print("Doubled down!")
-                            player.update_state(dealer.hand[0])
-                            break  # Turn ends after double down
-                        else:
-                            print("Cannot double down. Deck might be empty.")
-                    else:
-                        print("Can only double down on initial 2-card hand. Hitting instead.")
-                        card = player.hit(game.deck)
-                        if card:
-                            player.update_state(dealer.hand[0])
+                    # Player only offers split on a splittable pair
+                    player.split()
+                    print("Hand split!")
+                    # Deal one card to each split hand
+                    player.get_current_hand().append(dealer.deal_cards(game.deck, 1)[0])
+                    player.hands[-1].append(dealer.deal_cards(game.deck, 1)[0])
+                    player.update_state(dealer.hand[0])
+
                 else:
-                    # Unknown action, default to stand
-                    print("Unknown action. Standing.")
-                    break
-        
+                    # 'double down', only offered on a hand that may double
+                    if player.double_down(game.deck):
+                        print("Doubled down!")
+                        player.update_state(dealer.hand[0])
+                    break  # Turn ends after double down
+            hand_index += 1
+
         # Determine winner
         print("\nDealer's turn...")
         print(f"Dealer reveals: {dealer.hand[1].get_rank()} of {dealer.hand[1].suit}")
@@ -1,11 +1,17 @@
+from events import Events
+from rules import DEFAULT_RULES
+from strategy import ACTION_BITS, HIT_OR_STAND, fallback_action, legal_action
+
 class Player:
-    def __init__(self, strategy):
+    def __init__(self, strategy, rules=None):
         self.hands = []  # For handling multiple hands in case of splits
         self.current_hand_index = 0
         self.state = []  # list of tuples: (player_total, dealer_visible_card, usable_ace)
         self.game_status = (0, 0, 0)  # (wins, losses, draws)
         self.strategy = strategy  # Placeholder for strategy implementation
         self.doubled_down = []  # parallel list to track which hands were doubled
+        self.rules = rules if rules is not None else DEFAULT_RULES
+        self.events = Events()  # replaced by the Game's shared Events
 
     def get_current_hand(self):
         return self.hands[self.current_hand_index]
@@ -14,6 +20,9 @@ class Player:
         card = deck.pop() if deck else None
         if card:
             self.get_current_hand().append(card)
+            hook = self.events.card_drawn
+            if hook:
+                hook(card)
         return card
 
     def _card_rank(self, card):
@@ -26,6 +35,8 @@ class Player:
         hand = self.get_current_hand()
         if len(hand) != 2:
             return False
+        if len(self.hands) > self.rules.max_splits:
+            return False
         rank0 = self._card_rank(hand[0])
         rank1 = self._card_rank(hand[1])
         return rank0 is not None and rank0 == rank1
@@ -45,13 +56,27 @@ class Player:
             self.state.append((0, None, False))
         return True
 
+    def can_double(self):
+        """Doubling is allowed on 2-card hands; after a split only if the rules allow DAS."""
+        if len(self.get_current_hand()) != 2:
+            return False
+        return len(self.hands) == 1 or self.rules.double_after_split
+
+    def legal_actions(self):
+        """Bitmask (strategy.ACTION_BITS) of the actions allowed on the current hand."""
+        legal = HIT_OR_STAND
+        if self.can_double():
+            legal |= ACTION_BITS['double down']
+        if self.can_split():
+            legal |= ACTION_BITS['split']
+        return legal
+
     def double_down(self, deck):
         """
         Perform double down: allowed only on 2-card hands.
         Returns True if double down performed, False otherwise.
         """
-        hand = self.get_current_hand()
-        if len(hand) == 2:
+        if self.can_double():
             card = self.hit(deck)
             # ensure doubled_down list is long enough
             while len(self.doubled_down) < len(self.hands):
@@ -114,7 +139,8 @@ class Player:
 
     def determine_action(self):
         """
-        Ask the strategy for action based on the stored state of the current hand.
+        Ask the strategy for a legal action on the current hand, passing it the
+        legal-action bitmask. Pairs go to the strategy's pair chart if it has one.
         It is expected that update_state(dealer_upcard) was called prior to this.
         """
         # Defensive: if state not prepared, fallback to computing total with no dealer card
@@ -125,7 +151,18 @@ class Player:
             usable = False
             self.state.append((total, fake_dealer, usable))
 
-        return self.strategy.determine_action(self.state[self.current_hand_index])
+        state = self.state[self.current_hand_index]
+        legal = self.legal_actions()
+        if legal & ACTION_BITS['split'] and hasattr(self.strategy, 'determine_action_for_pair'):
+            # Pair charts answer without a mask (e.g. 5s double even where the table forbids it)
+            rank = self._card_rank(self.get_current_hand()[0])
+            action = fallback_action(self.strategy.determine_action_for_pair(rank, state[1]), legal)
+        else:
+            action = legal_action(self.strategy, state, legal)
+        hook = self.events.decision
+        if hook:
+            hook(state, legal, action)
+        return action
 
     def get_total(self, hand_index=None):
         """
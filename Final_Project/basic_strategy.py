@@ -41,9 +41,50 @@ class BasicStrategy(Strategy):
                 return "double down"
             return "hit"
 
-        # Default: do not split (not needed for tests)
+        # Small pairs: splitting against weak upcards is only worth it
+        # when the table allows doubling after the split
+        das = self.rules.double_after_split
+
+        # 7s: split 2–7
+        if rank == "7":
+            if 2 <= dealer_value <= 7:
+                return "split"
+            return "hit"
+
+        # 6s: split 2–6 with DAS, 3–6 without
+        if rank == "6":
+            if (3 if not das else 2) <= dealer_value <= 6:
+                return "split"
+            return "hit"
+
+        # 2s and 3s: split 2–7 with DAS, 4–7 without
+        if rank in ["2", "3"]:
+            if (4 if not das else 2) <= dealer_value <= 7:
+                return "split"
+            return "hit"
+
+        # 4s: split 5–6 only with DAS
+        if rank == "4" and das and dealer_value in [5, 6]:
+            return "split"
+
+        # Default: do not split
         return "hit"
 
+    # Surrender Logic
+    def should_surrender(self, total, dealer_card):
+        """Late surrender decision for a hard two-card total (only if the rules offer it)."""
+        if not self.rules.late_surrender:
+            return False
+        dealer_value = self._normalize_dealer_card(dealer_card)
+
+        # Hard 16 surrenders vs 9, 10, A
+        if total == 16 and dealer_value >= 9:
+            return True
+        # Hard 15 surrenders vs 10, and vs A when the dealer hits soft 17
+        if total == 15:
+            return dealer_value == 10 or (dealer_value == 11 and self.rules.dealer_hits_soft_17)
+        return False
+
     # Main Decision Function
     def determine_action(self, state):
         total, dealer_card, usable_ace = state
@@ -71,8 +112,11 @@ class BasicStrategy(Strategy):
                 else:
                     return "hit"
 
-            # Hard 11: always double
+            # Hard 11: always double, except vs A in a multi-deck S17 game
             if total == 11:
+                if (dealer_value == 11 and self.rules.num_decks > 1
+                        and not self.rules.dealer_hits_soft_17):
+                    return "hit"
                 return "double down"
 
             # Hard 10: double 2–9, hit 10–A
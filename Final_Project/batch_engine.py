@@ -0,0 +1,127 @@
+import numpy as np
+
+from rules import DEFAULT_RULES
+from tabular import flat_state_index, HIT, STAND, DOUBLE
+
+# Hard value of each of the 13 ranks 2..10, Jack, Queen, King, Ace (Ace counted as 1)
+RANK_VALUES = np.array([2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10, 1], dtype=np.int16)
+MAX_DECISIONS = 12
+
+
+def draw_values(rng, size):
+    """Hard card values drawn i.i.d. from an infinite deck."""
+    return RANK_VALUES[rng.integers(0, 13, size=size)]
+
+
+def hand_totals(hard, has_ace):
+    """Best totals and soft flags for arrays of hard totals (Aces as 1) and Ace flags."""
+    soft = has_ace & (hard + 10 <= 21)
+    return np.where(soft, hard + 10, hard), soft
+
+
+def play_dealer(rng, hard, has_ace, hits_soft_17=True):
+    """Draw for every dealer hand until it stands. Returns the final totals (above 21 = bust)."""
+    hard = hard.copy()
+    has_ace = has_ace.copy()
+    while True:
+        total, soft = hand_totals(hard, has_ace)
+        drawing = (total < 17) | ((total == 17) & soft & hits_soft_17)
+        if not drawing.any():
+            return total
+        values = draw_values(rng, int(drawing.sum()))
+        hard[drawing] += values
+        has_ace[drawing] |= values == 1
+
+
+def run_episodes(rng, n, select_action, rules=None, sample_dealer=False):
+    """
+    Play `n` independent single-hand rounds from an infinite deck, all at once.
+
+    Args:
+        rng: numpy Generator
+        n: number of rounds
+        select_action: callable(states, first) -> action indices (HIT/STAND/DOUBLE) for
+            the given flat state indices; `first` is True on the first decision,
+            the only one where doubling is allowed
+        rules: Rules (dealer soft 17 and blackjack payout are used)
+        sample_dealer: sample dealer final totals from the cached infinite-deck
+            outcome table instead of drawing the dealer's cards
+
+    Returns:
+        (states, actions, rewards): states and actions have shape (MAX_DECISIONS, n)
+        with -1 where a round made no decision; rewards has shape (n,) and includes
+        the doubled stake. Rounds decided by a natural make no decision at all.
+    """
+    rules = rules if rules is not None else DEFAULT_RULES
+    p1, p2 = draw_values(rng, n), draw_values(rng, n)
+    player_hard = p1 + p2
+    player_ace = (p1 == 1) | (p2 == 1)
+    up, hole = draw_values(rng, n), draw_values(rng, n)
+    upcard = np.where(up == 1, 11, up)
+    dealer_hard = up + hole
+    dealer_ace = (up == 1) | (hole == 1)
+
+    player_bj = hand_totals(player_hard, player_ace)[0] == 21
+    dealer_bj = hand_totals(dealer_hard, dealer_ace)[0] == 21
+
+    states = np.full((MAX_DECISIONS, n), -1, dtype=np.int32)
+    actions = np.full((MAX_DECISIONS, n), -1, dtype=np.int8)
+    stake = np.ones(n)
+    active = ~player_bj & ~dealer_bj
+
+    for step in range(MAX_DECISIONS):
+        idx = np.flatnonzero(active)
+        if idx.size == 0:
+            break
+        total, soft = hand_totals(player_hard[idx], player_ace[idx])
+        s = flat_state_index(total, soft, upcard[idx])
+        a = np.asarray(select_action(s, step == 0))
+        if step > 0:
+            a = np.where(a == DOUBLE, HIT, a)  # doubling only on the first decision
+        states[step, idx] = s
+        actions[step, idx] = a
+
+        drawers = idx[a != STAND]
+        values = draw_values(rng, drawers.size)
+        player_hard[drawers] += values
+        player_ace[drawers] |= values == 1
+        stake[idx[a == DOUBLE]] = 2.0
+
+        active[idx[a != HIT]] = False
+        busted = hand_totals(player_hard[drawers], player_ace[drawers])[0] > 21
+        active[drawers[busted]] = False
+
+    player_final = hand_totals(player_hard, player_ace)[0]
+    dealer_final = hand_totals(dealer_hard, dealer_ace)[0]
+    needs_dealer = ~player_bj & ~dealer_bj & (player_final <= 21)
+    if sample_dealer:
+        from infinite_deck import dealer_states, sample_dealer_totals
+        states_needed = dealer_states(dealer_hard[needs_dealer], dealer_ace[needs_dealer])
+        dealer_final[needs_dealer] = sample_dealer_totals(rng, states_needed, rules.dealer_hits_soft_17)
+    else:
+        dealer_final[needs_dealer] = play_dealer(rng, dealer_hard[needs_dealer],
+                                                 dealer_ace[needs_dealer], rules.dealer_hits_soft_17)
+
+    rewards = np.sign(player_final - dealer_final).astype(float) * stake
+    rewards[dealer_final > 21] = stake[dealer_final > 21]
+    rewards[player_final > 21] = -stake[player_final > 21]
+    rewards[dealer_bj] = 0.0
+    rewards[dealer_bj & ~player_bj] = -1.0
+    rewards[player_bj & ~dealer_bj] = rules.blackjack_payout
+    return states, actions, rewards
+
+
+def episode_transitions(states, actions, rewards):
+    """
+    Turn run_episodes output into flat transition arrays. Rewards only arrive at
+    the end of a hand, so every non-final transition has reward 0.
+    """
+    steps, n = states.shape
+    valid = states >= 0
+    last = valid & ~np.vstack([valid[1:], np.zeros((1, n), dtype=bool)])
+    step_idx, episode_idx = np.nonzero(valid)
+    is_last = last[step_idx, episode_idx]
+    next_step = np.minimum(step_idx + 1, steps - 1)
+    next_states = np.where(is_last, states[step_idx, episode_idx], states[next_step, episode_idx])
+    return (states[step_idx, episode_idx], actions[step_idx, episode_idx].astype(np.int64),
+            np.where(is_last, rewards[episode_idx], 0.0).astype(np.float32), next_states, is_last)
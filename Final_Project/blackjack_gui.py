@@ -1,236 +1,460 @@
+import time
 import tkinter as tk
-from tkinter import ttk
-from card import Card
 from dealer import Dealer
 from player import Player
 from game import Game
-from Final_Project.basic_strategy import BasicStrategy
+from basic_strategy import BasicStrategy
 from random_strategy import RandomStrategy
 
+FELT = '#0D5E1F'
+CARD_WIDTH, CARD_HEIGHT = 60, 84
+CARD_OVERLAP = 20      # horizontal offset between cards of one hand
+FRAME_MS = 16          # one redraw tick, ~60 frames per second
+STEP_BUDGET = 0.010    # seconds of simulation per tick at full speed
+ANIMATION_FRAMES = 6
+RED_SUITS = ('Hearts', 'Diamonds')
+RANK_LABELS = {'Jack': 'J', 'Queen': 'Q', 'King': 'K', 'Ace': 'A'}
+
+
+class CardImages:
+    """
+    Card faces and the card back, rendered once into PhotoImages and reused.
+
+    With Pillow installed every face is a complete image; without it the faces
+    share one blank card and the rank and suit are drawn as a canvas text item.
+    """
+
+    def __init__(self, master):
+        try:
+            from PIL import Image, ImageDraw, ImageTk
+        except ImportError:
+            Image = None
+        self.complete_faces = Image is not None
+        self._faces = {}
+        if Image is not None:
+            self.back = ImageTk.PhotoImage(self._pil_back(Image, ImageDraw), master=master)
+            for suit in ('Hearts', 'Diamonds', 'Clubs', 'Spades'):
+                for rank in ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'Jack', 'Queen', 'King', 'Ace']:
+                    image = self._pil_face(Image, ImageDraw, rank, suit)
+                    self._faces[(rank, suit)] = ImageTk.PhotoImage(image, master=master)
+        else:
+            self.blank = self._tk_card(master, '#FFFFFF')
+            self.back = self._tk_card(master, '#1A3D8F')
+
+    def face(self, card):
+        if self.complete_faces:
+            return self._faces[(card.rank, card.suit)]
+        return self.blank
+
+    @staticmethod
+    def _tk_card(master, fill):
+        image = tk.PhotoImage(master=master, width=CARD_WIDTH, height=CARD_HEIGHT)
+        image.put('#333333', to=(0, 0, CARD_WIDTH, CARD_HEIGHT))
+        image.put(fill, to=(2, 2, CARD_WIDTH - 2, CARD_HEIGHT - 2))
+        return image
+
+    @staticmethod
+    def _pil_back(Image, ImageDraw):
+        image = Image.new('RGB', (CARD_WIDTH, CARD_HEIGHT), FELT)
+        draw = ImageDraw.Draw(image)
+        draw.rounded_rectangle((0, 0, CARD_WIDTH - 1, CARD_HEIGHT - 1), 6, fill='#1A3D8F', outline='white', width=2)
+        for y in range(8, CARD_HEIGHT - 8, 8):
+            draw.line((8, y, CARD_WIDTH - 8, y), fill='#2E56B8')
+        return image
+
+    @staticmethod
+    def _pil_face(Image, ImageDraw, rank, suit):
+        image = Image.new('RGB', (CARD_WIDTH, CARD_HEIGHT), FELT)
+        draw = ImageDraw.Draw(image)
+        draw.rounded_rectangle((0, 0, CARD_WIDTH - 1, CARD_HEIGHT - 1), 6, fill='white', outline='#333333')
+        color = '#C62828' if suit in RED_SUITS else '#111111'
+        label = RANK_LABELS.get(rank, rank)
+        draw.text((5, 3), label, fill=color)
+        draw.text((CARD_WIDTH - 6 - 6 * len(label), CARD_HEIGHT - 15), label, fill=color)
+        CardImages._pil_pip(draw, suit, CARD_WIDTH // 2, CARD_HEIGHT // 2, 11, color)
+        return image
+
+    @staticmethod
+    def _pil_pip(draw, suit, x, y, r, color):
+        """Suit symbol drawn from simple shapes, so no font with suit glyphs is needed."""
+        if suit == 'Diamonds':
+            draw.polygon([(x, y - r), (x + r * 0.75, y), (x, y + r), (x - r * 0.75, y)], fill=color)
+        elif suit == 'Hearts':
+            h = r / 2
+            draw.ellipse((x - r, y - r, x, y), fill=color)
+            draw.ellipse((x, y - r, x + r, y), fill=color)
+            draw.polygon([(x - r, y - h + 1), (x + r, y - h + 1), (x, y + r)], fill=color)
+        elif suit == 'Spades':
+            h = r / 2
+            draw.polygon([(x, y - r), (x + r, y + h - 1), (x - r, y + h - 1)], fill=color)
+            draw.ellipse((x - r, y - 1, x, y + r - 1), fill=color)
+            draw.ellipse((x, y - 1, x + r, y + r - 1), fill=color)
+            draw.polygon([(x, y + 2), (x + h, y + r + 2), (x - h, y + r + 2)], fill=color)
+        else:
+            t = r * 0.55
+            draw.ellipse((x - t, y - r, x + t, y - r + 2 * t), fill=color)
+            draw.ellipse((x - r, y - t / 2, x - r + 2 * t, y + 1.5 * t), fill=color)
+            draw.ellipse((x + r - 2 * t, y - t / 2, x + r, y + 1.5 * t), fill=color)
+            draw.polygon([(x, y), (x + t, y + r + 2), (x - t, y + r + 2)], fill=color)
 
-class BlackjackGUI:
-    def __init__(self, root, strategy):
-        self.root = root
-        self.root.title("Blackjack Simulation")
-        self.root.geometry("800x600")
-        self.root.configure(bg='#0D5E1F')
 
-        # Game components
-        self.dealer = Dealer()
-        self.player = Player(strategy)
-        self.game = Game(self.dealer, self.player)
-        self.strategy = strategy
+class Seat:
+    """One player at the table with its own Game view on the shared shoe and dealer."""
 
-        self.dealer.shuffle_deck(self.game.deck)
+    def __init__(self, game):
+        self.game = game
+        self.player = game.player
+        self.reward = 0.0         # result of the current round
+        self.bankroll = 0.0
+        self.surrendered = False
+        self.result = ''
 
-        self.simulating = False
-        self.delay = 700     # ms per step
 
+class BlackjackGUI:
+    def __init__(self, root, strategy, replay=None, seats=1, seed=None):
+        """
+        Args:
+            strategy: strategy for every seat, or a list with one strategy per seat
+            replay: optional (HandLog, first_hand) to step through recorded hands
+                    instead of dealing new ones (single seat)
+            seats: number of players at the table
+            seed: seeds the shoes as in simulate_games (a replay uses its log's seed)
+        """
+        self.root = root
+        self.root.title("Blackjack Simulation")
+        self.root.geometry("900x660")
+        self.root.configure(bg=FELT)
+
+        self._setup_table(strategy, replay, seats, seed)
         self.setup_ui()
+        self.images = CardImages(self.root)
+        self._shown = {}          # canvas key -> (item ids, drawn content, position)
+        self._moving = {}         # canvas key -> remaining animation frames
+        self._dirty = True
+        self._next_step = 0.0
 
         # Begin simulation
         self.root.after(1000, self.start_simulation)
+        self.root.after(FRAME_MS, self._tick)
+
+    def _setup_table(self, strategy, replay, seats, seed):
+        """Seats, dealer and shoe: everything the round script needs, without any widgets."""
+        strategies = list(strategy) if isinstance(strategy, (list, tuple)) else [strategy] * seats
+        self.replay_log, self.replay_hand = replay if replay else (None, 0)
+        rules = self.replay_log.rules if self.replay_log is not None else None
+        if self.replay_log is not None:
+            seed = self.replay_log.meta['seed']
+            strategies = strategies[:1]
+
+        # Every seat has its own Game, all sharing one dealer and one shoe
+        self.dealer = Dealer(rules)
+        self.seats = [Seat(Game(self.dealer, Player(s, rules), rules, seed=seed)) for s in strategies]
+        self.game = self.seats[0].game
+        self.player = self.seats[0].player
+        self.strategy = strategies[0]
+        self.game.reshuffle()
+        self._share_shoe()
+
+        self.round = 0
+        self.message = "Starting simulation..."
+        self.hole_hidden = True
+        self.active = None        # (seat index, hand index) being played
+        self.simulating = False
+        self.delay = 700          # ms per step
+        self._script = None
 
     # UI Layout
     def setup_ui(self):
-        title_frame = tk.Frame(self.root, bg='#0D5E1F')
-        title_frame.pack(pady=10)
-        tk.Label(title_frame, text="BLACKJACK SIMULATION", font=('Arial', 26, 'bold'),
-                 bg='#0D5E1F', fg='white').pack()
-
-        stats_frame = tk.Frame(self.root, bg='#0D5E1F')
-        stats_frame.pack(pady=10)
-
-        self.round_label = tk.Label(stats_frame, text="Round: 0",
-                                    font=('Arial', 14), bg='#0D5E1F', fg='white')
-        self.round_label.grid(row=0, column=0, padx=20)
-
-        self.wins_label = tk.Label(stats_frame, text="Wins: 0",
-                                   font=('Arial', 14), bg='#0D5E1F', fg='#4CAF50')
-        self.wins_label.grid(row=0, column=1, padx=20)
-
-        self.losses_label = tk.Label(stats_frame, text="Losses: 0",
-                                     font=('Arial', 14), bg='#0D5E1F', fg='#F44336')
-        self.losses_label.grid(row=0, column=2, padx=20)
-
-        self.draws_label = tk.Label(stats_frame, text="Draws: 0",
-                                    font=('Arial', 14), bg='#0D5E1F', fg='#FFC107')
-        self.draws_label.grid(row=0, column=3, padx=20)
-
-        # Dealer UI
-        dealer_frame = tk.Frame(self.root, bg='#0D5E1F')
-        dealer_frame.pack(pady=20)
-        tk.Label(dealer_frame, text="Dealer's Hand", font=('Arial', 16, 'bold'),
-                 bg='#0D5E1F', fg='white').pack()
-        self.dealer_cards_label = tk.Label(dealer_frame, text="", font=('Arial', 12),
-                                           bg='#0D5E1F', fg='white')
-        self.dealer_cards_label.pack()
-        self.dealer_total_label = tk.Label(dealer_frame, text="Total: ?", font=('Arial', 14),
-                                           bg='#0D5E1F', fg='white')
-        self.dealer_total_label.pack()
-
-        # Player UI
-        player_frame = tk.Frame(self.root, bg='#0D5E1F')
-        player_frame.pack(pady=20)
-        tk.Label(player_frame, text="Player Hand", font=('Arial', 16, 'bold'),
-                 bg='#0D5E1F', fg='white').pack()
-        self.player_cards_label = tk.Label(player_frame, text="", font=('Arial', 12),
-                                           bg='#0D5E1F', fg='white')
-        self.player_cards_label.pack()
-        self.player_total_label = tk.Label(player_frame, text="Total: 0",
-                                           font=('Arial', 14), bg='#0D5E1F', fg='white')
-        self.player_total_label.pack()
-
-        # Message label
-        self.message_label = tk.Label(self.root, text="Starting simulation...",
-                                      font=('Arial', 14, 'bold'), bg='#0D5E1F',
-                                      fg='yellow')
-        self.message_label.pack(pady=10)
-
-    # GUI Helpers
-    def format_card(self, card):
-        suits = {'Hearts': '♥', 'Diamonds': '♦', 'Clubs': '♣', 'Spades': '♠'}
-        return f"{card.rank}{suits.get(card.suit, '?')}"
-
-    def update_display(self, show_dealer=True):
-        # Stats
-        wins, losses, draws = self.player.game_status
-        self.round_label.config(text=f"Round: {self.game.round}")
-        self.wins_label.config(text=f"Wins: {wins}")
-        self.losses_label.config(text=f"Losses: {losses}")
-        self.draws_label.config(text=f"Draws: {draws}")
-
-        # Dealer cards
-        if show_dealer:
-            dealer_cards = " ".join(self.format_card(c) for c in self.dealer.hand)
-            self.dealer_total_label.config(text=f"Total: {self.dealer.get_total()}")
-        else:
-            dealer_cards = self.format_card(self.dealer.hand[0]) + " [Hidden]"
-            self.dealer_total_label.config(text="Total: ?")
-        self.dealer_cards_label.config(text=dealer_cards)
-
-        # Player cards
-        if self.player.hands:
-            cards = " ".join(self.format_card(c) for c in self.player.get_current_hand())
-            self.player_cards_label.config(text=cards)
-            self.player_total_label.config(text=f"Total: {self.player.get_total()}")
+        self.canvas = tk.Canvas(self.root, width=900, height=600, bg=FELT, highlightthickness=0)
+        self.canvas.pack()
+        controls = tk.Frame(self.root, bg=FELT)
+        controls.pack(fill='x')
+        tk.Label(controls, text="Step delay (ms)", bg=FELT, fg='white').pack(side='left', padx=10)
+        self.speed = tk.Scale(controls, from_=0, to=1500, orient='horizontal', length=300,
+                              bg=FELT, fg='white', highlightthickness=0,
+                              command=lambda value: setattr(self, 'delay', int(value)))
+        self.speed.set(self.delay)
+        self.speed.pack(side='left')
 
     # Simulation Control
     def start_simulation(self):
         self.simulating = True
-        self.run_round()
-
-    def run_round(self):
-        """Start a brand new round automatically."""
-
-        # Reshuffle at 25% deck penetration
-        if len(self.game.deck) < 13:
-            self.game.initialize_deck()
-            self.dealer.shuffle_deck(self.game.deck)
-            self.message_label.config(text="Reshuffling...")
-
-        # Reset player
-        self.player.hands = []
-        self.player.state = []
-        self.player.doubled_down = []
-        self.player.current_hand_index = 0
-
-        # Deal cards
-        self.player.hands.append(self.dealer.deal_cards(self.game.deck, 2))
-        self.dealer.hand = self.dealer.deal_cards(self.game.deck, 2)
-        self.player.update_state(self.dealer.hand[0])
-
-        self.game_active = True
-        self.message_label.config(text="Dealing cards...")
-        self.update_display(show_dealer=False)
-
-        # Begin player's automated turn after short delay
-        self.root.after(self.delay, self.player_turn)
-
-    def player_turn(self):
-        """Automated player action determined entirely by strategy."""
-        if not self.game_active:
-            return
-
-        # Ask strategy what to do
-        action = self.player.determine_action().lower()
-
-        if action == "hit":
-            self.message_label.config(text="Player hits")
-            self.player.hit(self.game.deck)
-            self.player.update_state(self.dealer.hand[0])
-            self.update_display(show_dealer=False)
-
-            # Check bust
-            if self.player.get_total() > 21:
-                self.message_label.config(text="Player busts!")
-                self.game_active = False
-                return self.root.after(self.delay, self.finish_round)
-
-            return self.root.after(self.delay, self.player_turn)
-
-        elif action == "stand":
-            self.message_label.config(text="Player stands")
-            self.game_active = False
-            return self.root.after(self.delay, self.finish_round)
-
-        elif action == "double down":
-            self.message_label.config(text="Player doubles down")
-            self.player.double_down(self.game.deck)
-            self.player.update_state(self.dealer.hand[0])
-            self.update_display(show_dealer=False)
-
-            # Bust check
-            if self.player.get_total() > 21:
-                self.message_label.config(text="Player busts after doubling!")
-            self.game_active = False
-            return self.root.after(self.delay, self.finish_round)
-
-        elif action == "split":
-            # BasicStrategy rarely splits, but GUI supports it.
-            if self.player.can_split():
-                self.message_label.config(text="Player splits")
-                self.player.split()
-                self.player.get_current_hand().append(self.dealer.deal_cards(self.game.deck, 1)[0])
-                self.player.hands[-1].append(self.dealer.deal_cards(self.game.deck, 1)[0])
-                self.player.update_state(self.dealer.hand[0])
-                self.update_display(show_dealer=False)
-            self.game_active = False
-            return self.root.after(self.delay, self.finish_round)
 
+    def _share_shoe(self):
+        for seat in self.seats[1:]:
+            seat.game.deck = self.game.deck
+
+    def _draw(self):
+        cards = self.dealer.deal_cards(self.game.deck, 1)
+        return cards[0] if cards else None
+
+    def _tick(self):
+        """The only scheduled callback: advance the simulation, then redraw what changed."""
+        now = time.perf_counter()
+        if self.simulating:
+            budget_end = now + STEP_BUDGET
+            while now >= self._next_step:
+                if self._script is None:
+                    self._script = self._round_script()
+                try:
+                    next(self._script)
+                except StopIteration:
+                    self._script = None
+                self._dirty = True
+                if self.delay > 0:
+                    self._next_step = now + self.delay / 1000.0
+                    break
+                now = time.perf_counter()
+                if now > budget_end:
+                    break  # at full speed, render once per frame and stay responsive
+        if self._dirty:
+            self.render()
+            self._dirty = False
+        self._animate()
+        self.root.after(FRAME_MS, self._tick)
+
+    def _round_script(self):
+        """
+        One round as a generator that yields after every visible step. The
+        decisions follow simulation.play_round exactly, so recorded hands replay
+        identically.
+        """
+        if self.replay_log is not None:
+            if self.replay_hand >= len(self.replay_log):
+                self.message = "End of recording"
+                self.simulating = False
+                yield
+                return
+            record = self.replay_log.record(self.replay_hand)
+            self.replay_log.prepare_game(self.game, record)
+            self.player.strategy = self.replay_log.replay_strategy(record)
+            self.message = f"Replaying hand {self.replay_hand}..."
+            self.replay_hand += 1
+        elif self.game.needs_shuffle() or len(self.game.deck) < Game.MIN_CARDS_PER_ROUND * len(self.seats):
+            self.game.reshuffle()
+            self._share_shoe()
+            self.message = "Reshuffling..."
+            yield
         else:
-            # Fallback
-            self.message_label.config(text="Strategy error — default standing")
-            self.game_active = False
-            return self.root.after(self.delay, self.finish_round)
-
-    def finish_round(self):
-        """Dealer turn + decide winner."""
-        self.update_display(show_dealer=True)
-
-        winner = self.game.determine_winner()
-
-        if winner == "player":
-            self.message_label.config(text="Player wins!", fg="#4CAF50")
-            self.player.update_game_status("win")
-        elif winner == "dealer":
-            self.message_label.config(text="Dealer wins!", fg="#F44336")
-            self.player.update_game_status("loss")
+            self.message = "Dealing cards..."
+
+        # Deal: the dealer's two cards, then two per seat, as Game.new_round does
+        self.round += 1
+        self.hole_hidden = True
+        self.active = None
+        self.dealer.hand = []
+        self.dealer.total = 0
+        for seat in self.seats:
+            seat.player.hands = [[]]
+            seat.player.current_hand_index = 0
+            seat.player.state = []
+            seat.player.doubled_down = []
+            seat.reward = 0.0
+            seat.surrendered = False
+            seat.result = ''
+        for _ in range(2):
+            self.dealer.hand.append(self._draw())
+            yield
+        for seat in self.seats:
+            for _ in range(2):
+                seat.player.hands[0].append(self._draw())
+                yield
+        upcard = self.dealer.hand[0]
+        for seat in self.seats:
+            seat.player.update_state(upcard)
+
+        if self.game.dealer_peek():
+            self.message = "Dealer has blackjack!"
         else:
-            self.message_label.config(text="Push!", fg="#FFC107")
-            self.player.update_game_status("push")
-
-        self.game.round += 1
-        self.update_display(show_dealer=True)
+            for index, seat in enumerate(self.seats):
+                yield from self._seat_turn(index, seat, upcard)
+
+        # Dealer turn, played once for the whole table
+        self.active = None
+        self.hole_hidden = False
+        self.message = "Dealer's turn"
+        yield
+        live = [seat for seat in self.seats if not seat.surrendered]
+        if any(seat.game.dealer_needs_to_play() for seat in live):
+            while self.dealer.should_hit() and self.game.deck:
+                self.dealer.hand.append(self._draw())
+                yield
+
+        for seat in self.seats:
+            seat.reward = -0.5 if seat.surrendered else sum(seat.game.settle())
+            seat.bankroll += seat.reward
+            if seat.reward > 0:
+                seat.player.update_game_status('win')
+                seat.result = f"+{seat.reward:g}"
+            elif seat.reward < 0:
+                seat.player.update_game_status('loss')
+                seat.result = f"{seat.reward:g}"
+            else:
+                seat.player.update_game_status('push')
+                seat.result = "Push"
+        self.message = "Round over"
+        yield
+        yield  # leave the result on the table for one more step
+
+    def _seat_turn(self, index, seat, upcard):
+        player, game = seat.player, seat.game
+        strategy = player.strategy
+        if game.is_player_blackjack(0):
+            self.message = f"Seat {index + 1}: Blackjack!"
+            yield
+            return
+        if (game.rules.late_surrender and hasattr(strategy, 'should_surrender')
+                and not player.state[0][2] and strategy.should_surrender(player.get_total(), upcard)):
+            seat.surrendered = True
+            self.message = f"Seat {index + 1} surrenders"
+            yield
+            return
 
-        # Automatically begin new round
-        self.root.after(self.delay * 2, self.run_round)
+        hand_index = 0
+        while hand_index < len(player.hands):
+            player.current_hand_index = hand_index
+            self.active = (index, hand_index)
+            if len(player.get_current_hand()) == 1:
+                player.get_current_hand().extend(self.dealer.deal_cards(game.deck, 1))
+                yield
+            player.update_state(upcard)
+
+            while player.get_total() <= 21:
+                action = player.determine_action()
+                self.message = f"Seat {index + 1}: {action}"
+
+                if action == 'stand':
+                    break
+                elif action == 'double down':
+                    player.double_down(game.deck)
+                    player.update_state(upcard)
+                    yield
+                    break
+                elif action == 'split':
+                    player.split()
+                    player.get_current_hand().extend(self.dealer.deal_cards(game.deck, 1))
+                    player.update_state(upcard)
+                elif not player.hit(game.deck):
+                    break
+                else:
+                    player.update_state(upcard)
+                yield
+            if player.get_total() > 21:
+                self.message = f"Seat {index + 1} busts!"
+                yield
+            hand_index += 1
+
+    # Rendering
+    def _scene(self):
+        """Everything that should be on the table now: canvas key -> (kind, x, y, content)."""
+        scene = {}
+        width = int(self.canvas['width'])
+        scene['message'] = ('text', width // 2, 40, (self.message, 'yellow', ('Arial', 16, 'bold')))
+        scene['round'] = ('text', 70, 20, (f"Round: {self.round}", 'white', ('Arial', 12)))
+
+        dealer_x = width // 2 - (len(self.dealer.hand) - 1) * CARD_OVERLAP // 2
+        for i, card in enumerate(self.dealer.hand):
+            shown = None if (i == 1 and self.hole_hidden) else card
+            scene[('dealer', i)] = ('card', dealer_x + i * CARD_OVERLAP, 130, shown)
+        total = "?" if self.hole_hidden else self.dealer.get_total()
+        scene['dealer_total'] = ('text', width // 2, 190, (f"Dealer: {total}", 'white', ('Arial', 13)))
+
+        seat_width = width / len(self.seats)
+        for s, seat in enumerate(self.seats):
+            center = seat_width * (s + 0.5)
+            hands = seat.player.hands
+            spacing = min(150, seat_width / max(1, len(hands)))
+            for h, hand in enumerate(hands):
+                x = center + (h - (len(hands) - 1) / 2) * spacing - (len(hand) - 1) * CARD_OVERLAP / 2
+                for c, card in enumerate(hand):
+                    scene[('seat', s, h, c)] = ('card', int(x + c * CARD_OVERLAP), 380, card)
+                label = f"{seat.player.get_total(h)}"
+                if h < len(seat.player.doubled_down) and seat.player.doubled_down[h]:
+                    label += " x2"
+                color = 'yellow' if self.active == (s, h) else 'white'
+                scene[('total', s, h)] = ('text', int(center + (h - (len(hands) - 1) / 2) * spacing), 440,
+                                          (label, color, ('Arial', 12, 'bold')))
+            wins, losses, draws = seat.player.game_status
+            scene[('stats', s)] = ('text', int(center), 500,
+                                   (f"Seat {s + 1}   W {wins}  L {losses}  D {draws}   "
+                                    f"Bankroll {seat.bankroll:+g}", 'white', ('Arial', 11)))
+            scene[('result', s)] = ('text', int(center), 470, (seat.result, '#4CAF50' if seat.reward > 0
+                                    else '#F44336' if seat.reward < 0 else '#FFC107', ('Arial', 13, 'bold')))
+        return scene
+
+    def render(self):
+        """Diff the scene against what is drawn: create, update or delete only the items that changed."""
+        scene = self._scene()
+        for key in [k for k in self._shown if k not in scene]:
+            for item in self._shown.pop(key)[0]:
+                self.canvas.delete(item)
+            self._moving.pop(key, None)
+
+        for key, (kind, x, y, content) in scene.items():
+            shown = self._shown.get(key)
+            if shown is None:
+                items = self._create(kind, content)
+                start = (x, y)
+                if kind == 'card' and self.delay >= 100:
+                    start = (int(self.canvas['width']) - 70, 60)  # fly in from the shoe
+                    self._moving[key] = ANIMATION_FRAMES
+                self._place(items, start)
+                self._shown[key] = (items, content, start, (x, y))
+                continue
+            items, drawn, position, _ = shown
+            if drawn is not content and drawn != content:
+                self._update(kind, items, content)
+            if key not in self._moving and position != (x, y):
+                self._place(items, (x, y))
+                position = (x, y)
+            self._shown[key] = (items, content, position, (x, y))
+
+    def _create(self, kind, content):
+        if kind == 'text':
+            text, color, font = content
+            return (self.canvas.create_text(0, 0, text=text, fill=color, font=font),)
+        items = (self.canvas.create_image(0, 0, anchor='nw'),)
+        if not self.images.complete_faces:
+            items += (self.canvas.create_text(0, 0, anchor='nw', font=('Arial', 11, 'bold')),)
+        self._update(kind, items, content)
+        return items
+
+    def _update(self, kind, items, content):
+        if kind == 'text':
+            text, color, font = content
+            self.canvas.itemconfigure(items[0], text=text, fill=color, font=font)
+            return
+        card = content
+        self.canvas.itemconfigure(items[0], image=self.images.back if card is None else self.images.face(card))
+        if len(items) > 1:
+            label = '' if card is None else RANK_LABELS.get(card.rank, card.rank) + card.suit[0]
+            self.canvas.itemconfigure(items[1], text=label,
+                                      fill='#C62828' if card is not None and card.suit in RED_SUITS else '#111111')
+
+    def _place(self, items, position):
+        x, y = position
+        self.canvas.coords(items[0], x, y)
+        if len(items) > 1:
+            self.canvas.coords(items[1], x + 5, y + 4)
+
+    def _animate(self):
+        """Move flying cards one frame closer to their place on the table."""
+        for key in list(self._moving):
+            items, content, (x, y), (tx, ty) = self._shown[key]
+            frames = self._moving[key]
+            position = (x + (tx - x) / frames, y + (ty - y) / frames)
+            self._place(items, position)
+            self._shown[key] = (items, content, position, (tx, ty))
+            if frames <= 1:
+                del self._moving[key]
+            else:
+                self._moving[key] = frames - 1
 
 
 def main():
     root = tk.Tk()
     strategy = BasicStrategy()   # Change to RandomStrategy() to compare
-    app = BlackjackGUI(root, strategy)
+    app = BlackjackGUI(root, strategy)   # seats=3 to fill the table
     root.mainloop()
 
 
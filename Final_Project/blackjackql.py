@@ -0,0 +1,276 @@
+"""
+blackjackql — headless command-line entry point.
+
+    python blackjackql.py simulate --strategy basic --hands 100000 --seed 1
+    python blackjackql.py compare --strategy basic --strategy random --hands 20000
+    python blackjackql.py train --method mc --episodes 10000000 --output mc_policy.npz
+    python blackjackql.py plot --strategy random --strategy basic --output strategy_comparison.png
+    python blackjackql.py report --strategy mc_policy.npz --output errors.json --heatmap errors.png
+
+Every subcommand prints a single JSON document. Seeded simulate, compare and
+plot requests are served from the on-disk result cache when possible. Only the standard library and
+the game engine are imported at startup; numpy, scipy and matplotlib are
+imported inside the subcommands that need them, so short simulation jobs do
+not pay for them.
+"""
+import argparse
+import json
+import sys
+import time
+
+from rules import Rules
+from strategy_loader import load_strategy
+
+
+def build_rules(args):
+    return Rules(num_decks=args.decks, dealer_hits_soft_17=not args.s17,
+                 double_after_split=not args.no_das, max_splits=args.max_splits,
+                 late_surrender=args.surrender, blackjack_payout=args.payout,
+                 penetration=args.penetration)
+
+
+def open_cache(args):
+    """The on-disk result cache, unless disabled. Only seeded runs are ever cached."""
+    if args.no_cache:
+        return None
+    from result_cache import ResultCache, DEFAULT_CACHE_DIR
+    return ResultCache(args.cache_dir or DEFAULT_CACHE_DIR)
+
+
+def summarize(result, keep_rewards=False):
+    summary = {key: value for key, value in result.items() if key != 'rewards'}
+    if keep_rewards:
+        summary['rewards'] = result['rewards']
+    return summary
+
+
+def cmd_simulate(args):
+    from simulation import simulate_games
+
+    start = time.time()
+    if args.stratified:
+        from stratified import simulate_stratified
+        output = simulate_stratified(load_strategy(args.strategy), args.hands, rules=build_rules(args),
+                                     seed=args.seed, infinite_deck=args.infinite_deck)
+    else:
+        result = simulate_games(load_strategy(args.strategy), args.hands, rules=build_rules(args),
+                                seed=args.seed, cache=open_cache(args), cache_rewards=args.rewards,
+                                infinite_deck=args.infinite_deck)
+        output = summarize(result, args.rewards)
+    output.update(strategy=args.strategy, hands=args.hands, seed=args.seed,
+                  rules=build_rules(args).as_dict(), infinite_deck=args.infinite_deck,
+                  stratified=args.stratified, seconds=round(time.time() - start, 3))
+    return output
+
+
+def cmd_compare(args):
+    from simulation import simulate_games
+
+    rules = build_rules(args)
+    seed = args.seed if args.seed is not None else 0  # strategies must share the same shoes
+    cache = open_cache(args)
+    results = {}
+    rewards = {}
+    for spec in args.strategy:
+        result = simulate_games(load_strategy(spec), args.hands, rules=rules, seed=seed, cache=cache,
+                                infinite_deck=args.infinite_deck)
+        rewards[spec] = result['rewards']
+        results[spec] = summarize(result)
+
+    output = {'hands': args.hands, 'seed': seed, 'rules': rules.as_dict(),
+              'infinite_deck': args.infinite_deck, 'results': results}
+    if len(args.strategy) == 2:
+        from scipy.stats import ttest_ind
+
+        a, b = args.strategy
+        t_stat, p_value = ttest_ind(rewards[a], rewards[b], equal_var=False)
+        output['t_test'] = {'a': a, 'b': b, 't_statistic': float(t_stat), 'p_value': float(p_value)}
+    return output
+
+
+def warm_start_table(spec, rules):
+    """Starting Q-table for --warm-start: 'exact' EVs, or the chart of a load_strategy() spec."""
+    if spec is None:
+        return None
+    from warm_start import chart_q_table, exact_q_table
+    if spec == 'exact':
+        return exact_q_table(rules)
+    return chart_q_table(load_strategy(spec), rules=rules)
+
+
+def cmd_train(args):
+    rules = build_rules(args)
+    start = time.time()
+    q_table = warm_start_table(args.warm_start, rules)
+    if args.method == 'mc':
+        from monte_carlo import MonteCarloControl
+        strategy = MonteCarloControl(rules=rules, seed=args.seed or 0, q_table=q_table).train(
+            args.episodes, processes=args.processes)
+    elif args.method == 'qlearning':
+        from qlearning_strategy import QLearningStrategy
+        learner = QLearningStrategy(q_table=q_table, learning_rate=args.learning_rate, seed=args.seed,
+                                    exploration_rate=args.exploration_rate,
+                                    exploration_decay=args.exploration_decay,
+                                    min_exploration_rate=0.01)
+        strategy = learner.train(args.episodes, rules=rules).greedy()
+    elif args.method in ('sarsa-lambda', 'q-lambda'):
+        from eligibility_traces import QLambdaStrategy, SarsaLambdaStrategy
+        learner_class = SarsaLambdaStrategy if args.method == 'sarsa-lambda' else QLambdaStrategy
+        learner = learner_class(trace_decay=args.trace_decay, q_table=q_table,
+                                learning_rate=args.learning_rate, seed=args.seed,
+                                exploration_rate=args.exploration_rate,
+                                exploration_decay=args.exploration_decay, min_exploration_rate=0.01)
+        strategy = learner.train(args.episodes, rules=rules).greedy()
+    elif args.method == 'dyna':
+        from dyna import DynaQStrategy
+        learner = DynaQStrategy(planning_steps=args.planning_steps, prioritized=args.prioritized,
+                                q_table=q_table, learning_rate=args.learning_rate, seed=args.seed,
+                                exploration_rate=args.exploration_rate,
+                                exploration_decay=args.exploration_decay, min_exploration_rate=0.01)
+        strategy = learner.train(args.episodes, rules=rules).greedy()
+    elif args.method == 'hogwild':
+        from hogwild import HogwildTrainer
+        trainer = HogwildTrainer(num_workers=args.processes, learning_rate=args.learning_rate,
+                                 exploration_rate=args.exploration_rate,
+                                 exploration_decay=args.exploration_decay, rules=rules,
+                                 seed=args.seed or 0, q_table=q_table)
+        strategy = trainer.train(args.episodes).greedy()
+    else:
+        from neural_q import NeuralQStrategy
+        strategy = NeuralQStrategy(seed=args.seed or 0)
+        if q_table is not None:
+            from warm_start import clone_policy
+            clone_policy(strategy, q_table)
+        strategy.train(args.episodes, rules=rules)
+    strategy.save(args.output)
+    return {'method': args.method, 'episodes': args.episodes, 'output': args.output,
+            'seconds': round(time.time() - start, 3)}
+
+
+def cmd_report(args):
+    from strategy_report import error_cost_report, write_report
+
+    report = error_cost_report(load_strategy(args.strategy), build_rules(args))
+    write_report(report, args.output, heatmap=args.heatmap, top=args.top)
+    return {'strategy': args.strategy, 'output': args.output, 'heatmap': args.heatmap,
+            **{key: report[key] for key in ('optimal_ev', 'strategy_ev', 'total_cost')},
+            'worst': [{key: cell[key] for key in ('context', 'total', 'soft', 'pair', 'upcard',
+                                                    'chosen', 'best', 'cost')}
+                      for cell in report['cells'][:5]]}
+
+
+def cmd_plot(args):
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import numpy as np
+
+    comparison = cmd_compare(args)
+    names = list(comparison['results'])
+    results = [comparison['results'][name] for name in names]
+
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+    x = np.arange(len(names))
+    width = 0.25
+    ax1.bar(x - width, [r['wins'] for r in results], width, label='Wins', color='#4CAF50')
+    ax1.bar(x, [r['losses'] for r in results], width, label='Losses', color='#F44336')
+    ax1.bar(x + width, [r['draws'] for r in results], width, label='Draws', color='#FFC107')
+    ax1.set_xticks(x)
+    ax1.set_xticklabels(names)
+    ax1.set_ylabel('Number of Games')
+    ax1.set_title('Game Outcomes')
+    ax1.legend()
+    ax1.grid(axis='y', alpha=0.3)
+
+    ax2.bar(x, [r['avg_reward'] for r in results], 0.5,
+            yerr=[1.96 * r['std_error'] for r in results], color='#2196F3')
+    ax2.set_xticks(x)
+    ax2.set_xticklabels(names)
+    ax2.set_ylabel('Avg Reward per Hand (95% CI)')
+    ax2.set_title('Performance')
+    ax2.grid(axis='y', alpha=0.3)
+
+    plt.tight_layout()
+    plt.savefig(args.output, dpi=150, bbox_inches='tight')
+    plt.close(fig)
+    comparison['output'] = args.output
+    return comparison
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='blackjackql', description=__doc__.split('\n\n')[0])
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    rules_args = argparse.ArgumentParser(add_help=False)
+    rules_args.add_argument('--decks', type=int, default=1)
+    rules_args.add_argument('--s17', action='store_true', help='dealer stands on soft 17')
+    rules_args.add_argument('--no-das', action='store_true', help='no double after split')
+    rules_args.add_argument('--max-splits', type=int, default=3)
+    rules_args.add_argument('--surrender', action='store_true', help='late surrender allowed')
+    rules_args.add_argument('--payout', type=float, default=1.5, help='blackjack payout')
+    rules_args.add_argument('--penetration', type=float, default=0.75)
+    rules_args.add_argument('--infinite-deck', action='store_true', help='draw cards i.i.d., no shoe')
+    rules_args.add_argument('--seed', type=int, default=None)
+    rules_args.add_argument('--cache-dir', default=None, help='result cache directory')
+    rules_args.add_argument('--no-cache', action='store_true', help='always re-simulate')
+
+    simulate = subparsers.add_parser('simulate', parents=[rules_args], help='simulate one strategy')
+    simulate.add_argument('--strategy', default='basic')
+    simulate.add_argument('--hands', type=int, default=10_000)
+    simulate.add_argument('--rewards', action='store_true', help='include per-hand rewards')
+    simulate.add_argument('--stratified', action='store_true',
+                          help='stratify over the initial deal (fresh-shoe EV, no per-hand rewards)')
+    simulate.set_defaults(func=cmd_simulate)
+
+    for name, func, help_text in [('compare', cmd_compare, 'compare strategies on the same shoes'),
+                                  ('plot', cmd_plot, 'compare strategies and save a chart')]:
+        sub = subparsers.add_parser(name, parents=[rules_args], help=help_text)
+        sub.add_argument('--strategy', action='append', required=True)
+        sub.add_argument('--hands', type=int, default=10_000)
+        sub.set_defaults(func=func)
+        if name == 'plot':
+            sub.add_argument('--output', default='strategy_comparison.png')
+
+    report = subparsers.add_parser('report', parents=[rules_args],
+                                   help='per-decision EV cost against optimal play (infinite deck)')
+    report.add_argument('--strategy', default='basic')
+    report.add_argument('--output', default='error_report.json')
+    report.add_argument('--heatmap', default=None, help='also save a heatmap PNG here')
+    report.add_argument('--top', type=int, default=None, help='keep only the most costly cells')
+    report.set_defaults(func=cmd_report)
+
+    train = subparsers.add_parser('train', parents=[rules_args], help='train a policy and save it')
+    train.add_argument('--method', choices=['mc', 'qlearning', 'sarsa-lambda', 'q-lambda', 'dyna', 'hogwild',
+                                             'neural'],
+                       default='mc')
+    train.add_argument('--episodes', type=int, default=1_000_000)
+    train.add_argument('--output', required=True, help='.npz file for the trained policy')
+    train.add_argument('--processes', type=int, default=None)
+    train.add_argument('--learning-rate', type=float, default=0.1)
+    train.add_argument('--exploration-rate', type=float, default=0.5)
+    train.add_argument('--exploration-decay', type=float, default=0.999)
+    train.add_argument('--trace-decay', type=float, default=0.8, help='lambda for the trace methods')
+    train.add_argument('--planning-steps', type=int, default=5,
+                       help='dyna: model updates per real transition')
+    train.add_argument('--prioritized', action='store_true', help='dyna: prioritized sweeping')
+    train.add_argument('--warm-start', default=None,
+                       help="start from 'exact' EVs or the chart of a strategy (e.g. 'basic')")
+    train.set_defaults(func=cmd_train)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        output = args.func(args)
+    except (OSError, ValueError) as e:
+        json.dump({'error': str(e)}, sys.stdout)
+        sys.stdout.write('\n')
+        return 1
+    json.dump(output, sys.stdout)
+    sys.stdout.write('\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,71 @@
+from functools import lru_cache
+
+# Final dealer results in the order used by every distribution tuple below
+OUTCOMES = (17, 18, 19, 20, 21, 'blackjack', 'bust')
+
+
+def full_shoe(num_decks=1):
+    """Card counts by point value 1 (Ace) .. 10 for an unplayed shoe."""
+    return tuple([4 * num_decks] * 9 + [16 * num_decks])
+
+
+@lru_cache(maxsize=None)
+def _dealer_draw(counts, hard_total, has_ace, num_cards, hits_soft_17):
+    """Probability of each final dealer result from a partial hand, drawing without replacement."""
+    soft = has_ace and hard_total + 10 <= 21
+    total = hard_total + 10 if soft else hard_total
+
+    if num_cards == 2 and total == 21:
+        return tuple(1.0 if o == 'blackjack' else 0.0 for o in OUTCOMES)
+    if total > 21:
+        return tuple(1.0 if o == 'bust' else 0.0 for o in OUTCOMES)
+    if total > 17 or (total == 17 and not (soft and hits_soft_17)):
+        return tuple(1.0 if o == total else 0.0 for o in OUTCOMES)
+
+    remaining = sum(counts)
+    result = [0.0] * len(OUTCOMES)
+    for index, count in enumerate(counts):
+        if count == 0:
+            continue
+        value = index + 1
+        next_counts = counts[:index] + (count - 1,) + counts[index + 1:]
+        branch = _dealer_draw(next_counts, hard_total + value, has_ace or value == 1,
+                              num_cards + 1, hits_soft_17)
+        weight = count / remaining
+        for i, p in enumerate(branch):
+            result[i] += weight * p
+    return tuple(result)
+
+
+@lru_cache(maxsize=None)
+def dealer_distribution(upcard, num_decks=1, hits_soft_17=True):
+    """
+    Exact distribution of the dealer's final hand for a given upcard.
+
+    Args:
+        upcard: dealer upcard value 2-11 (11 = Ace)
+        num_decks: decks in the shoe; only the upcard is removed from it
+        hits_soft_17: whether the dealer draws on soft 17
+
+    Returns:
+        dict mapping each entry of OUTCOMES to its probability
+    """
+    value = 1 if upcard == 11 else upcard
+    counts = list(full_shoe(num_decks))
+    counts[value - 1] -= 1
+    probs = _dealer_draw(tuple(counts), value, value == 1, 1, hits_soft_17)
+    return dict(zip(OUTCOMES, probs))
+
+
+def rules_dealer_distributions(rules):
+    """Dealer distributions for all ten upcards under a rule set (cached per deck count and H17/S17)."""
+    return {upcard: dealer_distribution(upcard, rules.num_decks, rules.dealer_hits_soft_17)
+            for upcard in range(2, 12)}
+
+
+def dealer_bust_probability(rules):
+    """Overall chance the dealer busts, weighting upcards by their frequency in a full shoe."""
+    upcard_weights = {upcard: 1 / 13 for upcard in range(2, 12)}
+    upcard_weights[10] = 4 / 13
+    distributions = rules_dealer_distributions(rules)
+    return sum(upcard_weights[u] * distributions[u]['bust'] for u in distributions)
@@ -0,0 +1,271 @@
+"""
+Local decision service with request micro-batching.
+
+Many tables (threads, or processes over a Unix socket) ask for decisions one
+state at a time; the service queues the requests and answers them with one
+batched `determine_legal_actions(states, legals)` call whenever `max_batch` requests are
+waiting or the oldest one has waited `max_delay` seconds.
+
+    service = DecisionService(NeuralQStrategy.load('policy.npz'))
+    simulate_games(ServiceStrategy(service), 100_000)   # from many threads
+    print(service.stats())
+"""
+import os
+import queue
+import socketserver
+import socket
+import struct
+import threading
+import time
+from collections import deque
+
+from strategy import ALL_ACTIONS, Strategy, legal_action
+from tabular import upcard_value
+
+# Wire format over the Unix socket: request (total, upcard 2-11, soft, legal-action bitmask),
+# reply one action byte
+REQUEST = struct.Struct('<bbbB')
+WIRE_ACTIONS = ('hit', 'stand', 'double down', 'split')
+WIRE_CODES = {action: code for code, action in enumerate(WIRE_ACTIONS)}
+
+
+class _Request:
+    __slots__ = ('state', 'legal', 'submitted', 'done', 'action', 'error')
+
+    def __init__(self, state, legal):
+        self.state = state
+        self.legal = legal
+        self.submitted = time.perf_counter()
+        self.done = threading.Event()
+        self.action = None
+        self.error = None
+
+
+class DecisionService:
+    """
+    Micro-batching front end for a strategy.
+
+    Args:
+        strategy: any Strategy; batch-friendly ones override determine_legal_actions()
+        max_batch: flush as soon as this many requests are queued
+        max_delay: flush once the oldest queued request has waited this long (seconds),
+            which bounds the queueing part of every request's latency
+        history: number of recent request latencies kept for the percentiles
+    """
+
+    def __init__(self, strategy, max_batch=256, max_delay=0.002, history=100_000):
+        self.strategy = strategy
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue = queue.SimpleQueue()
+        self._latencies = deque(maxlen=history)
+        self._batch_sizes = deque(maxlen=history)
+        self.decisions = 0
+        self.batches = 0
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name='decision-service', daemon=True)
+        self._running = True
+        self._thread.start()
+
+    def request(self, state, legal=ALL_ACTIONS):
+        """Blocking: the action for one state among those `legal` allows, answered as part of a batch."""
+        pending = _Request(state, legal)
+        self._queue.put(pending)
+        pending.done.wait()
+        if pending.error is not None:
+            raise pending.error
+        return pending.action
+
+    def close(self):
+        self._running = False
+        self._queue.put(None)
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _collect(self):
+        """Block for the first request, then gather more until the batch is full or its deadline passes."""
+        first = self._queue.get()
+        if first is None:
+            return None
+        batch = [first]
+        deadline = first.submitted + self.max_delay
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get_nowait() if remaining <= 0 else self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                self._running = False
+                break
+            batch.append(item)
+        return batch
+
+    def _decide(self, batch):
+        states = [r.state for r in batch]
+        legals = [r.legal for r in batch]
+        if hasattr(self.strategy, 'determine_legal_actions'):
+            return self.strategy.determine_legal_actions(states, legals)
+        return [legal_action(self.strategy, state, legal) for state, legal in zip(states, legals)]
+
+    def _run(self):
+        while self._running:
+            batch = self._collect()
+            if batch is None:
+                break
+            try:
+                actions = self._decide(batch)
+            except Exception as e:  # hand the failure to every waiting caller
+                for pending in batch:
+                    pending.error = e
+                    pending.done.set()
+                continue
+            now = time.perf_counter()
+            for pending, action in zip(batch, actions):
+                pending.action = action
+                self._latencies.append(now - pending.submitted)
+                pending.done.set()
+            self.decisions += len(batch)
+            self.batches += 1
+            self._batch_sizes.append(len(batch))
+
+    def stats(self):
+        """
+        Returns:
+            dict with decisions, batches, throughput (decisions/s since start),
+            mean batch size and p50/p99/max latency in milliseconds
+        """
+        latencies = sorted(self._latencies)
+        sizes = list(self._batch_sizes)
+
+        def percentile(p):
+            return 1000 * latencies[min(len(latencies) - 1, int(p * len(latencies)))] if latencies else 0.0
+
+        elapsed = time.perf_counter() - self.started
+        return {
+            'decisions': self.decisions,
+            'batches': self.batches,
+            'throughput': self.decisions / elapsed if elapsed > 0 else 0.0,
+            'mean_batch': sum(sizes) / len(sizes) if sizes else 0.0,
+            'p50_ms': percentile(0.50),
+            'p99_ms': percentile(0.99),
+            'max_ms': 1000 * latencies[-1] if latencies else 0.0,
+        }
+
+
+class ServiceStrategy(Strategy):
+    """
+    Strategy that forwards every decision to a shared DecisionService. The
+    rare pair and surrender decisions go straight to the served strategy.
+    """
+
+    def __init__(self, service):
+        self.service = service
+        if hasattr(service.strategy, 'determine_action_for_pair'):
+            self.determine_action_for_pair = service.strategy.determine_action_for_pair
+        if hasattr(service.strategy, 'should_surrender'):
+            self.should_surrender = service.strategy.should_surrender
+
+    @property
+    def wrapped(self):
+        return self.service.strategy
+
+    def set_rules(self, rules):
+        """Pass the table rules on to the served strategy, which answers every decision."""
+        super().set_rules(rules)
+        if hasattr(self.service.strategy, 'set_rules'):
+            self.service.strategy.set_rules(rules)
+
+    def determine_action(self, state):
+        return self.service.request(state)
+
+    def determine_legal_action(self, state, legal):
+        return self.service.request(state, legal)
+
+
+# Unix socket transport
+
+class _DecisionHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        service = self.server.service
+        stream = self.request.makefile('rwb', buffering=0)
+        while True:
+            data = stream.read(REQUEST.size)
+            if len(data) < REQUEST.size:
+                return
+            total, upcard, soft, legal = REQUEST.unpack(data)
+            action = service.request((total, upcard, bool(soft)), legal).lower()
+            stream.write(bytes([WIRE_CODES.get(action, WIRE_CODES['stand'])]))
+
+
+class _DecisionServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serve_unix(service, path):
+    """
+    Serve `service` on a Unix socket at `path` from a background thread.
+    Each connection gets its own thread, so requests from all clients meet in one batch queue.
+
+    Returns:
+        the server; call shutdown() and server_close() to stop it
+    """
+    if os.path.exists(path):
+        os.remove(path)
+    server = _DecisionServer(path, _DecisionHandler)
+    server.service = service
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class DecisionClient(Strategy):
+    """Strategy backed by a decision service in another process, over its Unix socket."""
+
+    def __init__(self, path):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(path)
+
+    def determine_action(self, state):
+        return self.determine_legal_action(state, ALL_ACTIONS)
+
+    def determine_legal_action(self, state, legal):
+        total, dealer_card, usable_ace = state
+        self.sock.sendall(REQUEST.pack(total, upcard_value(dealer_card), int(bool(usable_ace)), legal))
+        reply = self.sock.recv(1)
+        if not reply:
+            raise ConnectionError("decision service closed the connection")
+        return WIRE_ACTIONS[reply[0]]
+
+    def close(self):
+        self.sock.close()
+
+
+if __name__ == '__main__':
+    import sys
+    from neural_q import NeuralQStrategy
+    from simulation import simulate_games
+
+    tables = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    hands = 2_000
+    strategy = NeuralQStrategy(hidden=(256, 256))
+
+    start = time.perf_counter()
+    simulate_games(strategy, hands * 4, seed=0)
+    print(f"direct, one table: {hands * 4 / (time.perf_counter() - start):,.0f} hands/s")
+
+    with DecisionService(strategy, max_batch=tables, max_delay=0.005) as service:
+        threads = [threading.Thread(target=simulate_games, args=(ServiceStrategy(service), hands),
+                                    kwargs={'seed': t}) for t in range(tables)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        print(f"service, {tables} tables: {tables * hands / elapsed:,.0f} hands/s")
+        print(service.stats())
@@ -0,0 +1,165 @@
+"""
+Dyna-Q: Q-learning that also learns from a model of the game.
+
+Real hands come from batch_engine as usual. Every real transition is also
+counted in an empirical model, one count array over (state, action, next
+state or end of hand) plus the summed final rewards. After each real batch
+the learner plans: it replays `planning_steps` model transitions per real
+one, drawn and applied in vectorized chunks through td_batch_update.
+
+With prioritized sweeping, planning instead makes full expected backups from
+the model, each chunk taking the cells with the largest TD error under the
+model. The errors of all cells are recomputed (one matrix product) before
+every chunk, so the predecessors of cells whose values just moved are picked
+up without tracking them explicitly, and planning stops early once every
+error is under the threshold.
+"""
+import numpy as np
+
+from batch_engine import episode_transitions, run_episodes
+from qlearning_strategy import QLearningStrategy, td_batch_update
+from tabular import ACTIONS, NUM_STATES, STAND
+
+END = NUM_STATES  # model column for "the hand is over"
+
+
+class DynaQStrategy(QLearningStrategy):
+    """
+    Q-learning with Dyna planning from an empirical model.
+
+    Args:
+        planning_steps: model transitions replayed per real transition (0 is plain Q-learning)
+        prioritized: expected backups of the cells with the largest model TD
+            error (prioritized sweeping) instead of sampled transitions
+        priority_threshold: cells whose model TD error is below this are not planned
+    """
+
+    def __init__(self, planning_steps=5, prioritized=False, priority_threshold=1e-4, **kwargs):
+        super().__init__(**kwargs)
+        self.planning_steps = planning_steps
+        self.prioritized = prioritized
+        self.priority_threshold = priority_threshold
+        self.next_counts = np.zeros((NUM_STATES * len(ACTIONS), NUM_STATES + 1), dtype=np.int64)
+        self.reward_sum = np.zeros(NUM_STATES * len(ACTIONS))
+        self.real_hands = 0
+        self.planning_updates = 0
+        self.history = []
+
+    def observe(self, transitions):
+        """Add real transitions (episode_transitions output) to the model."""
+        s, a, r, s_next, done = transitions
+        cells = s * len(ACTIONS) + a
+        np.add.at(self.next_counts, (cells, np.where(done, END, s_next)), 1)
+        np.add.at(self.reward_sum, cells, r)
+
+    def model_td_errors(self):
+        """Expected TD error of every (state, action) cell under the model; 0 where unvisited."""
+        q = self.Q.reshape(-1)
+        visits = self.next_counts.sum(axis=1)
+        seen = visits > 0
+        later = self.Q.reshape(NUM_STATES, len(ACTIONS))[:, :STAND + 1]
+        values = np.append(self.discount_factor * later.max(axis=1), 0.0)  # nothing follows END
+        expected = (self.reward_sum[seen] + self.next_counts[seen] @ values) / visits[seen]
+        errors = np.zeros_like(q)
+        errors[seen] = expected - q[seen]
+        return errors
+
+    def plan(self, num_updates, chunk_size):
+        """
+        Apply `num_updates` planning updates in chunks of `chunk_size`.
+
+        Returns:
+            number of planning updates actually made (prioritized sweeping
+            stops early once every TD error is under the threshold)
+        """
+        q = self.Q.reshape(NUM_STATES, len(ACTIONS))
+        visits = self.next_counts.sum(axis=1)
+        ends = self.next_counts[:, END]
+        mean_final = np.divide(self.reward_sum, ends, out=np.zeros_like(self.reward_sum), where=ends > 0)
+        seen = (visits > 0).astype(float)
+        if seen.sum() == 0:
+            return 0
+        made = 0
+        while made < num_updates:
+            n = min(chunk_size, num_updates - made)
+            if self.prioritized:
+                # Full expected backups of the cells the model disagrees with most
+                errors = self.model_td_errors()
+                cells = np.argsort(-np.abs(errors))[:n]
+                cells = cells[np.abs(errors[cells]) >= self.priority_threshold]
+                if cells.size == 0:
+                    break
+                q.reshape(-1)[cells] += errors[cells]
+                made += cells.size
+                continue
+            cells = self._rng.choice(visits.size, size=n, p=seen / seen.sum())
+            cumulative = np.cumsum(self.next_counts[cells], axis=1)
+            draws = self._rng.random(n) * cumulative[:, -1]
+            outcome = (cumulative <= draws[:, None]).sum(axis=1)
+            done = outcome == END
+            transitions = (cells // len(ACTIONS), cells % len(ACTIONS),
+                           np.where(done, mean_final[cells], 0.0), np.where(done, 0, outcome), done)
+            td_batch_update(q, transitions, self.learning_rate, self.discount_factor)
+            made += n
+        self.planning_updates += made
+        return made
+
+    def train(self, num_episodes, batch_size=1000, rules=None, evaluate_every=None):
+        """
+        Learn from `num_episodes` real infinite-deck hands, planning after every batch.
+
+        Args:
+            evaluate_every: if set, every this many real hands append the exact
+                EV of the greedy policy to `history`, with the real hands and
+                planning updates spent so far
+        """
+        q = self.Q.reshape(NUM_STATES, len(ACTIONS))
+        done_episodes = 0
+        next_evaluation = evaluate_every
+        while done_episodes < num_episodes:
+            n = min(batch_size, num_episodes - done_episodes)
+            transitions = episode_transitions(*run_episodes(self._rng, n, self._select_action, rules))
+            td_batch_update(q, transitions, self.learning_rate, self.discount_factor)
+            self.observe(transitions)
+            real_steps = transitions[0].size
+            self.plan(self.planning_steps * real_steps, real_steps)
+
+            done_episodes += n
+            self.real_hands += n
+            self.exploration_rate = max(self.min_exploration_rate,
+                                        self.exploration_rate * self.exploration_decay)
+            if evaluate_every and done_episodes >= next_evaluation:
+                self.evaluate(rules)
+                next_evaluation += evaluate_every
+        self.episodes += num_episodes
+        return self
+
+    def evaluate(self, rules=None):
+        """Record the greedy policy's exact EV against the real hands and planning updates used."""
+        from strategy_report import error_cost_report
+        entry = {'real_hands': self.real_hands, 'planning_updates': self.planning_updates,
+                 'strategy_ev': error_cost_report(self.greedy(), rules)['strategy_ev']}
+        self.history.append(entry)
+        return entry
+
+
+def hands_to_reach(history, target_ev):
+    """Real hands spent before the greedy policy first reached `target_ev`, or None."""
+    for entry in history:
+        if entry['strategy_ev'] >= target_ev:
+            return entry['real_hands']
+    return None
+
+
+if __name__ == '__main__':
+    config = dict(learning_rate=0.05, exploration_rate=0.5, exploration_decay=0.99,
+                  min_exploration_rate=0.05, seed=0)
+    runs = [('Q-learning', DynaQStrategy(planning_steps=0, **config)),
+            ('Dyna-Q K=5', DynaQStrategy(planning_steps=5, **config)),
+            ('Dyna-Q K=20', DynaQStrategy(planning_steps=20, **config)),
+            ('Prioritized K=20', DynaQStrategy(planning_steps=20, prioritized=True, **config))]
+    for name, learner in runs:
+        learner.train(200_000, evaluate_every=20_000)
+        curve = ' '.join(f"{entry['strategy_ev'] * 100:7.3f}" for entry in learner.history)
+        print(f"{name:>17}: {curve}   ({learner.planning_updates:,} planning updates)")
+    print(f"{'':>17}  EV % of the greedy policy every 20,000 real hands")
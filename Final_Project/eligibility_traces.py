@@ -0,0 +1,155 @@
+"""
+SARSA(lambda) and Watkins's Q(lambda) for the tabular blackjack learners.
+
+A blackjack hand never returns to a state (every card raises the hard
+total), so an episode's eligibility trace is just the handful of (state,
+action) pairs it visited, decaying by gamma * lambda per step. Instead of a
+trace table, each batch keeps the run_episodes step arrays and sweeps them
+backwards once:
+
+    G_t = delta_t + gamma * lambda * c_t * G_{t+1}
+
+where c_t is 1 for SARSA(lambda) and, for Watkins's Q(lambda), 0 after an
+exploratory action (the trace is cut). G_t is the total update the trace
+delivers to (s_t, a_t); as in td_batch_update, updates that hit the same
+cell within a batch are averaged.
+"""
+import numpy as np
+
+from batch_engine import run_episodes
+from qlearning_strategy import QLearningStrategy
+from tabular import ACTIONS, ACTION_INDEX, NUM_STATES, STAND, state_index
+
+
+def lambda_batch_update(q, states, actions, rewards, learning_rate, trace_decay,
+                        discount_factor=1.0, off_policy=False, visits=None):
+    """
+    Apply one batch of SARSA(lambda) or Watkins Q(lambda) updates to `q` in place.
+
+    Args:
+        q: array (NUM_STATES, actions)
+        states, actions, rewards: run_episodes output; steps x episodes, -1 where unused
+        trace_decay: lambda; 0 gives one-step SARSA or Q-learning
+        off_policy: Watkins's Q(lambda): bootstrap from the greedy value and cut
+            the trace after a non-greedy action
+        visits: optional array accumulating the update counts
+    """
+    valid = states >= 0
+    s = np.where(valid, states, 0)
+    a = np.where(valid, actions, 0).astype(np.int64)
+    has_next = np.zeros_like(valid)
+    has_next[:-1] = valid[1:]
+    s_next = np.zeros_like(s)
+    s_next[:-1] = s[1:]
+    a_next = np.zeros_like(a)
+    a_next[:-1] = a[1:]
+
+    # After the first decision only hitting or standing remains possible
+    later = q[s_next, :STAND + 1]
+    greedy_next = later.max(axis=-1)
+    if off_policy:
+        bootstrap = greedy_next
+        taken = np.take_along_axis(later, np.minimum(a_next, STAND)[..., None], -1)[..., 0]
+        carry = has_next & (taken >= greedy_next)
+    else:
+        bootstrap = q[s_next, a_next]
+        carry = has_next
+    target = np.where(has_next, discount_factor * bootstrap, rewards[None, :])
+    delta = np.where(valid, target - q[s, a], 0.0)
+
+    returns = np.zeros_like(delta)
+    following = np.zeros(states.shape[1])
+    decay = discount_factor * trace_decay
+    for step in range(states.shape[0] - 1, -1, -1):
+        following = delta[step] + decay * np.where(carry[step], following, 0.0)
+        returns[step] = following
+
+    update_sum = np.zeros(q.shape)
+    counts = np.zeros(q.shape)
+    np.add.at(update_sum, (s[valid], a[valid]), returns[valid])
+    np.add.at(counts, (s[valid], a[valid]), 1)
+    touched = counts > 0
+    q[touched] += learning_rate * update_sum[touched] / counts[touched]
+    if visits is not None:
+        visits += counts.astype(visits.dtype)
+
+
+class SarsaLambdaStrategy(QLearningStrategy):
+    """
+    On-policy SARSA(lambda): the terminal reward reaches every decision of a
+    hand in the same update, discounted by lambda per step.
+
+    Args:
+        trace_decay: lambda in [0, 1]
+    """
+    off_policy = False
+
+    def __init__(self, trace_decay=0.8, **kwargs):
+        super().__init__(**kwargs)
+        if not 0.0 <= trace_decay <= 1.0:
+            raise ValueError("trace_decay must be between 0 and 1")
+        self.trace_decay = trace_decay
+
+    def update_episode(self, steps, reward):
+        """
+        Learn from one hand played elsewhere (e.g. through Game).
+
+        Args:
+            steps: list of (state, action) with state = (total, dealer_card, usable_ace)
+            reward: the hand's final result
+        """
+        if not steps:
+            return
+        flat = [np.ravel_multi_index(state_index(state), self.Q.shape[:3]) for state, _ in steps]
+        states = np.array(flat, dtype=np.int32)[:, None]
+        actions = np.array([ACTION_INDEX[action] for _, action in steps], dtype=np.int8)[:, None]
+        lambda_batch_update(self.Q.reshape(NUM_STATES, len(ACTIONS)), states, actions,
+                            np.array([float(reward)]), self.learning_rate, self.trace_decay,
+                            self.discount_factor, self.off_policy)
+
+    def train(self, num_episodes, batch_size=1000, rules=None):
+        """
+        Learn from `num_episodes` infinite-deck hands, played `batch_size` at a
+        time with the policy fixed within a batch. Exploration decays once per batch.
+        """
+        q = self.Q.reshape(NUM_STATES, len(ACTIONS))
+        done_episodes = 0
+        while done_episodes < num_episodes:
+            n = min(batch_size, num_episodes - done_episodes)
+            states, actions, rewards = run_episodes(self._rng, n, self._select_action, rules)
+            lambda_batch_update(q, states, actions, rewards, self.learning_rate, self.trace_decay,
+                                self.discount_factor, self.off_policy)
+            done_episodes += n
+            self.exploration_rate = max(self.min_exploration_rate,
+                                        self.exploration_rate * self.exploration_decay)
+        self.episodes += num_episodes
+        return self
+
+    def policy_digest(self):
+        digest = super().policy_digest()
+        return f"{digest}-lambda{self.trace_decay:g}" if digest is not None else None
+
+
+class QLambdaStrategy(SarsaLambdaStrategy):
+    """
+    Watkins's Q(lambda): Q-learning targets, with the trace cut whenever the
+    behaviour policy explores, so it learns the greedy policy's values.
+    """
+    off_policy = True
+
+
+if __name__ == '__main__':
+    from strategy_report import error_cost_report
+
+    print(f"{'episodes':>10} {'Q-learning':>11} {'SARSA(l)':>9} {'Q(l)':>9}   (exact EV of the greedy policy, %)")
+    config = dict(learning_rate=0.02, exploration_rate=0.5, exploration_decay=0.99,
+                  min_exploration_rate=0.05, seed=0)
+    learners = [QLearningStrategy(**config), SarsaLambdaStrategy(trace_decay=0.5, **config),
+                QLambdaStrategy(trace_decay=0.5, **config)]
+    trained = 0
+    for target in [20_000, 50_000, 100_000, 200_000, 500_000, 1_000_000]:
+        for learner in learners:
+            learner.train(target - trained)
+        trained = target
+        evs = [error_cost_report(learner.greedy())['strategy_ev'] * 100 for learner in learners]
+        print(f"{trained:>10,} " + " ".join(f"{ev:>10.3f}" for ev in evs))
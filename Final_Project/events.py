@@ -0,0 +1,105 @@
+"""
+Observer hooks on the round lifecycle.
+
+A Game owns one Events object and shares it with its Player and Dealer.
+Each event type is an attribute that stays None until something subscribes,
+so an emit site costs a single attribute test when nobody listens:
+
+    hook = self.events.card_drawn
+    if hook:
+        hook(card)
+
+Events and their arguments:
+    deal(player_hand, upcard)          initial cards are on the table
+    decision(state, legal, action)     the player chose an action (legal: ACTION_BITS mask)
+    card_drawn(card)                   any card left the shoe, hole card included
+    dealer_reveal(hole_card, hand)     the hole card is turned over at settlement
+    settle(rewards)                    per-hand results of the round
+
+Hands are passed as the live lists the game keeps playing on; copy them to
+keep what they held at the time of the event.
+
+Heavy consumers can take events in batches:
+
+    batch = game.events.subscribe_batched('card_drawn', counter.update, batch_size=4096)
+    ...
+    game.events.flush()
+"""
+
+EVENT_TYPES = ('deal', 'decision', 'card_drawn', 'dealer_reveal', 'settle')
+
+
+class EventBatch:
+    """Collects the argument tuples of one event and hands them over `batch_size` at a time."""
+
+    def __init__(self, callback, batch_size=1024):
+        self.callback = callback
+        self.batch_size = batch_size
+        self.pending = []
+
+    def add(self, *args):
+        self.pending.append(args)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            batch, self.pending = self.pending, []
+            self.callback(batch)
+
+
+class Events:
+    """Subscribers per event type, with each event's dispatcher prebuilt on (un)subscribe."""
+
+    def __init__(self):
+        self._subscribers = {event: [] for event in EVENT_TYPES}
+        self._batches = []
+        for event in EVENT_TYPES:
+            setattr(self, event, None)
+
+    def subscribe(self, event, callback):
+        """Call `callback` with the event's arguments every time it happens. Returns the callback."""
+        self._check(event)
+        self._subscribers[event].append(callback)
+        self._rebuild(event)
+        return callback
+
+    def unsubscribe(self, event, callback):
+        self._check(event)
+        self._subscribers[event].remove(callback)
+        self._batches = [b for b in self._batches if b.add != callback]
+        self._rebuild(event)
+
+    def subscribe_batched(self, event, callback, batch_size=1024):
+        """
+        Deliver the event to `callback` as lists of argument tuples, `batch_size`
+        at a time; flush() hands over what is left.
+
+        Returns:
+            the EventBatch, for unsubscribe(event, batch.add)
+        """
+        batch = EventBatch(callback, batch_size)
+        self.subscribe(event, batch.add)
+        self._batches.append(batch)
+        return batch
+
+    def flush(self):
+        """Deliver every partly filled batch."""
+        for batch in self._batches:
+            batch.flush()
+
+    def _check(self, event):
+        if event not in self._subscribers:
+            raise ValueError(f"unknown event {event!r}; expected one of {', '.join(EVENT_TYPES)}")
+
+    def _rebuild(self, event):
+        subscribers = tuple(self._subscribers[event])
+        if not subscribers:
+            dispatch = None
+        elif len(subscribers) == 1:
+            dispatch = subscribers[0]
+        else:
+            def dispatch(*args):
+                for callback in subscribers:
+                    callback(*args)
+        setattr(self, event, dispatch)
@@ -0,0 +1,212 @@
+"""
+Exact expected values of every player decision on an infinite deck.
+
+For each decision context, hand and dealer upcard, ExactEV gives the EV of
+every legal action when the rest of the hand is played optimally. Decisions
+are made after the dealer has checked for blackjack, as in play_round, so
+all values are conditional on the dealer not having one.
+
+Contexts:
+    'deal'   first decision of the round, two cards (double, split, surrender)
+    'split'  two-card hand formed by a split (double only with DAS, resplits)
+    'drawn'  hand of three or more cards (hit or stand only)
+
+Values are in units of the initial bet per hand. exact_ev(rules) builds the
+tables once per rule set.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+import hand_fsm as fsm
+from infinite_deck import DEALER_TOTALS, dealer_outcome_table
+from rules import DEFAULT_RULES
+from tabular import ACTIONS, Q_SHAPE, TOTALS, UPCARDS
+
+VALUES = range(1, 11)                  # card values, Ace as 1
+P_VALUE = {v: (4 if v == 10 else 1) / 13 for v in VALUES}
+P_RANK = 1 / 13                        # chance of one particular rank
+CONTEXTS = ('deal', 'split', 'drawn')
+
+
+def hand_total(hard, has_ace):
+    """Best total of a hand with hard total `hard` (Aces as 1)."""
+    return hard + 10 if has_ace and hard + 10 <= 21 else hard
+
+
+def hard_hand(total, soft):
+    """A (hard, has_ace) hand with the given total and softness."""
+    return (total - 10, True) if soft else (total, False)
+
+
+def _rank_index(value):
+    """hand_fsm rank index of a card value 1..11 (10 stands for any ten-valued rank)."""
+    return fsm.ACE if value in (1, 11) else value - 2
+
+
+class ExactEV:
+    """Per-action EVs under one rule set; see the module docstring for the contexts."""
+
+    def __init__(self, rules=None):
+        self.rules = rules if rules is not None else DEFAULT_RULES
+        outcomes = dealer_outcome_table(self.rules.dealer_hits_soft_17)
+        self.dealer = {}             # upcard -> P(final total) over DEALER_TOTALS, given no blackjack
+        self.dealer_blackjack = {}   # upcard -> P(dealer blackjack)
+        for up in UPCARDS:
+            distribution = np.zeros(DEALER_TOTALS.size)
+            blackjack = 0.0
+            for hole in range(fsm.NUM_RANKS):
+                state = fsm.hand_state([_rank_index(up), hole])
+                if fsm.total[state] == 21:
+                    blackjack += P_RANK
+                else:
+                    distribution += P_RANK * outcomes[state]
+            self.dealer[up] = distribution / (1 - blackjack)
+            self.dealer_blackjack[up] = blackjack
+        self._stand = {}
+        self._best_drawn = {}
+        self._single = {}
+        self._actions = {}
+
+    def stand(self, total, up):
+        """EV of standing on `total` against the dealer's final hand."""
+        if total > 21:
+            return -1.0
+        key = (total, up)
+        if key not in self._stand:
+            p = self.dealer[up]
+            self._stand[key] = float(p[(DEALER_TOTALS < total) | (DEALER_TOTALS == 22)].sum()
+                                     - p[(DEALER_TOTALS > total) & (DEALER_TOTALS <= 21)].sum())
+        return self._stand[key]
+
+    def _after_card(self, hard, has_ace, up, value_of):
+        """Expectation over the next card of value_of(hard, has_ace), with -1 for a bust."""
+        ev = 0.0
+        for v in VALUES:
+            h = hard + v
+            ev += P_VALUE[v] * (value_of(h, has_ace or v == 1) if h <= 21 else -1.0)
+        return ev
+
+    def hit(self, hard, has_ace, up):
+        """EV of hitting and then playing on optimally with hit or stand."""
+        return self._after_card(hard, has_ace, up, lambda h, a: self.best_drawn(h, a, up))
+
+    def double(self, hard, has_ace, up):
+        return 2 * self._after_card(hard, has_ace, up, lambda h, a: self.stand(hand_total(h, a), up))
+
+    def best_drawn(self, hard, has_ace, up):
+        """Value of a hand that may only hit or stand, played optimally."""
+        key = (hard, has_ace, up)
+        if key not in self._best_drawn:
+            self._best_drawn[key] = max(self.stand(hand_total(hard, has_ace), up),
+                                        self.hit(hard, has_ace, up))
+        return self._best_drawn[key]
+
+    def split(self, value, up, splits=0):
+        """EV of splitting a pair of `value` when `splits` splits have already been made this hand."""
+        return 2 * self.single_card(value, up, splits + 1)
+
+    def single_card(self, value, up, splits):
+        """Value of one hand holding a single split card, played optimally from its second card."""
+        key = (value, up, splits)
+        if key not in self._single:
+            ev = 0.0
+            for v in VALUES:
+                hard, has_ace = value + v, value == 1 or v == 1
+                plain = max(self.actions('split', hand_total(hard, has_ace), has_ace and hard + 10 <= 21,
+                                         up).values())
+                if v == value:
+                    pair = max(self.actions('split', hand_total(hard, has_ace), value == 1, up,
+                                            pair=value, splits=splits).values())
+                    ev += P_RANK * pair + (P_VALUE[v] - P_RANK) * plain
+                else:
+                    ev += P_VALUE[v] * plain
+            self._single[key] = ev
+        return self._single[key]
+
+    def can_split(self, splits):
+        """A pair can be split while the player holds at most max_splits hands."""
+        return splits + 1 <= self.rules.max_splits
+
+    def actions(self, context, total, soft, up, pair=None, splits=0):
+        """
+        EV of every legal action for a hand.
+
+        Args:
+            context: 'deal', 'split' or 'drawn'
+            pair: card value 1..10 (1 = Ace) when the hand is a pair of one rank
+            splits: splits already made, for pairs in the 'split' context
+
+        Returns:
+            dict action -> EV, with actions named as strategies name them
+        """
+        key = (context, total, soft, up, pair, splits)
+        if key not in self._actions:
+            self._actions[key] = self._action_values(*key)
+        return self._actions[key]
+
+    def _action_values(self, context, total, soft, up, pair, splits):
+        hard, has_ace = hard_hand(total, soft)
+        if pair is not None:
+            hard, has_ace = 2 * pair, pair == 1
+        values = {'hit': self.hit(hard, has_ace, up), 'stand': self.stand(total, up)}
+        if context == 'deal' or (context == 'split' and self.rules.double_after_split):
+            values['double down'] = self.double(hard, has_ace, up)
+        if pair is not None and context != 'drawn' and self.can_split(splits if context == 'split' else 0):
+            values['split'] = self.split(pair, up, splits if context == 'split' else 0)
+        if context == 'deal' and self.rules.late_surrender and not soft:
+            values['surrender'] = -0.5
+        return values
+
+    def best(self, context, total, soft, up, pair=None, splits=0):
+        """(best action, its EV)."""
+        values = self.actions(context, total, soft, up, pair, splits)
+        action = max(values, key=values.get)
+        return action, values[action]
+
+    def q_table(self, context='deal'):
+        """
+        EVs in the tabular learners' layout Q[total, soft, upcard, action] over
+        tabular.ACTIONS (hit, stand, double down). Soft totals that cannot
+        occur copy the hard values; without doubling, 'double down' is -inf.
+        """
+        q = np.empty(Q_SHAPE)
+        for i, total in enumerate(TOTALS):
+            for soft in (0, 1):
+                real_soft = bool(soft) and total >= 12
+                for j, up in enumerate(UPCARDS):
+                    values = self.actions(context, total, real_soft, up)
+                    q[i, soft, j] = [values.get(action, -np.inf) for action in ACTIONS]
+        return q
+
+    def round_ev(self):
+        """EV per round of optimal play: naturals, dealer peek and every decision."""
+        payout = self.rules.blackjack_payout
+        ev = 0.0
+        for up in UPCARDS:
+            p_up = P_VALUE[1 if up == 11 else up]
+            p_natural = 2 * P_VALUE[1] * P_VALUE[10]
+            decisions = 0.0
+            for a in VALUES:
+                for b in VALUES:
+                    if {a, b} == {1, 10}:
+                        continue
+                    p = P_VALUE[a] * P_VALUE[b]
+                    hard, has_ace = a + b, a == 1 or b == 1
+                    total, soft = hand_total(hard, has_ace), has_ace and hard + 10 <= 21
+                    if a == b:
+                        pair = 4 * P_RANK * P_RANK if a == 10 else p  # same rank, not just same value
+                        decisions += pair * self.best('deal', total, soft, up, pair=a)[1]
+                        p -= pair
+                    if p > 0:
+                        decisions += p * self.best('deal', total, soft, up)[1]
+            no_blackjack = 1 - self.dealer_blackjack[up]
+            ev += p_up * (self.dealer_blackjack[up] * -(1 - p_natural)
+                          + no_blackjack * (p_natural * payout + decisions))
+        return ev
+
+
+@lru_cache(maxsize=None)
+def exact_ev(rules=None):
+    """The ExactEV tables for a rule set, built once and shared."""
+    return ExactEV(rules)
@@ -0,0 +1,98 @@
+"""
+Finite-state representation of a blackjack hand.
+
+A hand is packed into one small integer holding its hard total (Aces as 1,
+everything above 21 collapsed into one bust value), whether it holds an Ace,
+its card count (0, 1, 2, 3 or more) and, while it can still become or is a
+pair, the rank of its first card. Lookup tables give the state after any
+card and everything the game needs to know about a state, so a hand advances
+with one index per card instead of rescanning its cards.
+
+Ranks are indexed 0..12 in Game.initialize_deck order: 2..10, Jack, Queen,
+King, Ace.
+"""
+import numpy as np
+
+from batch_engine import RANK_VALUES
+
+NUM_RANKS = 13
+ACE = 12
+BUST = 22            # every hard total above 21
+NUM_HARD = BUST + 1
+NUM_COUNTS = 4       # 0, 1, 2, 3+ cards
+NUM_FIRST = NUM_RANKS + 1  # 0 = no pair possible, else first card rank + 1
+NUM_HAND_STATES = NUM_HARD * 2 * NUM_COUNTS * NUM_FIRST
+
+
+def pack(hard, has_ace, count, first):
+    return ((min(hard, BUST) * 2 + int(has_ace)) * NUM_COUNTS + min(count, 3)) * NUM_FIRST + first
+
+
+def unpack(state):
+    """(hard total, has Ace, card count, first rank + 1 or 0) of a packed state."""
+    rest, first = divmod(state, NUM_FIRST)
+    rest, count = divmod(rest, NUM_COUNTS)
+    hard, has_ace = divmod(rest, 2)
+    return hard, bool(has_ace), count, first
+
+
+EMPTY = pack(0, False, 0, 0)
+
+
+def _build_tables():
+    next_state = np.zeros((NUM_HAND_STATES, NUM_RANKS), dtype=np.uint16)
+    total = np.zeros(NUM_HAND_STATES, dtype=np.int8)
+    soft = np.zeros(NUM_HAND_STATES, dtype=bool)
+    count = np.zeros(NUM_HAND_STATES, dtype=np.int8)
+    pair_rank = np.full(NUM_HAND_STATES, -1, dtype=np.int8)
+    for state in range(NUM_HAND_STATES):
+        hard, has_ace, n, first = unpack(state)
+        is_soft = has_ace and hard + 10 <= 21
+        total[state] = hard + 10 if is_soft else hard
+        soft[state] = is_soft
+        count[state] = n
+        if n == 2 and first:
+            pair_rank[state] = first - 1
+        for rank in range(NUM_RANKS):
+            if hard == BUST:
+                next_state[state, rank] = state  # absorbing
+                continue
+            if n == 0:
+                new_first = rank + 1
+            elif n == 1 and first == rank + 1:
+                new_first = first
+            else:
+                new_first = 0
+            next_state[state, rank] = pack(hard + int(RANK_VALUES[rank]), has_ace or rank == ACE,
+                                           n + 1, new_first)
+    return next_state, total, soft, count, pair_rank
+
+
+# next_state[state, rank]: state after drawing `rank`
+# total[state]: best total (above 21 means bust); soft[state]: an Ace counts as 11
+# count[state]: cards held (3 = three or more); pair_rank[state]: rank of a two-card pair, else -1
+next_state, total, soft, count, pair_rank = _build_tables()
+
+blackjack = (count == 2) & (total == 21)
+
+# One-card hand holding `rank`: where each hand created by a split starts
+single_card = next_state[EMPTY]
+
+
+def dealer_stands_table(hits_soft_17=True):
+    """dealer_stands[state]: the dealer draws no more cards (bust hands stand too)."""
+    stands = total >= 17
+    if hits_soft_17:
+        stands &= ~((total == 17) & soft)
+    return stands
+
+
+dealer_stands = {True: dealer_stands_table(True), False: dealer_stands_table(False)}
+
+
+def hand_state(ranks):
+    """Packed state of a hand given its rank indices."""
+    state = EMPTY
+    for rank in ranks:
+        state = int(next_state[state, rank])
+    return state
@@ -0,0 +1,229 @@
+import json
+import math
+import os
+
+import numpy as np
+
+from hand_recorder import ACTION_CODES, replay
+from strategy import ALL_ACTIONS, legal_action
+from tabular import NUM_STATES, ACTIONS, flat_state_index, decode_flat_states, upcard_value
+
+# Decision rows are grouped by one composite key: (state, pair card, action).
+# Pair code 0 means the decision was not made on a splittable pair, otherwise
+# it is the pair card value minus one (1..10, Aces = 10).
+NUM_PAIR_CODES = 11
+NUM_ACTION_CODES = len(ACTION_CODES)
+NUM_KEYS = NUM_STATES * NUM_PAIR_CODES * NUM_ACTION_CODES
+
+OUTCOMES = {'win': 1, 'push': 0, 'loss': -1}
+
+
+def composite_key(state, pair, action):
+    return (np.asarray(state, dtype=np.int64) * NUM_PAIR_CODES + pair) * NUM_ACTION_CODES + action
+
+
+def _rank_value(rank):
+    """Card value 2-11 of a rank name or a number ('Ace' and 11 are both Aces)."""
+    if rank == 'Ace':
+        return 11
+    if rank in ('King', 'Queen', 'Jack'):
+        return 10
+    return int(rank)
+
+
+class _DecisionCollector:
+    """Strategy wrapper that appends every replayed decision to flat column lists."""
+
+    def __init__(self, hands, states, pairs, actions):
+        self.hands, self.states, self.pairs, self.actions = hands, states, pairs, actions
+        self.hand = 0
+        self.strategy = None
+
+    def wrap(self, hand, strategy):
+        self.hand = hand
+        self.strategy = strategy
+        if hasattr(strategy, 'determine_action_for_pair'):
+            self.determine_action_for_pair = self._pair_action
+        if hasattr(strategy, 'should_surrender'):
+            self.should_surrender = self._surrender
+        return self
+
+    def _add(self, total, soft, upcard, pair, action):
+        self.hands.append(self.hand)
+        self.states.append(int(flat_state_index(total, int(soft), upcard_value(upcard))))
+        self.pairs.append(pair)
+        self.actions.append(ACTION_CODES.get(action, ACTION_CODES['stand']))
+
+    def determine_action(self, state):
+        return self.determine_legal_action(state, ALL_ACTIONS)
+
+    def determine_legal_action(self, state, legal):
+        action = legal_action(self.strategy, state, legal).lower()
+        total, upcard, soft = state
+        self._add(total, soft, upcard, 0, action)
+        return action
+
+    def _pair_action(self, rank, dealer_card):
+        action = self.strategy.determine_action_for_pair(rank, dealer_card).lower()
+        value = _rank_value(rank)
+        total, soft = (12, True) if value == 11 else (2 * value, False)
+        self._add(total, soft, dealer_card, value - 1, action)
+        return action
+
+    def _surrender(self, total, dealer_card):
+        surrender = self.strategy.should_surrender(total, dealer_card)
+        self._add(total, False, dealer_card, 0, 'surrender' if surrender else 'no surrender')
+        return surrender
+
+
+def write_index(directory, hand, key, rewards, meta=None):
+    """
+    Write decision columns plus a sorted-array index on the composite key.
+
+    Args:
+        hand: hand number of every decision row, non-decreasing
+        key: composite_key() of every decision row
+        rewards: per-hand net result
+    """
+    os.makedirs(directory, exist_ok=True)
+    key = np.asarray(key, dtype=np.int32)
+    position_type = np.uint32 if key.size < 2 ** 32 else np.int64
+    order = np.argsort(key, kind='stable').astype(position_type)
+    offsets = np.zeros(NUM_KEYS + 1, dtype=np.int64)
+    np.cumsum(np.bincount(key, minlength=NUM_KEYS), out=offsets[1:])
+
+    rewards = np.asarray(rewards, dtype=np.float32)
+    np.save(os.path.join(directory, 'hand.npy'), np.asarray(hand, dtype=np.uint32))
+    np.save(os.path.join(directory, 'key.npy'), key)
+    np.save(os.path.join(directory, 'order.npy'), order)
+    np.save(os.path.join(directory, 'offsets.npy'), offsets)
+    np.save(os.path.join(directory, 'reward.npy'), rewards)
+    np.save(os.path.join(directory, 'outcome.npy'), np.sign(rewards).astype(np.int8))
+    with open(os.path.join(directory, 'index.json'), 'w') as f:
+        json.dump(dict(meta or {}, hands=int(rewards.size), decisions=int(key.size)), f)
+    return HandIndex(directory)
+
+
+def index_hand_log(log, directory, start=0, stop=None):
+    """Replay a recorded HandLog once, collecting every decision, and index it."""
+    hands, states, pairs, actions = [], [], [], []
+    collector = _DecisionCollector(hands, states, pairs, actions)
+    rewards = replay(log, start, stop, wrap=collector.wrap)
+    key = composite_key(np.array(states, dtype=np.int64), np.array(pairs), np.array(actions))
+    return write_index(directory, np.array(hands, dtype=np.int64) - start, key, rewards,
+                       meta={'source': 'hand_log', 'seed': log.meta['seed'], 'first_hand': start})
+
+
+def index_episodes(states, actions, rewards, directory):
+    """Index run_episodes() output (infinite deck: no pairs or surrender)."""
+    valid = states >= 0
+    hand, _ = np.nonzero(valid.T)
+    action_codes = np.array([ACTION_CODES[a] for a in ACTIONS], dtype=np.int64)
+    key = composite_key(states.T[valid.T], 0, action_codes[actions.T[valid.T]])
+    return write_index(directory, hand, key, rewards, meta={'source': 'episodes'})
+
+
+def _values(condition, encode=lambda v: v):
+    if condition is None:
+        return None
+    if isinstance(condition, (str, int, bool, np.integer)):
+        condition = [condition]
+    return [encode(v) for v in condition]
+
+
+class HandIndex:
+    """
+    Filtered aggregate queries over indexed hand histories.
+
+    All arrays are memory-mapped; a query reads only the index slices for the
+    requested decision states and the rewards of the matching hands.
+
+        index.query(total=16, soft=False, upcard=10, action='stand')
+        index.query(pair=8, upcard=11, action='split')
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, 'index.json')) as f:
+            self.meta = json.load(f)
+        load = lambda name: np.load(os.path.join(directory, name + '.npy'), mmap_mode='r')
+        self.hand = load('hand')
+        self.key = load('key')
+        self.order = load('order')
+        self.offsets = np.asarray(load('offsets'))
+        self.reward = load('reward')
+        self.outcome = load('outcome')
+
+    def __len__(self):
+        return self.reward.shape[0]
+
+    def matching_keys(self, total=None, soft=None, upcard=None, pair=None, action=None):
+        """Composite keys matching every given field; each field is a value or a list of values."""
+        states = np.arange(NUM_STATES)
+        totals, softs, upcards = decode_flat_states(states)
+        selected = np.ones(NUM_STATES, dtype=bool)
+        for column, values in ((totals, _values(total)), (softs, _values(soft, int)),
+                               (upcards, _values(upcard, _rank_value))):
+            if values is not None:
+                selected &= np.isin(column, values)
+        pairs = _values(pair, lambda v: _rank_value(v) - 1)
+        actions = _values(action, lambda a: ACTION_CODES[a.lower()])
+        pairs = np.arange(NUM_PAIR_CODES) if pairs is None else np.array(pairs)
+        actions = np.arange(NUM_ACTION_CODES) if actions is None else np.array(actions)
+        s, p, a = np.meshgrid(states[selected], pairs, actions, indexing='ij')
+        return np.sort(composite_key(s.ravel(), p.ravel(), a.ravel()))
+
+    def decisions(self, **conditions):
+        """Row numbers of the decisions matching `conditions`."""
+        keys = self.matching_keys(**conditions)
+        if keys.size == 0:
+            return np.empty(0, dtype=np.int64)
+        # Consecutive keys are contiguous in the sorted order: read one slice per run
+        breaks = np.flatnonzero(np.diff(keys) != 1) + 1
+        starts = self.offsets[keys[np.r_[0, breaks]]]
+        stops = self.offsets[keys[np.r_[breaks - 1, keys.size - 1]] + 1]
+        slices = [self.order[a:b] for a, b in zip(starts, stops) if b > a]
+        return np.concatenate(slices).astype(np.int64) if slices else np.empty(0, dtype=np.int64)
+
+    def hands(self, outcome=None, **conditions):
+        """Sorted hand numbers with at least one matching decision (and the given outcome)."""
+        if conditions:
+            hands = np.unique(self.hand[np.sort(self.decisions(**conditions))])
+        else:
+            hands = np.arange(len(self))
+        if outcome is not None:
+            outcomes = _values(outcome, lambda o: OUTCOMES[o] if isinstance(o, str) else o)
+            hands = hands[np.isin(self.outcome[hands], outcomes)]
+        return hands
+
+    def query(self, outcome=None, **conditions):
+        """
+        Count, EV and 95% confidence interval of the hands matching the filters.
+
+        Returns:
+            dict with count, ev, std_error and ci95 (low, high)
+        """
+        rewards = np.asarray(self.reward[self.hands(outcome, **conditions)], dtype=np.float64)
+        n = rewards.size
+        ev = float(rewards.mean()) if n else 0.0
+        std_error = float(rewards.std(ddof=1) / math.sqrt(n)) if n > 1 else 0.0
+        return {'count': int(n), 'ev': ev, 'std_error': std_error,
+                'ci95': (ev - 1.96 * std_error, ev + 1.96 * std_error)}
+
+
+if __name__ == '__main__':
+    import sys
+    import tempfile
+    import time
+    from batch_engine import run_episodes
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    rng = np.random.default_rng(0)
+    policy = np.random.default_rng(1).integers(0, 2, NUM_STATES)
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.time()
+        index = index_episodes(*run_episodes(rng, n, lambda s, first: policy[s]), directory)
+        print(f"Indexed {n:,} hands in {time.time() - start:.1f}s")
+        start = time.time()
+        print(index.query(total=16, soft=False, upcard=10, action='stand'))
+        print(f"Query in {time.time() - start:.3f}s")
@@ -0,0 +1,225 @@
+import json
+import mmap
+import os
+import struct
+from array import array
+
+from dealer import Dealer
+from player import Player
+from game import Game
+from rules import Rules
+from simulation import play_round
+from strategy import legal_action
+
+# One byte per decision; 'no surrender' records that surrender was offered and declined
+ACTION_CODES = {'hit': 0, 'stand': 1, 'double down': 2, 'split': 3, 'surrender': 4, 'no surrender': 5}
+CODE_ACTIONS = {code: action for action, code in ACTION_CODES.items()}
+
+# shoe index, cursor at deal, cursor after settlement, reward, number of decisions.
+# The seed lives in the log's metadata; the reward is a double so payouts such
+# as 6:5 round-trip exactly.
+RECORD_HEADER = struct.Struct('<IHHdB')
+
+
+class HandRecord:
+    def __init__(self, shoe_index, cursor_start, cursor_end, reward, actions):
+        self.shoe_index = shoe_index
+        self.cursor_start = cursor_start  # cards already dealt from the shoe when the round began
+        self.cursor_end = cursor_end
+        self.reward = reward
+        self.actions = actions
+
+    def pack(self):
+        codes = bytes(ACTION_CODES.get(a, ACTION_CODES['stand']) for a in self.actions)
+        return RECORD_HEADER.pack(self.shoe_index, self.cursor_start,
+                                  self.cursor_end, self.reward, len(codes)) + codes
+
+    @classmethod
+    def unpack(cls, data, offset=0):
+        shoe, start, end, reward, count = RECORD_HEADER.unpack_from(data, offset)
+        begin = offset + RECORD_HEADER.size
+        actions = [CODE_ACTIONS[c] for c in data[begin:begin + count]]
+        return cls(shoe, start, end, reward, actions)
+
+
+class RecordingStrategy:
+    """Wraps a strategy and logs every decision it makes during a round."""
+
+    def __init__(self, strategy):
+        self.strategy = strategy
+        self.actions = []
+        # Only expose the optional decision hooks the wrapped strategy really has,
+        # so the round loop takes exactly the same code paths
+        if hasattr(strategy, 'determine_action_for_pair'):
+            self.determine_action_for_pair = self._pair_action
+        if hasattr(strategy, 'should_surrender'):
+            self.should_surrender = self._surrender
+
+    @property
+    def wrapped(self):
+        return self.strategy
+
+    def set_rules(self, rules):
+        if hasattr(self.strategy, 'set_rules'):
+            self.strategy.set_rules(rules)
+
+    def _log(self, action):
+        action = action.lower()
+        self.actions.append(action if action in ACTION_CODES else 'stand')
+        return action
+
+    def determine_action(self, state):
+        return self._log(self.strategy.determine_action(state))
+
+    def determine_legal_action(self, state, legal):
+        return self._log(legal_action(self.strategy, state, legal))
+
+    def _pair_action(self, rank, dealer_card):
+        return self._log(self.strategy.determine_action_for_pair(rank, dealer_card))
+
+    def _surrender(self, total, dealer_card):
+        surrender = self.strategy.should_surrender(total, dealer_card)
+        self.actions.append('surrender' if surrender else 'no surrender')
+        return surrender
+
+
+class ReplayStrategy:
+    """Plays back a recorded decision sequence."""
+
+    def __init__(self, actions, has_pair_decisions=False, has_surrender=False):
+        self.actions = list(actions)
+        self.position = 0
+        if has_pair_decisions:
+            self.determine_action_for_pair = lambda rank, dealer_card: self._next()
+        if has_surrender:
+            self.should_surrender = lambda total, dealer_card: self._next() == 'surrender'
+
+    def _next(self):
+        action = self.actions[self.position] if self.position < len(self.actions) else 'stand'
+        self.position += 1
+        return action
+
+    def determine_action(self, state):
+        return self._next()
+
+
+def record_hands(strategy, num_games, prefix, rules=None, seed=0):
+    """
+    Simulate like simulate_games() and record every round to <prefix>.bin,
+    with an offset index <prefix>.idx and run metadata <prefix>.json.
+
+    Returns:
+        HandLog for the recording
+    """
+    if seed is None:
+        raise ValueError("recording needs a seed: unseeded shoes cannot be regenerated")
+    recorder = RecordingStrategy(strategy)
+    dealer = Dealer(rules)
+    player = Player(recorder, rules)
+    game = Game(dealer, player, rules, seed=seed)
+    game.reshuffle()
+
+    offsets = array('Q')
+    offset = 0
+    with open(prefix + '.bin', 'wb') as out:
+        for _ in range(num_games):
+            if game.needs_shuffle():
+                game.reshuffle()
+            recorder.actions = []
+            start = game.deck_count - len(game.deck)
+            reward = play_round(game)
+            record = HandRecord(dealer.shoe_index - 1, start,
+                                game.deck_count - len(game.deck), reward, recorder.actions)
+            data = record.pack()
+            out.write(data)
+            offsets.append(offset)
+            offset += len(data)
+    with open(prefix + '.idx', 'wb') as f:
+        offsets.tofile(f)
+    with open(prefix + '.json', 'w') as f:
+        json.dump({'seed': seed, 'hands': num_games, 'rules': game.rules.as_dict(),
+                   'strategy': type(strategy).__name__,
+                   'pair_decisions': hasattr(strategy, 'determine_action_for_pair'),
+                   'surrender_decisions': hasattr(strategy, 'should_surrender')}, f)
+    return HandLog(prefix)
+
+
+class HandLog:
+    """Random access to recorded hands: hand N is one index lookup and one read."""
+
+    def __init__(self, prefix):
+        with open(prefix + '.json') as f:
+            self.meta = json.load(f)
+        self.rules = Rules(**self.meta['rules'])
+        self.offsets = array('Q')
+        with open(prefix + '.idx', 'rb') as f:
+            self.offsets.frombytes(f.read())
+        with open(prefix + '.bin', 'rb') as f:
+            # Memory-mapped so that opening a huge log costs nothing until hands are read
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if len(self.offsets) else b''
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def record(self, n):
+        return HandRecord.unpack(self.data, self.offsets[n])
+
+    def replay_strategy(self, record):
+        return ReplayStrategy(record.actions, self.meta['pair_decisions'],
+                              self.meta['surrender_decisions'])
+
+    def prepare_game(self, game, record):
+        """Put `game` at the exact shoe position where the recorded round was dealt."""
+        game.reshuffle(shoe_index=record.shoe_index)
+        if record.cursor_start:
+            del game.deck[-record.cursor_start:]
+
+
+def replay(log, start=0, stop=None, verify=True, wrap=None):
+    """
+    Re-execute recorded hands start..stop-1 through Game at full speed.
+
+    Args:
+        wrap: optional callable(hand number, ReplayStrategy) -> strategy, to observe
+              the decisions as they are replayed
+
+    Returns:
+        list of rewards; with `verify`, raises AssertionError on any divergence
+    """
+    stop = len(log) if stop is None else stop
+    replayer = ReplayStrategy([])
+    dealer = Dealer(log.rules)
+    player = Player(replayer, log.rules)
+    game = Game(dealer, player, log.rules, seed=log.meta['seed'])
+
+    rewards = []
+    current_shoe = None
+    for n in range(start, stop):
+        record = log.record(n)
+        cursor = game.deck_count - len(game.deck)
+        if record.shoe_index != current_shoe or cursor != record.cursor_start:
+            log.prepare_game(game, record)
+            current_shoe = record.shoe_index
+        strategy = log.replay_strategy(record)
+        player.strategy = wrap(n, strategy) if wrap is not None else strategy
+        reward = play_round(game)
+        if verify:
+            end = game.deck_count - len(game.deck)
+            if reward != record.reward or end != record.cursor_end:
+                raise AssertionError(f"hand {n} diverged: reward {reward} vs {record.reward}, "
+                                     f"cursor {end} vs {record.cursor_end}")
+        rewards.append(reward)
+    return rewards
+
+
+if __name__ == '__main__':
+    import sys
+    import time
+    from basic_strategy import BasicStrategy
+
+    prefix = sys.argv[1] if len(sys.argv) > 1 else 'hands'
+    log = record_hands(BasicStrategy(), 100_000, prefix, seed=1)
+    print(f"Recorded {len(log):,} hands, {os.path.getsize(prefix + '.bin') / len(log):.1f} bytes/hand")
+    start = time.time()
+    replay(log, 99_000, 100_000)
+    print(f"Replayed hands 99,000-99,999 in {time.time() - start:.3f}s")
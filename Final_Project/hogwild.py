@@ -0,0 +1,180 @@
+"""
+Hogwild-style parallel Q-learning.
+
+The Q-table, its visit counts and one progress counter per worker live in a
+single multiprocessing.shared_memory block. Every worker plays its own
+batches of infinite-deck hands and writes its TD updates straight into the
+shared table without taking any lock: with 1,080 cells and sparse, averaged
+batch updates, lost updates are rare and harmless. The coordinating process
+only watches the progress counters, reports throughput and writes snapshots.
+"""
+import os
+import tempfile
+import time
+from multiprocessing import Pool, shared_memory
+
+import numpy as np
+
+from batch_engine import run_episodes, episode_transitions
+from qlearning_strategy import QLearningStrategy, td_batch_update
+from tabular import ACTIONS, NUM_STATES, Q_SHAPE, STAND
+
+
+class SharedTables:
+    """Q-table, visit counts and per-worker episode counters in one shared memory block."""
+
+    def __init__(self, num_workers, name=None):
+        self.num_workers = num_workers
+        cells = NUM_STATES * len(ACTIONS)
+        size = 8 * (2 * cells + num_workers)
+        self.owner = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=size)
+        buffer = self.shm.buf
+        self.q = np.ndarray((NUM_STATES, len(ACTIONS)), dtype=np.float64, buffer=buffer)
+        self.visits = np.ndarray((NUM_STATES, len(ACTIONS)), dtype=np.int64, buffer=buffer, offset=8 * cells)
+        self.episodes = np.ndarray(num_workers, dtype=np.int64, buffer=buffer, offset=16 * cells)
+        if self.owner:
+            self.q[:] = 0.0
+            self.visits[:] = 0
+            self.episodes[:] = 0
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def close(self):
+        # Drop the views before closing, or the buffer cannot be released
+        del self.q, self.visits, self.episodes
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def _worker(task):
+    """Train on the shared table until this worker's share of episodes is done."""
+    name, num_workers, worker, num_episodes, config, rules, seed = task
+    tables = SharedTables(num_workers, name)
+    q = tables.q
+    try:
+        rng = np.random.Generator(np.random.Philox(np.random.SeedSequence([seed, worker])))
+        epsilon = config['exploration_rate']
+
+        def select_action(states, first):
+            values = q[states] if first else q[states, :STAND + 1]
+            greedy = np.argmax(values, axis=1)
+            explore = rng.random(states.size) < epsilon
+            return np.where(explore, rng.integers(0, values.shape[1], size=states.size), greedy)
+
+        done = 0
+        while done < num_episodes:
+            n = min(config['batch_size'], num_episodes - done)
+            transitions = episode_transitions(*run_episodes(rng, n, select_action, rules))
+            td_batch_update(q, transitions, config['learning_rate'], config['discount_factor'],
+                            visits=tables.visits)
+            done += n
+            tables.episodes[worker] = done  # each worker owns its own counter
+            epsilon = max(config['min_exploration_rate'], epsilon * config['exploration_decay'])
+        return epsilon
+    finally:
+        q = None  # release the closure's view of the shared buffer
+        tables.close()
+
+
+class HogwildTrainer:
+    """
+    Lock-free multi-process Q-learning on one shared table.
+
+    Args:
+        num_workers: worker processes (default: all cores)
+        snapshot_dir: if set, the Q-table is saved there as snapshot.npz every
+            `snapshot_every` seconds and at the end
+        report_every: seconds between throughput reports
+        q_table: optional starting Q-table (see warm_start)
+    """
+
+    def __init__(self, num_workers=None, learning_rate=0.05, discount_factor=1.0,
+                 exploration_rate=0.5, exploration_decay=0.999, min_exploration_rate=0.01,
+                 batch_size=2000, rules=None, seed=0, snapshot_dir=None, snapshot_every=60.0,
+                 report_every=5.0, verbose=False, q_table=None):
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.config = {'learning_rate': learning_rate, 'discount_factor': discount_factor,
+                       'exploration_rate': exploration_rate, 'exploration_decay': exploration_decay,
+                       'min_exploration_rate': min_exploration_rate, 'batch_size': batch_size}
+        self.rules = rules
+        self.seed = seed
+        self.snapshot_dir = snapshot_dir
+        self.snapshot_every = snapshot_every
+        self.report_every = report_every
+        self.verbose = verbose
+        self.q_table = q_table
+        self.reports = []  # (elapsed seconds, total episodes, episodes per second)
+        self.visits = None
+
+    def _snapshot(self, tables, episodes):
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.snapshot_dir, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            # Copy first: workers keep writing while the snapshot is taken
+            np.savez(f, Q=tables.q.copy().reshape(Q_SHAPE), visits=tables.visits.copy(), episodes=episodes)
+        os.replace(tmp, os.path.join(self.snapshot_dir, 'snapshot.npz'))
+
+    def train(self, num_episodes):
+        """
+        Run `num_episodes` in total, split across the workers.
+
+        Returns:
+            QLearningStrategy holding the learned table
+        """
+        share, extra = divmod(num_episodes, self.num_workers)
+        tables = SharedTables(self.num_workers)
+        if self.q_table is not None:
+            tables.q[:] = np.reshape(self.q_table, tables.q.shape)
+        tasks = [(tables.name, self.num_workers, w, share + (w < extra), self.config, self.rules, self.seed)
+                 for w in range(self.num_workers)]
+        poll = min(self.report_every, self.snapshot_every) if self.snapshot_dir else self.report_every
+        start = last_report = last_snapshot = time.time()
+        try:
+            with Pool(self.num_workers) as pool:
+                pending = pool.map_async(_worker, tasks)
+                while not pending.ready():
+                    pending.wait(poll)
+                    now = time.time()
+                    episodes = int(tables.episodes.sum())
+                    if now - last_report >= self.report_every:
+                        self._report(now - start, episodes)
+                        last_report = now
+                    if self.snapshot_dir and now - last_snapshot >= self.snapshot_every:
+                        self._snapshot(tables, episodes)
+                        last_snapshot = now
+                epsilons = pending.get()
+
+            episodes = int(tables.episodes.sum())
+            self._report(time.time() - start, episodes)
+            if self.snapshot_dir:
+                self._snapshot(tables, episodes)
+            self.visits = tables.visits.copy()
+            strategy = QLearningStrategy(q_table=tables.q.copy().reshape(Q_SHAPE), seed=self.seed,
+                                         exploration_rate=float(np.mean(epsilons)),
+                                         **{k: v for k, v in self.config.items()
+                                            if k not in ('exploration_rate', 'batch_size')})
+            strategy.episodes = episodes
+            return strategy
+        finally:
+            tables.close()
+
+    def _report(self, elapsed, episodes):
+        rate = episodes / elapsed if elapsed > 0 else 0.0
+        self.reports.append((elapsed, episodes, rate))
+        if self.verbose:
+            print(f"{elapsed:7.1f}s  {episodes:>13,} episodes  {rate:>11,.0f} episodes/s")
+
+
+if __name__ == '__main__':
+    import sys
+
+    episodes = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000_000
+    for workers in sorted({1, os.cpu_count() or 1}):
+        trainer = HogwildTrainer(num_workers=workers, verbose=True)
+        start = time.time()
+        learner = trainer.train(episodes)
+        print(f"{workers} worker(s): {episodes / (time.time() - start):,.0f} episodes/s")
@@ -0,0 +1,181 @@
+import csv
+import json
+import math
+import os
+import random
+from multiprocessing import Pool
+
+import numpy as np
+
+from qlearning_strategy import QLearningStrategy
+from simulation import simulate_games
+
+# Sampling ranges for each Q-learning hyperparameter
+SEARCH_SPACE = {
+    'learning_rate': ('log', 0.005, 0.5),
+    'discount_factor': ('uniform', 0.8, 1.0),
+    'exploration_rate': ('uniform', 0.05, 1.0),
+    'exploration_decay': ('log_complement', 1e-4, 1e-1),  # 1 - decay is log-uniform
+    'min_exploration_rate': ('uniform', 0.0, 0.1),
+}
+
+
+def sample_configs(num_configs, seed=0, space=None):
+    """Draw `num_configs` random hyperparameter settings."""
+    space = space if space is not None else SEARCH_SPACE
+    rng = random.Random(seed)
+    configs = []
+    for _ in range(num_configs):
+        config = {}
+        for name, (kind, low, high) in space.items():
+            if kind == 'log':
+                config[name] = math.exp(rng.uniform(math.log(low), math.log(high)))
+            elif kind == 'log_complement':
+                config[name] = 1.0 - math.exp(rng.uniform(math.log(low), math.log(high)))
+            else:
+                config[name] = rng.uniform(low, high)
+        configs.append(config)
+    return configs
+
+
+class Trial:
+    """One configuration being trained, carried from rung to rung."""
+
+    def __init__(self, trial_id, config):
+        self.trial_id = trial_id
+        self.config = config
+        self.q_table = None
+        self.exploration_rate = config['exploration_rate']
+        self.episodes = 0
+        self.score = None
+        self.std_error = None
+        self.rung = -1
+        self.finalist = False  # survived to the last rung of its bracket
+
+    def as_row(self):
+        row = {'trial': self.trial_id, 'rung': self.rung, 'finalist': self.finalist,
+               'episodes': self.episodes,
+               'avg_reward': self.score, 'std_error': self.std_error}
+        row.update(self.config)
+        return row
+
+
+def _train_and_evaluate(task):
+    """Continue training one trial and evaluate its greedy policy. Runs in worker processes."""
+    trial, episodes, eval_hands, eval_seed, train_seed, rules = task
+    config = dict(trial.config, exploration_rate=trial.exploration_rate)
+    strategy = QLearningStrategy(q_table=trial.q_table, seed=train_seed, **config)
+    strategy.train(episodes, rules=rules)
+
+    result = simulate_games(strategy.greedy(), eval_hands, rules=rules, seed=eval_seed)
+    trial.q_table = strategy.Q
+    trial.exploration_rate = strategy.exploration_rate
+    trial.episodes += episodes
+    trial.score = result['avg_reward']
+    trial.std_error = result['std_error']
+    return trial
+
+
+def successive_halving(trials, min_episodes, eta=3, num_rungs=None, eval_hands=20_000,
+                       eval_seed=12345, seed=0, rules=None, pool=None):
+    """
+    Train all trials for `min_episodes`, keep the best 1/eta, train the survivors
+    eta times longer, and repeat until one remains (or `num_rungs` is reached).
+
+    Every evaluation plays the same seeded shoes, so trials are compared on
+    common random numbers. Returns every trial with the rung it reached.
+    """
+    if num_rungs is None:
+        num_rungs = max(1, int(math.log(len(trials), eta)) + 1)
+    survivors = list(trials)
+    budget = min_episodes
+    for rung in range(num_rungs):
+        # Each rung brings survivors up to `budget` total episodes
+        tasks = [(t, budget - t.episodes, eval_hands, eval_seed, abs(hash((seed, t.trial_id, rung))), rules)
+                 for t in survivors]
+        updated = pool.map(_train_and_evaluate, tasks) if pool else [_train_and_evaluate(t) for t in tasks]
+        for trial in updated:
+            trial.rung = rung
+        by_id = {t.trial_id: t for t in updated}
+        trials = [by_id.get(t.trial_id, t) for t in trials]
+
+        updated.sort(key=lambda t: t.score, reverse=True)
+        keep = max(1, len(updated) // eta)
+        survivors = updated[:keep]
+        if len(updated) == 1:
+            break
+        budget *= eta
+    for trial in updated:
+        trial.finalist = True
+    return trials
+
+
+def hyperband(max_episodes, eta=3, seed=0, processes=None, **kwargs):
+    """
+    Hyperband: several successive-halving brackets that trade off the number of
+    configurations against the episodes each one starts with.
+    """
+    s_max = int(math.log(max_episodes, eta) + 1e-9)
+    # Brackets smaller than a few thousand episodes are too noisy to rank on
+    s_max = min(s_max, max(0, int(math.log(max_episodes / 5_000, eta))))
+    all_trials = []
+    next_id = 0
+    pool = Pool(processes) if processes and processes > 1 else None
+    try:
+        for s in range(s_max, -1, -1):
+            num_configs = int(math.ceil((s_max + 1) / (s + 1) * eta ** s))
+            min_episodes = int(max_episodes * eta ** -s)
+            configs = sample_configs(num_configs, seed=seed * 100 + s)
+            trials = [Trial(next_id + i, c) for i, c in enumerate(configs)]
+            next_id += num_configs
+            all_trials += successive_halving(trials, min_episodes, eta=eta, num_rungs=s + 1,
+                                             seed=seed, pool=pool, **kwargs)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    return all_trials
+
+
+def rank_trials(trials):
+    """
+    Best first. Bracket finalists were trained with the full budget and rank
+    above trials that were stopped early; all scores come from the same shoes.
+    """
+    return sorted(trials, key=lambda t: (t.finalist, t.score if t.score is not None else -math.inf),
+                  reverse=True)
+
+
+def write_results(trials, output_dir):
+    """Write results.csv (ranked) and best_checkpoint.npz (Q-table plus config). Returns the best trial."""
+    os.makedirs(output_dir, exist_ok=True)
+    ranked = rank_trials(trials)
+    fields = ['rank'] + list(ranked[0].as_row().keys())
+    with open(os.path.join(output_dir, 'results.csv'), 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        for rank, trial in enumerate(ranked, start=1):
+            writer.writerow(dict(trial.as_row(), rank=rank))
+
+    best = ranked[0]
+    np.savez(os.path.join(output_dir, 'best_checkpoint.npz'), Q=best.q_table,
+             config=json.dumps(best.config), episodes=best.episodes)
+    return best
+
+
+def load_checkpoint(path):
+    """Rebuild the best QLearningStrategy from best_checkpoint.npz."""
+    with np.load(path) as data:
+        config = json.loads(str(data['config']))
+        return QLearningStrategy(q_table=data['Q'], **config)
+
+
+if __name__ == '__main__':
+    import sys
+
+    output_dir = sys.argv[1] if len(sys.argv) > 1 else 'qlearning_search'
+    trials = hyperband(max_episodes=2_000_000, processes=os.cpu_count())
+    best = write_results(trials, output_dir)
+    print(f"Best of {len(trials)} configurations: avg reward {best.score:.4f} after "
+          f"{best.episodes:,} episodes")
+    print(json.dumps(best.config, indent=2))
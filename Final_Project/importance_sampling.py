@@ -0,0 +1,363 @@
+"""
+Importance sampling for rare blackjack events.
+
+Cards are drawn from a tilted distribution: every deal slot (dealer upcard,
+hole card, the player's first two cards, player draws, dealer draws) has its
+own rank weights. Each trial carries the likelihood ratio of its cards under the
+normal and the tilted distribution, so the weighted event frequency is an
+unbiased estimate of the event's probability under normal play. The tilt can
+be tuned with the cross-entropy method.
+
+    event = NCardTwentyOne(6)
+    tilt, history = cross_entropy_tilt(event, BasicStrategy(), seed=0)
+    print(estimate(event, BasicStrategy(), 20_000, tilt=tilt, seed=1))
+"""
+import bisect
+import math
+import sys
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from card import Card
+from dealer import Dealer
+from game import Game
+from player import Player
+from rules import DEFAULT_RULES
+from simulation import play_round
+
+RANK_NAMES = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'Jack', 'Queen', 'King', 'Ace']
+SLOTS = ('upcard', 'hole', 'player', 'hit', 'dealer')
+SLOT_OF_DRAW = (0, 1, 2, 2)   # Game.new_round deals upcard, hole card, then the player's two cards
+HIT_SLOT, DEALER_SLOT = 3, 4
+
+
+class TiltedDeck:
+    """
+    Stand-in for the shoe list that draws ranks from tilted weights and keeps
+    the log likelihood ratio (normal / tilted) of everything it dealt.
+
+    Args:
+        tilt: array (len(SLOTS), 13) of positive rank multipliers; ones is normal play
+        rng: numpy Generator
+        num_decks: None for an infinite deck (i.i.d. ranks); otherwise a finite
+            shoe of that many decks, tilted draw by draw against what is left in it
+    """
+
+    def __init__(self, tilt, rng, num_decks=None, buffer_size=65_536):
+        self.tilt = np.asarray(tilt, dtype=float)
+        if self.tilt.shape != (len(SLOTS), len(RANK_NAMES)) or (self.tilt <= 0).any():
+            raise ValueError(f"tilt must be a positive array of shape {(len(SLOTS), len(RANK_NAMES))}")
+        self.rng = rng
+        self.num_decks = num_decks
+        self.buffer_size = buffer_size
+        self.cards = [Card('Spades', name) for name in RANK_NAMES]  # suits never matter
+        self.counts = np.zeros((len(SLOTS), len(RANK_NAMES)), dtype=np.int64)
+        self.log_weight = 0.0
+        self.dealer_drawing = False
+        self._drawn = 0
+        self._uniforms = []
+        if num_decks is None:
+            p = self.tilt / self.tilt.sum(axis=1, keepdims=True)
+            self._cdf = np.cumsum(p, axis=1).tolist()
+            # p_r / q_r with p_r = 1/13 for every rank
+            self._log_ratio = (-np.log(p * len(RANK_NAMES))).tolist()
+        else:
+            self._tilt = self.tilt.tolist()
+            self.refill()
+
+    def refill(self):
+        """A fresh finite shoe (no-op for an infinite deck)."""
+        if self.num_decks is not None:
+            self.remaining = [4 * self.num_decks] * len(RANK_NAMES)
+            self.left = 52 * self.num_decks
+
+    def start_round(self):
+        self._drawn = 0
+        self.dealer_drawing = False
+
+    def start_trial(self):
+        """
+        Every trial starts from a fresh shoe: the weight only covers the
+        trial's own draws, so a shoe depleted by an earlier tilted trial
+        must not carry over.
+        """
+        self.refill()
+        self.log_weight = 0.0
+        self.counts[:] = 0
+
+    def _uniform(self):
+        if not self._uniforms:
+            self._uniforms = self.rng.random(self.buffer_size).tolist()
+        return self._uniforms.pop()
+
+    def pop(self):
+        if self.dealer_drawing:
+            slot = DEALER_SLOT
+        else:
+            slot = SLOT_OF_DRAW[self._drawn] if self._drawn < len(SLOT_OF_DRAW) else HIT_SLOT
+        self._drawn += 1
+        if self.num_decks is None:
+            cdf = self._cdf[slot]
+            rank = min(bisect.bisect_right(cdf, self._uniform()), len(RANK_NAMES) - 1)
+            self.log_weight += self._log_ratio[slot][rank]
+        else:
+            tilt, remaining = self._tilt[slot], self.remaining
+            total = sum(t * c for t, c in zip(tilt, remaining))
+            target = self._uniform() * total
+            rank, acc = 0, tilt[0] * remaining[0]
+            while acc <= target and rank < len(RANK_NAMES) - 1:
+                rank += 1
+                acc += tilt[rank] * remaining[rank]
+            # p = c_r / left and q = t_r c_r / total, so p / q = total / (left t_r)
+            self.log_weight += math.log(total / (self.left * tilt[rank]))
+            remaining[rank] -= 1
+            self.left -= 1
+        self.counts[slot, rank] += 1
+        return self.cards[rank]
+
+    def __len__(self):
+        return sys.maxsize if self.num_decks is None else self.left
+
+    def __bool__(self):
+        return len(self) > 0
+
+
+class RareEvent(ABC):
+    """
+    An event observed over one trial of consecutive rounds.
+
+    observe() is called after every round; the trial ends once done() is true
+    or after max_hands rounds. score() is a progress measure: the event has
+    happened iff score() >= level, and cross-entropy tuning raises the level it
+    aims at step by step.
+    """
+    level = 1.0
+    max_hands = 1
+
+    def reset(self):
+        pass
+
+    @abstractmethod
+    def observe(self, game, reward):
+        """Update the trial's progress with one finished round."""
+
+    def done(self):
+        return False
+
+    @abstractmethod
+    def score(self):
+        """Progress of the current trial; the event happened iff score() >= level."""
+
+
+class NCardTwentyOne(RareEvent):
+    """A player hand of exactly 21 made with at least `cards` cards, in one round."""
+
+    def __init__(self, cards=6):
+        self.level = cards
+        self._best = 0
+
+    def reset(self):
+        self._best = 0
+
+    def observe(self, game, reward):
+        for i, hand in enumerate(game.player.hands):
+            if game.player.get_total(i) == 21:
+                self._best = max(self._best, len(hand))
+
+    def score(self):
+        return self._best
+
+
+class DoubledLosingStreak(RareEvent):
+    """The next `length` rounds in which the player doubles are all lost."""
+
+    def __init__(self, length=10, max_hands=100_000):
+        self.level = length
+        self.max_hands = max_hands
+        self._streak = 0
+        self._broken = False
+
+    def reset(self):
+        self._streak = 0
+        self._broken = False
+
+    def observe(self, game, reward):
+        if any(game.player.doubled_down):
+            if reward < 0:
+                self._streak += 1
+            else:
+                self._broken = True
+
+    def done(self):
+        return self._broken or self._streak >= self.level
+
+    def score(self):
+        return self._streak
+
+
+class Ruin(RareEvent):
+    """Losing `bankroll` units at some point within `hands` rounds (e.g. 100 rounds an hour)."""
+
+    def __init__(self, bankroll=100, hands=10_000):
+        self.level = bankroll
+        self.max_hands = hands
+        self._net = 0.0
+        self._drawdown = 0.0
+
+    def reset(self):
+        self._net = 0.0
+        self._drawdown = 0.0
+
+    def observe(self, game, reward):
+        self._net += reward
+        self._drawdown = max(self._drawdown, -self._net)
+
+    def done(self):
+        return self._drawdown >= self.level
+
+    def score(self):
+        return self._drawdown
+
+
+class _TiltedDealer(Dealer):
+    """Dealer that tells the tilted deck when its own draws begin."""
+
+    def play_hand(self, deck):
+        deck.dealer_drawing = True
+        return super().play_hand(deck)
+
+
+def _trials(event, strategy, num_trials, tilt, rules, seed, shoe):
+    """
+    Play `num_trials` trials from the tilted deck.
+
+    Returns:
+        (scores, log_weights, rank counts per trial, rounds played)
+    """
+    rules = rules if rules is not None else DEFAULT_RULES
+    tilt = np.ones((len(SLOTS), len(RANK_NAMES))) if tilt is None else tilt
+    rng = np.random.Generator(np.random.Philox(np.random.SeedSequence(seed)))
+    deck = TiltedDeck(tilt, rng, rules.num_decks if shoe else None)
+    game = Game(_TiltedDealer(rules), Player(strategy, rules), rules)
+    game.deck = deck
+
+    scores = np.empty(num_trials)
+    log_weights = np.empty(num_trials)
+    counts = np.empty((num_trials,) + deck.counts.shape, dtype=np.int64)
+    rounds = 0
+    for t in range(num_trials):
+        deck.start_trial()
+        event.reset()
+        for _ in range(event.max_hands):
+            if shoe and game.needs_shuffle():
+                deck.refill()
+            deck.start_round()
+            reward = play_round(game)
+            rounds += 1
+            event.observe(game, reward)
+            if event.done():
+                break
+        scores[t] = event.score()
+        log_weights[t] = deck.log_weight
+        counts[t] = deck.counts
+    return scores, log_weights, counts, rounds
+
+
+def estimate(event, strategy, num_trials, tilt=None, rules=None, seed=None, shoe=False):
+    """
+    Importance-sampling estimate of P(event) under normal play of `strategy`.
+
+    Args:
+        tilt: rank multipliers per deal slot (see TiltedDeck); None plays untilted,
+            which is plain Monte Carlo
+        shoe: draw from a finite shoe of rules.num_decks decks instead of an
+            infinite deck; every trial starts from a freshly filled shoe
+
+    Returns:
+        dict with probability, std_error, ci95, relative_error, hits, trials,
+        rounds, and the weight diagnostics mean_weight (close to 1 for a sound
+        tilt), ess (effective sample size of the hits), max_weight_share and
+        variance_reduction (plain Monte Carlo variance per trial / ours)
+    """
+    scores, log_weights, _, rounds = _trials(event, strategy, num_trials, tilt, rules, seed, shoe)
+    weights = np.exp(log_weights)
+    hit = scores >= event.level
+    values = np.where(hit, weights, 0.0)
+    p = float(values.mean())
+    variance = float(values.var(ddof=1)) if num_trials > 1 else 0.0
+    std_error = math.sqrt(variance / num_trials)
+    hit_weights = weights[hit]
+    return {
+        'probability': p,
+        'std_error': std_error,
+        'ci95': (p - 1.96 * std_error, p + 1.96 * std_error),
+        'relative_error': std_error / p if p > 0 else float('inf'),
+        'hits': int(hit.sum()),
+        'trials': num_trials,
+        'rounds': rounds,
+        'mean_weight': float(weights.mean()),
+        'ess': float(hit_weights.sum() ** 2 / (hit_weights ** 2).sum()) if hit.any() else 0.0,
+        'max_weight_share': float(hit_weights.max() / hit_weights.sum()) if hit.any() else 0.0,
+        'variance_reduction': p * (1 - p) / variance if variance > 0 else float('inf'),
+    }
+
+
+def cross_entropy_tilt(event, strategy, iterations=8, trials=10_000, rho=0.1, smoothing=0.7,
+                       defensive=0.1, rules=None, seed=0, shoe=False, verbose=False):
+    """
+    Tune the tilt with the cross-entropy method: play a batch, keep the elite
+    trials (top `rho` by score, or all that reach the event), and refit each
+    slot's rank distribution to their likelihood-weighted card counts.
+
+    Args:
+        defensive: share of the normal distribution mixed into every fitted
+            slot, which caps each card's likelihood ratio at 1 / defensive
+
+    Returns:
+        (tilt, history) where history holds (level reached, elite count) per iteration
+    """
+    tilt = np.ones((len(SLOTS), len(RANK_NAMES)))
+    history = []  # (level, elite trials)
+    for iteration in range(iterations):
+        scores, log_weights, counts, _ = _trials(event, strategy, trials, tilt, rules,
+                                                 [seed, iteration], shoe)
+        level = min(event.level, np.quantile(scores, 1 - rho))
+        if history and level <= history[-1][0] and (scores > history[-1][0]).any():
+            # Scores are coarse, so the quantile can stall on a tie: move on to the next score seen
+            level = min(event.level, scores[scores > history[-1][0]].min())
+        elite = scores >= level
+        if level <= 0 or not elite.any():
+            history.append((float(level), 0))
+            continue
+        weights = np.exp(log_weights[elite] - log_weights[elite].max())
+        fitted = np.einsum('t,tsr->sr', weights, counts[elite].astype(float))
+        totals = fitted.sum(axis=1, keepdims=True)
+        current = tilt / tilt.sum(axis=1, keepdims=True)
+        # Slots the elite never drew from keep their distribution
+        fitted = np.where(totals > 0, fitted / np.maximum(totals, 1e-300), current)
+        fitted = (1 - defensive) * fitted + defensive / len(RANK_NAMES)
+        tilt = (smoothing * fitted + (1 - smoothing) * current) * len(RANK_NAMES)
+        history.append((float(level), int(elite.sum())))
+        if verbose:
+            print(f"iteration {iteration}: level {level:g}, {int(elite.sum())} elite trials")
+    return tilt, history
+
+
+if __name__ == '__main__':
+    import time
+    from basic_strategy import BasicStrategy
+
+    event = NCardTwentyOne(int(sys.argv[1]) if len(sys.argv) > 1 else 6)
+    strategy = BasicStrategy()
+    start = time.perf_counter()
+    plain = estimate(event, strategy, 200_000, seed=1)
+    print(f"plain MC:  p={plain['probability']:.3e} ± {plain['std_error']:.1e} "
+          f"({plain['rounds']:,} rounds, {time.perf_counter() - start:.1f}s)")
+    start = time.perf_counter()
+    tilt, history = cross_entropy_tilt(event, strategy, seed=0, verbose=True)
+    tilted = estimate(event, strategy, 20_000, tilt=tilt, seed=1)
+    tuning = 10_000 * len(history)
+    print(f"tilted IS: p={tilted['probability']:.3e} ± {tilted['std_error']:.1e} "
+          f"({tilted['rounds']:,} rounds + {tuning:,} for tuning, {time.perf_counter() - start:.1f}s), "
+          f"variance reduction {tilted['variance_reduction']:.0f}x, mean weight {tilted['mean_weight']:.3f}")
@@ -0,0 +1,135 @@
+"""
+Infinite-deck mode: cards are drawn independently from a fixed distribution
+instead of being dealt from a finite, shuffled shoe.
+
+Draws use Walker's alias method in bulk NumPy buffers, so each card costs a
+list pop. Batch runners can also skip dealer drawing altogether and sample
+the dealer's final total from a cached outcome distribution.
+"""
+import sys
+from functools import lru_cache
+
+import numpy as np
+
+import hand_fsm as fsm
+
+# Final dealer totals, indexed by outcome number; 22 stands for any bust
+DEALER_TOTALS = np.array([17, 18, 19, 20, 21, 22], dtype=np.int16)
+
+
+class AliasSampler:
+    """
+    Walker's alias method: O(1) draws from a discrete distribution with one
+    uniform index and one uniform float per draw.
+    """
+
+    def __init__(self, weights=None, seed=None):
+        weights = np.ones(fsm.NUM_RANKS) if weights is None else np.asarray(weights, dtype=float)
+        if weights.ndim != 1 or weights.size == 0 or (weights < 0).any() or weights.sum() <= 0:
+            raise ValueError("weights must be a non-empty vector of non-negative numbers")
+        k = weights.size
+        scaled = weights * k / weights.sum()
+        self.prob = np.ones(k)
+        self.alias = np.arange(k)
+        small = [i for i in range(k) if scaled[i] < 1.0]
+        large = [i for i in range(k) if scaled[i] >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        self.rng = np.random.default_rng(seed)
+
+    def sample(self, size):
+        column = self.rng.integers(0, self.prob.size, size=size)
+        return np.where(self.rng.random(size) < self.prob[column], column, self.alias[column])
+
+
+class InfiniteDeck:
+    """
+    Endless stand-in for a shoe list. pop() returns the next i.i.d. draw, mapped
+    through `items` (e.g. Card objects) if given; it never runs out.
+    """
+
+    def __init__(self, sampler, items=None, buffer_size=65_536):
+        self.sampler = sampler
+        self.items = items
+        self.buffer_size = buffer_size
+        self._buffer = []
+
+    def pop(self):
+        if not self._buffer:
+            draws = self.sampler.sample(self.buffer_size).tolist()
+            self._buffer = [self.items[i] for i in draws] if self.items is not None else draws
+        return self._buffer.pop()
+
+    def __len__(self):
+        return sys.maxsize  # never needs a reshuffle
+
+    def __bool__(self):
+        return True
+
+
+@lru_cache(maxsize=None)
+def dealer_outcome_table(hits_soft_17=True, weights=None):
+    """
+    Probability of each final dealer total (DEALER_TOTALS) from every hand_fsm
+    state, for an infinite deck with rank `weights` (tuple; default uniform).
+
+    Returns:
+        array of shape (NUM_HAND_STATES, len(DEALER_TOTALS))
+    """
+    p = np.ones(fsm.NUM_RANKS) if weights is None else np.asarray(weights, dtype=float)
+    p = p / p.sum()
+    stands = fsm.dealer_stands[hits_soft_17]
+    hard = np.array([fsm.unpack(s)[0] for s in range(fsm.NUM_HAND_STATES)])
+    table = np.zeros((fsm.NUM_HAND_STATES, DEALER_TOTALS.size))
+    # Drawing always raises the hard total, so work down from the highest
+    for h in range(fsm.BUST, -1, -1):
+        states = np.flatnonzero(hard == h)
+        standing = states[stands[states]]
+        table[standing, np.searchsorted(DEALER_TOTALS, np.minimum(fsm.total[standing], 22))] = 1.0
+        drawing = states[~stands[states]]
+        table[drawing] = np.einsum('r,srk->sk', p, table[fsm.next_state[drawing]])
+    table.setflags(write=False)
+    return table
+
+
+@lru_cache(maxsize=None)
+def _cumulative_table(hits_soft_17=True, weights=None):
+    cdf = np.cumsum(dealer_outcome_table(hits_soft_17, weights), axis=1)
+    cdf[:, -1] = 1.0
+    return cdf
+
+
+def sample_dealer_totals(rng, states, hits_soft_17=True, weights=None):
+    """Final dealer totals (22 = bust) for an array of dealer hand states, without drawing cards."""
+    cdf = _cumulative_table(hits_soft_17, weights)[states]
+    outcome = (rng.random(len(states))[:, None] >= cdf).sum(axis=1)
+    return DEALER_TOTALS[np.minimum(outcome, DEALER_TOTALS.size - 1)]
+
+
+def dealer_states(hard, has_ace):
+    """hand_fsm states of two-card dealer hands given as hard totals (Aces as 1) and Ace flags."""
+    hard = np.minimum(np.asarray(hard), fsm.BUST)
+    return ((hard * 2 + np.asarray(has_ace, dtype=int)) * fsm.NUM_COUNTS + 2) * fsm.NUM_FIRST
+
+
+class DealerSampler:
+    """Per-hand dealer results from the cached outcome table, drawn from bulk uniform buffers."""
+
+    def __init__(self, hits_soft_17=True, seed=None, buffer_size=65_536):
+        self.cdf = _cumulative_table(hits_soft_17).tolist()
+        self.rng = np.random.default_rng(seed)
+        self.buffer_size = buffer_size
+        self._uniforms = []
+
+    def final_total(self, state):
+        if not self._uniforms:
+            self._uniforms = self.rng.random(self.buffer_size).tolist()
+        u = self._uniforms.pop()
+        for outcome, threshold in enumerate(self.cdf[state]):
+            if u < threshold:
+                return int(DEALER_TOTALS[outcome])
+        return int(DEALER_TOTALS[-1])
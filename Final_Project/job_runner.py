@@ -0,0 +1,251 @@
+"""
+Resumable sharded jobs.
+
+A job is split into deterministic shards, each defined by its own seed, and
+lives in a job directory:
+
+    job.json            the job definition
+    shard-00017.json    aggregate result of a finished shard (written atomically)
+    shard-00017.lock    held by the worker currently running that shard
+
+Any number of worker processes, started at any time, can point at the same
+directory: each takes the next shard that is neither finished nor locked. A
+worker that dies loses only the shard it was running, and its lock is
+released by the operating system, so a restart picks up exactly where the
+job stopped.
+
+Simulation jobs have independent shards and scale across workers. Training
+jobs form a chain: shard i continues from the Q-table checkpoint of shard i-1.
+"""
+import json
+import math
+import os
+import tempfile
+import time
+from multiprocessing import Pool
+
+from rules import Rules
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+JOB_FILE = 'job.json'
+
+
+def shard_seed(seed, shard):
+    """Seed of one shard; shards of a job, and of jobs with different seeds, never share shoes."""
+    return seed * 2 ** 32 + shard
+
+
+def _shard_path(directory, shard, suffix):
+    return os.path.join(directory, f"shard-{shard:05d}{suffix}")
+
+
+def _write_atomic(path, data):
+    directory = os.path.dirname(path)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _try_lock(path):
+    """Non-blocking exclusive lock on `path`. Returns the open file, or None if it is held."""
+    f = open(path, 'a+')
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        f.close()
+        return None
+    return f
+
+
+def create_job(directory, kind, num_shards, seed=0, rules=None, infinite_deck=False, **params):
+    """
+    Define a job in `directory`, or reopen the identical job already defined there.
+
+    Args:
+        kind: 'simulate' (params: strategy, hands_per_shard) or
+              'train' (params: episodes_per_shard and QLearningStrategy settings)
+        num_shards: number of shards
+        infinite_deck: simulation shards draw cards i.i.d. instead of from
+            shoes; stored with the shard params. Training shards always learn
+            from infinite-deck hands, so a train job ignores it.
+
+    Raises:
+        ValueError: if the directory already holds a different job
+    """
+    if kind not in SHARD_TASKS:
+        raise ValueError(f"unknown job kind {kind!r}")
+    if infinite_deck and kind == 'simulate':
+        params['infinite_deck'] = True
+    job = {'kind': kind, 'num_shards': num_shards, 'seed': seed,
+           'rules': (rules if rules is not None else Rules()).as_dict(), 'params': params}
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, JOB_FILE)
+    if os.path.exists(path):
+        existing = load_job(directory)
+        if existing != json.loads(json.dumps(job)):
+            raise ValueError(f"{directory} already holds a different job")
+        return existing
+    _write_atomic(path, json.dumps(job, indent=2).encode())
+    return job
+
+
+def load_job(directory):
+    with open(os.path.join(directory, JOB_FILE)) as f:
+        return json.load(f)
+
+
+def shard_result(directory, shard):
+    """Result dict of a finished shard, or None."""
+    try:
+        with open(_shard_path(directory, shard, '.json')) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _simulate_shard(job, shard, directory):
+    from strategy_loader import load_strategy
+    from simulation import simulate_games
+
+    params = job['params']
+    result = simulate_games(load_strategy(params['strategy']), params['hands_per_shard'],
+                            rules=Rules(**job['rules']), seed=shard_seed(job['seed'], shard),
+                            infinite_deck=params.get('infinite_deck', False))
+    rewards = result['rewards']
+    return {'hands': len(rewards), 'sum': math.fsum(rewards),
+            'sum_sq': math.fsum(r * r for r in rewards),
+            'wins': result['wins'], 'losses': result['losses'], 'draws': result['draws']}
+
+
+def _train_shard(job, shard, directory):
+    import numpy as np
+    from qlearning_strategy import QLearningStrategy
+
+    params = dict(job['params'])
+    episodes = params.pop('episodes_per_shard')
+    q_table = None
+    if shard > 0:
+        previous = shard_result(directory, shard - 1)
+        with np.load(os.path.join(directory, previous['checkpoint'])) as data:
+            q_table = data['Q']
+        params['exploration_rate'] = previous['exploration_rate']
+    learner = QLearningStrategy(q_table=q_table, seed=shard_seed(job['seed'], shard), **params)
+    learner.train(episodes, rules=Rules(**job['rules']))
+
+    checkpoint = os.path.basename(_shard_path(directory, shard, '.npz'))
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(fd, 'wb') as f:
+        np.savez(f, Q=learner.Q)
+    os.replace(tmp, os.path.join(directory, checkpoint))
+    return {'episodes': episodes, 'exploration_rate': learner.exploration_rate,
+            'checkpoint': checkpoint}
+
+
+SHARD_TASKS = {'simulate': _simulate_shard, 'train': _train_shard}
+
+# Shards of these kinds depend on the previous shard and must run in order
+CHAINED = {'train'}
+
+
+def run_worker(directory, max_shards=None):
+    """
+    Run unfinished, unlocked shards of the job in `directory` until none are left.
+
+    Returns:
+        number of shards this worker completed
+    """
+    job = load_job(directory)
+    task = SHARD_TASKS[job['kind']]
+    completed = 0
+    for shard in range(job['num_shards']):
+        if max_shards is not None and completed >= max_shards:
+            break
+        if shard_result(directory, shard) is not None:
+            continue
+        lock = _try_lock(_shard_path(directory, shard, '.lock'))
+        if lock is None:
+            if job['kind'] in CHAINED:
+                break  # someone else is running the shard the rest of the chain needs
+            continue
+        try:
+            if shard_result(directory, shard) is not None:
+                continue  # finished while we were checking
+            start = time.time()
+            result = task(job, shard, directory)
+            result.update(shard=shard, seed=shard_seed(job['seed'], shard),
+                          seconds=round(time.time() - start, 3))
+            _write_atomic(_shard_path(directory, shard, '.json'), json.dumps(result).encode())
+            completed += 1
+        finally:
+            lock.close()
+        try:
+            os.remove(_shard_path(directory, shard, '.lock'))
+        except OSError:
+            pass
+    return completed
+
+
+def run_job(directory, processes=None):
+    """Run the job with `processes` local workers sharing the directory. Returns collect()."""
+    processes = processes or os.cpu_count() or 1
+    if processes > 1 and load_job(directory)['kind'] not in CHAINED:
+        with Pool(processes) as pool:
+            pool.map(run_worker, [directory] * processes)
+    else:
+        run_worker(directory)
+    return collect(directory)
+
+
+def collect(directory):
+    """
+    Merge the finished shards.
+
+    Returns:
+        dict with the shard counts and, for simulation jobs, pooled wins, losses,
+        draws, avg_reward and std_error; for training jobs, the latest checkpoint
+    """
+    job = load_job(directory)
+    results = [r for r in (shard_result(directory, s) for s in range(job['num_shards']))
+               if r is not None]
+    summary = {'kind': job['kind'], 'shards': job['num_shards'], 'completed': len(results),
+               'done': len(results) == job['num_shards']}
+    if job['kind'] == 'simulate':
+        n = sum(r['hands'] for r in results)
+        total = math.fsum(r['sum'] for r in results)
+        mean = total / n if n else 0.0
+        variance = (math.fsum(r['sum_sq'] for r in results) - n * mean * mean) / (n - 1) if n > 1 else 0.0
+        summary.update(hands=n, wins=sum(r['wins'] for r in results),
+                       losses=sum(r['losses'] for r in results),
+                       draws=sum(r['draws'] for r in results), avg_reward=mean,
+                       std_error=math.sqrt(max(variance, 0.0) / n) if n else 0.0)
+    else:
+        # Only an unbroken prefix of the chain counts
+        chain = []
+        for shard in range(job['num_shards']):
+            result = shard_result(directory, shard)
+            if result is None:
+                break
+            chain.append(result)
+        summary.update(episodes=sum(r['episodes'] for r in chain),
+                       checkpoint=os.path.join(directory, chain[-1]['checkpoint']) if chain else None)
+    return summary
+
+
+if __name__ == '__main__':
+    import sys
+
+    directory = sys.argv[1] if len(sys.argv) > 1 else 'basic_1e8'
+    if not os.path.exists(os.path.join(directory, JOB_FILE)):
+        create_job(directory, 'simulate', num_shards=1000, strategy='basic', hands_per_shard=100_000)
+    print(json.dumps(run_job(directory), indent=2))
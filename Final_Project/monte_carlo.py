@@ -0,0 +1,144 @@
+from multiprocessing import Pool
+
+import numpy as np
+
+from rules import DEFAULT_RULES
+from tabular import TabularStrategy, ACTIONS, NUM_STATES, Q_SHAPE, STAND
+from batch_engine import run_episodes
+
+
+def _epsilon_greedy(rng, first_policy, later_policy, epsilon):
+    """Action selector for run_episodes: greedy table lookup with epsilon-random exploration."""
+    def select_action(states, first):
+        if first:
+            greedy, num_actions = first_policy[states], len(ACTIONS)
+        else:
+            greedy, num_actions = later_policy[states], STAND + 1  # hit or stand
+        explore = rng.random(states.size) < epsilon
+        return np.where(explore, rng.integers(0, num_actions, size=states.size), greedy)
+    return select_action
+
+
+def _generate_batch(args):
+    """Play one batch of episodes and return its (returns, visits) increments. Runs in worker processes."""
+    first_policy, later_policy, epsilon, rules, seed_sequence, num_episodes = args
+    rng = np.random.Generator(np.random.Philox(seed_sequence))
+    select_action = _epsilon_greedy(rng, first_policy, later_policy, epsilon)
+    states, actions, rewards = run_episodes(rng, num_episodes, select_action, rules)
+
+    visited = states >= 0
+    episode_returns = np.broadcast_to(rewards, states.shape)[visited]
+    returns_sum = np.zeros((NUM_STATES, len(ACTIONS)))
+    visits = np.zeros((NUM_STATES, len(ACTIONS)))
+    np.add.at(returns_sum, (states[visited], actions[visited]), episode_returns)
+    np.add.at(visits, (states[visited], actions[visited]), 1)
+    return returns_sum, visits, float(rewards.mean())
+
+
+class MonteCarloControl:
+    """
+    Every-visit Monte Carlo control for single-hand blackjack on an infinite deck.
+
+    Episodes are generated in vectorized batches; the return of every visited
+    (state, action) is accumulated with np.add.at, and the policy is made
+    greedy with respect to the averaged returns after each batch.
+
+    Returns collected under early, poor policies would dominate the averages
+    for a long time, so before each batch the accumulated statistics are
+    scaled by a forgetting factor that starts at `forget` and anneals to 1
+    (the plain every-visit average) at rate `forget_decay`.
+
+    A starting `q_table` (see warm_start) enters as prior returns worth
+    `prior_visits` visits per cell, forgotten like any other early returns.
+    """
+
+    def __init__(self, rules=None, epsilon=0.2, min_epsilon=0.01, epsilon_decay=0.95,
+                 forget=0.5, forget_decay=0.95, batch_size=100_000, seed=0, q_table=None,
+                 prior_visits=100):
+        self.rules = rules if rules is not None else DEFAULT_RULES
+        self.epsilon = epsilon
+        self.min_epsilon = min_epsilon
+        self.epsilon_decay = epsilon_decay
+        self.forget = forget
+        self.forget_decay = forget_decay
+        self.batch_size = batch_size
+        self.seed = seed
+        self.returns_sum = np.zeros((NUM_STATES, len(ACTIONS)))
+        self.visits = np.zeros((NUM_STATES, len(ACTIONS)))
+        if q_table is not None:
+            self.visits[:] = prior_visits
+            self.returns_sum[:] = np.reshape(q_table, self.visits.shape) * prior_visits
+        self.episodes = 0
+        self.batches = 0
+        self.history = []  # mean reward of each batch (under the exploring policy)
+
+    def q_values(self):
+        """Average return per (state, action); unvisited pairs are 0."""
+        return np.divide(self.returns_sum, self.visits,
+                         out=np.zeros_like(self.returns_sum), where=self.visits > 0)
+
+    def _policies(self):
+        q = self.q_values()
+        return np.argmax(q, axis=1), np.argmax(q[:, :STAND + 1], axis=1)
+
+    def _tasks(self, sizes):
+        first_policy, later_policy = self._policies()
+        tasks = []
+        for worker, size in enumerate(sizes):
+            seed_sequence = np.random.SeedSequence([self.seed, self.batches, worker])
+            tasks.append((first_policy, later_policy, self.epsilon, self.rules, seed_sequence, size))
+        return tasks
+
+    def _accumulate(self, results):
+        keep = 1.0 - (1.0 - self.forget) * self.forget_decay ** self.batches
+        self.returns_sum *= keep
+        self.visits *= keep
+        for returns_sum, visits, mean_reward in results:
+            self.returns_sum += returns_sum
+            self.visits += visits
+            self.history.append(mean_reward)
+        self.batches += 1
+        self.epsilon = max(self.min_epsilon, self.epsilon * self.epsilon_decay)
+
+    def train(self, num_episodes, processes=None):
+        """
+        Run `num_episodes` more episodes and return the greedy TabularStrategy.
+
+        With processes > 1, each batch is split across a process pool; the
+        policy is still improved once per batch, after all workers report back.
+        """
+        remaining = num_episodes
+        pool = Pool(processes) if processes and processes > 1 else None
+        try:
+            while remaining > 0:
+                batch = min(self.batch_size, remaining)
+                if pool is None:
+                    results = [_generate_batch(self._tasks([batch])[0])]
+                else:
+                    share, extra = divmod(batch, processes)
+                    sizes = [share + (1 if i < extra else 0) for i in range(processes)]
+                    results = pool.map(_generate_batch, self._tasks([s for s in sizes if s]))
+                self._accumulate(results)
+                self.episodes += batch
+                remaining -= batch
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+        return self.strategy()
+
+    def strategy(self):
+        """The current greedy policy as a Strategy."""
+        return TabularStrategy(self.q_values().reshape(Q_SHAPE))
+
+
+if __name__ == '__main__':
+    import time
+    from simulation import simulate_games
+
+    trainer = MonteCarloControl()
+    start = time.time()
+    strategy = trainer.train(10_000_000)
+    print(f"Trained {trainer.episodes:,} episodes in {time.time() - start:.1f}s")
+    result = simulate_games(strategy, 20_000, seed=1)
+    print(f"Avg reward over 20,000 hands: {result['avg_reward']:.4f}")
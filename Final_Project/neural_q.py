@@ -0,0 +1,284 @@
+import hashlib
+
+import numpy as np
+
+from strategy import Strategy
+from tabular import (TOTALS, UPCARDS, ACTIONS, ACTION_INDEX, STAND,
+                     upcard_value, decode_flat_states, legal_mask, masked_argmax)
+from batch_engine import run_episodes, episode_transitions
+
+BASE_FEATURES = len(TOTALS) + 1 + len(UPCARDS)
+
+
+def encode_features(totals, soft, upcards, extra=None):
+    """
+    Vectorized network input: one-hot total, soft flag, one-hot upcard, then any
+    extra numeric features (e.g. running count or shoe composition) as columns.
+    """
+    totals = np.clip(np.asarray(totals), TOTALS[0], TOTALS[-1])
+    n = totals.shape[0]
+    x = np.zeros((n, BASE_FEATURES + (0 if extra is None else extra.shape[1])), dtype=np.float32)
+    rows = np.arange(n)
+    x[rows, totals - TOTALS[0]] = 1.0
+    x[:, len(TOTALS)] = soft
+    x[rows, len(TOTALS) + 1 + np.asarray(upcards) - UPCARDS[0]] = 1.0
+    if extra is not None:
+        x[:, BASE_FEATURES:] = extra
+    return x
+
+
+def states_to_features(states):
+    """Features for a list of Strategy states; anything after the first three fields is an extra feature."""
+    totals = np.array([s[0] for s in states])
+    upcards = np.array([upcard_value(s[1]) for s in states])
+    soft = np.array([bool(s[2]) for s in states], dtype=np.float32)
+    extra = None
+    if states and len(states[0]) > 3:
+        extra = np.array([np.ravel(s[3:]) for s in states], dtype=np.float32)
+    return encode_features(totals, soft, upcards, extra)
+
+
+class MLP:
+    """Fully connected ReLU network with a linear output layer, trained with Adam."""
+
+    def __init__(self, sizes, seed=0, learning_rate=1e-3, beta1=0.9, beta2=0.999, eps=1e-8):
+        rng = np.random.default_rng(seed)
+        self.weights = [(rng.standard_normal((fan_in, fan_out)) * np.sqrt(2.0 / fan_in)).astype(np.float32)
+                        for fan_in, fan_out in zip(sizes[:-1], sizes[1:])]
+        self.biases = [np.zeros(fan_out, dtype=np.float32) for fan_out in sizes[1:]]
+        self.learning_rate = learning_rate
+        self.beta1, self.beta2, self.eps = beta1, beta2, eps
+        self._m = [np.zeros_like(p) for p in self.parameters()]
+        self._v = [np.zeros_like(p) for p in self.parameters()]
+        self.steps = 0
+
+    def parameters(self):
+        return self.weights + self.biases
+
+    def forward(self, x):
+        """Batched forward pass. Returns the output and the activations needed for backward()."""
+        activations = [x]
+        for w, b in zip(self.weights[:-1], self.biases[:-1]):
+            x = np.maximum(x @ w + b, 0.0)
+            activations.append(x)
+        return x @ self.weights[-1] + self.biases[-1], activations
+
+    def predict(self, x):
+        """Inference-only forward pass, in place on each layer's output to avoid temporaries."""
+        for w, b in zip(self.weights[:-1], self.biases[:-1]):
+            x = x @ w
+            x += b
+            np.maximum(x, 0.0, out=x)
+        out = x @ self.weights[-1]
+        out += self.biases[-1]
+        return out
+
+    def backward(self, activations, grad_output):
+        """Gradients of the loss w.r.t. weights and biases, given d loss / d output."""
+        grads_w, grads_b = [], []
+        grad = grad_output
+        for layer in range(len(self.weights) - 1, -1, -1):
+            grads_w.append(activations[layer].T @ grad)
+            grads_b.append(grad.sum(axis=0))
+            if layer > 0:
+                grad = (grad @ self.weights[layer].T) * (activations[layer] > 0)
+        return grads_w[::-1] + grads_b[::-1]
+
+    def adam_step(self, grads):
+        self.steps += 1
+        lr = (self.learning_rate * np.sqrt(1 - self.beta2 ** self.steps)
+              / (1 - self.beta1 ** self.steps))
+        for param, grad, m, v in zip(self.parameters(), grads, self._m, self._v):
+            m *= self.beta1
+            m += (1 - self.beta1) * grad
+            v *= self.beta2
+            v += (1 - self.beta2) * grad * grad
+            param -= (lr * m / (np.sqrt(v) + self.eps)).astype(param.dtype)
+
+    def sgd_step(self, grads):
+        self.steps += 1
+        for param, grad in zip(self.parameters(), grads):
+            param -= (self.learning_rate * grad).astype(param.dtype)
+
+    def copy_from(self, other):
+        for mine, theirs in zip(self.parameters(), other.parameters()):
+            mine[...] = theirs
+
+
+class ReplayBuffer:
+    """Fixed-size ring buffer of (features, action, reward, next_features, done) transitions."""
+
+    def __init__(self, capacity, num_features, seed=0):
+        self.capacity = capacity
+        self.features = np.zeros((capacity, num_features), dtype=np.float32)
+        self.next_features = np.zeros((capacity, num_features), dtype=np.float32)
+        self.actions = np.zeros(capacity, dtype=np.int64)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.done = np.zeros(capacity, dtype=bool)
+        self.size = 0
+        self._next = 0
+        self._rng = np.random.default_rng(seed)
+
+    def add(self, features, actions, rewards, next_features, done):
+        """Append a batch of transitions, overwriting the oldest when full."""
+        for start in range(0, len(actions), self.capacity):
+            stop = min(start + self.capacity, len(actions))
+            count = stop - start
+            positions = (self._next + np.arange(count)) % self.capacity
+            self.features[positions] = features[start:stop]
+            self.actions[positions] = actions[start:stop]
+            self.rewards[positions] = rewards[start:stop]
+            self.next_features[positions] = next_features[start:stop]
+            self.done[positions] = done[start:stop]
+            self._next = (self._next + count) % self.capacity
+            self.size = min(self.size + count, self.capacity)
+
+    def sample(self, batch_size):
+        idx = self._rng.integers(0, self.size, size=batch_size)
+        return (self.features[idx], self.actions[idx], self.rewards[idx],
+                self.next_features[idx], self.done[idx])
+
+
+class NeuralQStrategy(Strategy):
+    """
+    Q-function approximated by a small NumPy MLP: features -> one Q-value per action.
+
+    determine_actions() answers a whole batch of states with one forward pass.
+    """
+
+    def __init__(self, hidden=(32, 32), num_extra_features=0, learning_rate=1e-3,
+                 discount_factor=1.0, exploration_rate=0.1, seed=0):
+        self.num_features = BASE_FEATURES + num_extra_features
+        self.hidden = tuple(hidden)
+        self.network = MLP((self.num_features,) + self.hidden + (len(ACTIONS),),
+                           seed=seed, learning_rate=learning_rate)
+        self.target = MLP((self.num_features,) + self.hidden + (len(ACTIONS),), seed=seed)
+        self.target.copy_from(self.network)
+        self.discount_factor = discount_factor
+        self.exploration_rate = exploration_rate
+        self.rng = np.random.default_rng(seed)
+        self.buffer = None
+
+    # Decisions
+
+    def q_values(self, features):
+        return self.network.predict(features)
+
+    def greedy_actions(self, features):
+        """Array fast path: greedy action index for every row of a feature matrix."""
+        return np.argmax(self.q_values(features), axis=1)
+
+    def determine_action(self, state):
+        return self.determine_actions([state])[0]
+
+    def determine_actions(self, states):
+        return [ACTIONS[i] for i in self.greedy_actions(states_to_features(states))]
+
+    def determine_legal_action(self, state, legal):
+        return ACTIONS[masked_argmax(self.q_values(states_to_features([state]))[0], legal)]
+
+    def determine_legal_actions(self, states, legals):
+        masks = legal_mask(np.asarray(legals)[:, None])
+        q = np.where(masks, self.q_values(states_to_features(states)), -np.inf)
+        return [ACTIONS[i] for i in np.argmax(q, axis=1)]
+
+    def get_Q(self, state, action):
+        return float(self.q_values(states_to_features([state]))[0, ACTION_INDEX[action]])
+
+    def policy_digest(self):
+        """Short hash of the network weights."""
+        digest = hashlib.sha256()
+        for param in self.network.parameters():
+            digest.update(param.tobytes())
+        return digest.hexdigest()[:16]
+
+    # Training
+
+    def train_batch(self, features, actions, rewards, next_features, done, optimizer='adam'):
+        """One gradient step on a mini-batch of transitions (squared TD error). Returns the loss."""
+        next_q = self.target.predict(next_features)
+        # Only hit and stand are possible after the first decision
+        targets = rewards + self.discount_factor * np.where(done, 0.0, next_q[:, :STAND + 1].max(axis=1))
+
+        q, activations = self.network.forward(features)
+        rows = np.arange(len(actions))
+        td_error = q[rows, actions] - targets
+        grad_output = np.zeros_like(q)
+        grad_output[rows, actions] = 2.0 * td_error / len(actions)
+        grads = self.network.backward(activations, grad_output)
+        if optimizer == 'sgd':
+            self.network.sgd_step(grads)
+        else:
+            self.network.adam_step(grads)
+        return float(np.mean(td_error ** 2))
+
+    def _select_action(self, states, first):
+        totals, soft, upcards = decode_flat_states(states)
+        q = self.q_values(encode_features(totals, soft, upcards))
+        if not first:
+            q = q[:, :STAND + 1]
+        greedy = np.argmax(q, axis=1)
+        explore = self.rng.random(states.size) < self.exploration_rate
+        return np.where(explore, self.rng.integers(0, q.shape[1], size=states.size), greedy)
+
+    def train(self, num_episodes, episodes_per_round=4096, updates_per_round=32,
+              batch_size=512, buffer_size=200_000, target_sync=200, rules=None):
+        """
+        Collect infinite-deck episodes with an epsilon-greedy policy into a replay
+        buffer and fit the network with mini-batch Adam updates.
+
+        Only the base (total, soft, upcard) features are generated here; strategies
+        with extra features are trained through train_batch() directly.
+        """
+        if self.buffer is None:
+            self.buffer = ReplayBuffer(buffer_size, self.num_features, seed=int(self.rng.integers(2 ** 31)))
+        losses = []
+        collected = 0
+        while collected < num_episodes:
+            n = min(episodes_per_round, num_episodes - collected)
+            states, actions, rewards = run_episodes(self.rng, n, self._select_action, rules)
+            s, a, r, s_next, done = episode_transitions(states, actions, rewards)
+            if len(a):
+                self.buffer.add(encode_features(*decode_flat_states(s)), a, r,
+                                encode_features(*decode_flat_states(s_next)), done)
+            collected += n
+            for _ in range(updates_per_round):
+                if self.buffer.size < batch_size:
+                    break
+                losses.append(self.train_batch(*self.buffer.sample(batch_size)))
+                if self.network.steps % target_sync == 0:
+                    self.target.copy_from(self.network)
+        return losses
+
+    # Persistence
+
+    def save(self, path):
+        arrays = {f"W{i}": w for i, w in enumerate(self.network.weights)}
+        arrays.update({f"b{i}": b for i, b in enumerate(self.network.biases)})
+        np.savez(path, hidden=np.array(self.hidden), num_features=self.num_features, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            num_extra = int(data['num_features']) - BASE_FEATURES
+            strategy = cls(hidden=tuple(int(h) for h in data['hidden']), num_extra_features=num_extra)
+            for i in range(len(strategy.network.weights)):
+                strategy.network.weights[i][...] = data[f"W{i}"]
+                strategy.network.biases[i][...] = data[f"b{i}"]
+        strategy.target.copy_from(strategy.network)
+        return strategy
+
+
+if __name__ == '__main__':
+    import time
+
+    # Inference benchmark: the target is 1 ms per batch of 4096 states
+    strategy = NeuralQStrategy(seed=0)
+    rng = np.random.default_rng(0)
+    features = encode_features(rng.integers(4, 22, 4096), rng.integers(0, 2, 4096), rng.integers(2, 12, 4096))
+    strategy.q_values(features)
+    runs = 200
+    start = time.perf_counter()
+    for _ in range(runs):
+        strategy.q_values(features)
+    print(f"{len(features)} states per batch: {1000 * (time.perf_counter() - start) / runs:.3f} ms")
@@ -0,0 +1,105 @@
+import random
+
+import numpy as np
+
+from tabular import TabularStrategy, ACTIONS, ACTION_INDEX, NUM_STATES, STAND, legal_mask, state_index
+from batch_engine import run_episodes, episode_transitions
+
+
+def td_batch_update(q, transitions, learning_rate, discount_factor=1.0, visits=None):
+    """
+    Apply one batch of Q-learning updates to `q` (shape NUM_STATES x actions) in place.
+
+    The TD errors of all transitions that hit the same (state, action) are
+    averaged and applied as one update, so the step size does not grow with
+    the batch. `visits`, if given, accumulates the transition counts.
+    """
+    s, a, r, s_next, done = transitions
+    targets = r + discount_factor * np.where(done, 0.0, q[s_next, :STAND + 1].max(axis=1))
+    td_sum = np.zeros(q.shape)
+    counts = np.zeros(q.shape)
+    np.add.at(td_sum, (s, a), targets - q[s, a])
+    np.add.at(counts, (s, a), 1)
+    touched = counts > 0
+    q[touched] += learning_rate * td_sum[touched] / counts[touched]
+    if visits is not None:
+        visits += counts.astype(visits.dtype)
+
+
+class QLearningStrategy(TabularStrategy):
+    """
+    Tabular Q-learning over (total, soft, upcard, action).
+
+    determine_action() is epsilon-greedy with `exploration_rate`; greedy()
+    returns the learned policy without exploration for evaluation.
+    """
+
+    def __init__(self, learning_rate=0.1, discount_factor=1.0, exploration_rate=0.1,
+                 exploration_decay=1.0, min_exploration_rate=0.0, q_table=None, seed=None):
+        super().__init__(q_table)
+        self.learning_rate = learning_rate
+        self.discount_factor = discount_factor
+        self.exploration_rate = exploration_rate
+        self.exploration_decay = exploration_decay
+        self.min_exploration_rate = min_exploration_rate
+        self.episodes = 0
+        self._random = random.Random(seed)
+        self._rng = np.random.default_rng(seed)
+
+    def determine_action(self, state):
+        if self._random.random() < self.exploration_rate:
+            return self._random.choice(ACTIONS)
+        return super().determine_action(state)
+
+    def determine_legal_action(self, state, legal):
+        """Epsilon-greedy among the legal actions only."""
+        if self._random.random() < self.exploration_rate:
+            return ACTIONS[self._random.choice(np.flatnonzero(legal_mask(legal)).tolist())]
+        return super().determine_legal_action(state, legal)
+
+    def update_Q(self, state, action, reward, next_state, done=False):
+        """One-step Q-learning update. After a hit only hitting or standing remains possible."""
+        index = state_index(state) + (ACTION_INDEX[action],)
+        target = reward
+        if not done:
+            target += self.discount_factor * np.max(self.Q[state_index(next_state)][:STAND + 1])
+        self.Q[index] += self.learning_rate * (target - self.Q[index])
+
+    def policy_digest(self):
+        # While exploring, play depends on the learner's own RNG state, not on the
+        # simulation seed, so the results are not reproducible (None: uncacheable)
+        if self.exploration_rate > 0:
+            return None
+        return f"{super().policy_digest()}-eps0"
+
+    def greedy(self):
+        """Snapshot of the current greedy policy."""
+        return TabularStrategy(self.Q.copy())
+
+    def _select_action(self, states, first):
+        q = self.Q.reshape(NUM_STATES, len(ACTIONS))[states]
+        if not first:
+            q = q[:, :STAND + 1]
+        greedy = np.argmax(q, axis=1)
+        explore = self._rng.random(states.size) < self.exploration_rate
+        return np.where(explore, self._rng.integers(0, q.shape[1], size=states.size), greedy)
+
+    def train(self, num_episodes, batch_size=1000, rules=None):
+        """
+        Learn from `num_episodes` infinite-deck hands, played `batch_size` at a time.
+
+        Within a batch the policy is fixed and the batch is applied with
+        td_batch_update(). Exploration decays once per batch.
+        """
+        q = self.Q.reshape(NUM_STATES, len(ACTIONS))
+        done_episodes = 0
+        while done_episodes < num_episodes:
+            n = min(batch_size, num_episodes - done_episodes)
+            transitions = episode_transitions(*run_episodes(self._rng, n, self._select_action, rules))
+            td_batch_update(q, transitions, self.learning_rate, self.discount_factor)
+
+            done_episodes += n
+            self.exploration_rate = max(self.min_exploration_rate,
+                                        self.exploration_rate * self.exploration_decay)
+        self.episodes += num_episodes
+        return self
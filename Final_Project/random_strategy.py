@@ -1,10 +1,14 @@
 import random
-from strategy import Strategy
+from strategy import Strategy, legal_names
 
 class RandomStrategy(Strategy):
-    """Returns random actions: hit, stand, double down, or split."""
+    """Returns random actions: hit, stand, double down, or split; only legal ones when given a mask."""
 
     ACTIONS = ["hit", "stand", "double down", "split"]
+    uses_global_random = True  # not reproducible from a game seed, so never cached
 
     def determine_action(self, state):
         return random.choice(self.ACTIONS)
+
+    def determine_legal_action(self, state, legal):
+        return random.choice(legal_names(legal))
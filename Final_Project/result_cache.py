@@ -0,0 +1,140 @@
+import hashlib
+import json
+import os
+import tempfile
+
+from rules import DEFAULT_RULES
+
+# Bump whenever a change to the engine alters simulation results, so stale entries are never reused
+ENGINE_VERSION = 4
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'blackjackql')
+
+
+def strategy_identity(strategy):
+    """
+    Stable identity of a strategy for cache keys (the rules are keyed
+    separately by cache_key): the policy digest for learned table/network
+    policies, the wrapper's class around the identity of the strategy it
+    delegates to for wrappers (those with a `wrapped` attribute), otherwise
+    the module and class name.
+
+    Returns:
+        the identity string, or None when results cannot be cached because
+        the strategy is not reproducible from the seed: it draws from the
+        global `random` module (uses_global_random), or its policy_digest()
+        is None (e.g. a Q-learner that still explores with its own RNG)
+    """
+    if getattr(strategy, 'uses_global_random', False):
+        return None
+    name = f"{type(strategy).__module__}.{type(strategy).__name__}"
+    if hasattr(strategy, 'wrapped'):
+        inner = strategy_identity(strategy.wrapped)
+        return f"{name}({inner})" if inner is not None else None
+    if hasattr(strategy, 'policy_digest'):
+        digest = strategy.policy_digest()
+        return f"{type(strategy).__name__}:{digest}" if digest is not None else None
+    return name
+
+
+def cache_key(strategy, rules, seed, num_games, infinite_deck=False):
+    """Key of one simulation request, or None when the strategy cannot be cached."""
+    identity = strategy_identity(strategy)
+    if identity is None:
+        return None
+    rules = rules if rules is not None else DEFAULT_RULES
+    request = {
+        'strategy': identity,
+        'rules': rules.as_dict(),
+        'seed': seed,
+        'hands': num_games,
+        'engine': ENGINE_VERSION,
+    }
+    if infinite_deck:
+        request['infinite_deck'] = True
+    payload = json.dumps(request, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResultCache:
+    """
+    Content-addressed on-disk store of simulation results.
+
+    Each entry is <key>.json with the aggregate statistics and, optionally,
+    <key>.rewards with the per-hand outcomes as packed doubles. The total size
+    is bounded: when it exceeds `max_bytes`, least recently used entries (by
+    file modification time, which every hit refreshes with os.utime) are evicted.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=256 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def _paths(self, key):
+        base = os.path.join(self.directory, key)
+        return base + '.json', base + '.rewards'
+
+    def _write_atomic(self, path, data):
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def get(self, key, with_rewards=False):
+        """Cached result dict, or None. With `with_rewards`, a hit requires stored outcomes."""
+        stats_path, rewards_path = self._paths(key)
+        try:
+            with open(stats_path, 'rb') as f:
+                result = json.loads(f.read())
+            if with_rewards:
+                from array import array
+                rewards = array('d')
+                with open(rewards_path, 'rb') as f:
+                    rewards.frombytes(f.read())
+                result['rewards'] = rewards.tolist()
+        except (OSError, ValueError):
+            return None
+        for path in (stats_path, rewards_path):
+            if os.path.exists(path):
+                os.utime(path)  # mark as recently used
+        return result
+
+    def put(self, key, result, store_rewards=True):
+        stats = {k: v for k, v in result.items() if k != 'rewards'}
+        stats_path, rewards_path = self._paths(key)
+        if store_rewards and 'rewards' in result:
+            from array import array
+            self._write_atomic(rewards_path, array('d', result['rewards']).tobytes())
+        self._write_atomic(stats_path, json.dumps(stats).encode())
+        self.evict()
+
+    def size(self):
+        return sum(entry.stat().st_size for entry in os.scandir(self.directory) if entry.is_file())
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes."""
+        entries = {}
+        total = 0
+        for entry in os.scandir(self.directory):
+            if not entry.is_file() or entry.name.endswith('.tmp'):
+                continue
+            key = entry.name.rsplit('.', 1)[0]
+            info = entry.stat()
+            size, last_used = entries.get(key, (0, 0.0))
+            entries[key] = (size + info.st_size, max(last_used, info.st_mtime))
+            total += info.st_size
+        for key, (size, _) in sorted(entries.items(), key=lambda item: item[1][1]):
+            if total <= self.max_bytes:
+                break
+            for path in self._paths(key):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            total -= size
+
+    def clear(self):
+        for entry in os.scandir(self.directory):
+            if entry.is_file():
+                os.remove(entry.path)
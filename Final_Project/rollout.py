@@ -0,0 +1,185 @@
+"""
+Rollout evaluation of a live decision.
+
+    ev = evaluate_actions(game, num_rollouts=20_000, processes=4)
+    ev['stand']['ev'], ev['stand']['ci95']
+
+From a snapshot taken at the player's decision, every rollout reshuffles only
+the cards the player has not seen: the rest of the shoe plus the dealer's hole
+card, which cannot give the dealer a natural once the dealer has peeked. Each
+candidate action is then played out on a restored copy of the round, with the
+strategy making every later decision (split hands included). All actions of
+one rollout see the same shuffle (common random numbers), so the gap between
+two actions is far tighter than either EV on its own. Where late surrender is
+offered, it is listed too, at its exact value of -0.5.
+
+Rollouts run in chunks seeded by (seed, chunk number), so the result is the
+same with or without a process pool.
+"""
+import math
+from multiprocessing import Pool
+
+import numpy as np
+
+from dealer import Dealer
+from game import Game
+from player import Player
+from simulation import play_out
+from strategy import ACTION_BITS, legal_names
+
+
+def _hole_candidates(unseen, upcard):
+    """Positions in `unseen` the hole card can come from: after the peek, none completes a natural."""
+    if upcard.point_value < 10:
+        return list(range(len(unseen)))
+    return [j for j, card in enumerate(unseen) if upcard.point_value + card.point_value != 21]
+
+
+def _deal_unseen(rng, unseen, candidates):
+    """
+    One draw of the unseen cards: a hole card uniform over `candidates`, and
+    the rest shuffled independently of it (next card dealt last).
+
+    Returns:
+        (hole card, remaining shoe)
+    """
+    h = candidates[rng.integers(len(candidates))]
+    rest = unseen[:h] + unseen[h + 1:]
+    return unseen[h], [rest[j] for j in rng.permutation(len(rest))]
+
+
+def _rollout_chunk(task):
+    """Rewards (actions x rollouts) of one chunk of rollouts from a snapshot."""
+    snapshot, strategy, rules, actions, seed, chunk, num_rollouts = task
+    game = Game(Dealer(rules), Player(strategy, rules), rules)
+    unseen = list(snapshot.deck) + [snapshot.dealer_hand[1]]
+    candidates = _hole_candidates(unseen, snapshot.dealer_hand[0])
+    rng = np.random.default_rng([seed, chunk])
+    rewards = np.empty((len(actions), num_rollouts))
+    for i in range(num_rollouts):
+        hole, order = _deal_unseen(rng, unseen, candidates)
+        for a, action in enumerate(actions):
+            game.restore(snapshot, rng=False)
+            game.deck = list(order)
+            game.dealer.hand[1] = hole
+            rewards[a, i] = play_out(game, action)
+    return rewards
+
+
+def evaluate_actions(game, num_rollouts=10_000, actions=None, strategy=None, seed=0,
+                     processes=None, chunk_size=500):
+    """
+    EV of each action at the player's current decision, by rollouts from a snapshot.
+
+    The game itself is left untouched (and its events are not fired).
+
+    Args:
+        actions: action names to compare (default: every legal action, plus
+            'surrender' when the rules offer late surrender on this hand; it
+            is worth exactly -0.5 and is not played out)
+        strategy: plays the rest of the round (default: the player's strategy)
+        processes: worker processes for a multiprocessing Pool (None runs serially)
+        chunk_size: rollouts per task; part of the seeding, so keep it fixed to reproduce a result
+
+    Returns:
+        dict: action -> {'ev', 'std_error', 'ci95', 'rollouts', 'gap', 'gap_std_error'},
+        where gap is the best action's EV minus this one's, with the standard
+        error of the paired difference
+
+    Raises:
+        ValueError: for infinite-deck games, when no decision is pending or an action is illegal
+    """
+    if game.infinite_deck:
+        raise ValueError("rollouts reshuffle a finite shoe; use exact_ev for infinite-deck EVs")
+    snapshot = game.snapshot()
+    if snapshot.settlement is not None or len(snapshot.dealer_hand) != 2 or game.player.get_total() > 21:
+        raise ValueError("no player decision is pending in this round")
+    player = game.player
+    legal = player.legal_actions()
+    # Late surrender, as play_round offers it: the first decision on a hard two-card hand
+    can_surrender = (game.rules.late_surrender and len(player.hands) == 1
+                     and len(player.hands[0]) == 2 and not player.state[0][2])
+    if actions is None:
+        actions = legal_names(legal) + (['surrender'] if can_surrender else [])
+    actions = list(actions)
+    for action in actions:
+        if not (legal & ACTION_BITS.get(action, 0) or action == 'surrender' and can_surrender):
+            raise ValueError(f"{action!r} is not legal on the current hand")
+    strategy = strategy if strategy is not None else player.strategy
+
+    played = [action for action in actions if action != 'surrender']
+    tasks = [(snapshot, strategy, game.rules, played, seed, chunk, min(chunk_size, num_rollouts - start))
+             for chunk, start in enumerate(range(0, num_rollouts, chunk_size))]
+    if processes is None:
+        chunks = [_rollout_chunk(task) for task in tasks]
+    else:
+        with Pool(processes) as pool:
+            chunks = pool.map(_rollout_chunk, tasks)
+    outcomes = iter(np.concatenate(chunks, axis=1))
+    # Surrendering always returns exactly half the bet
+    rewards = np.array([np.full(num_rollouts, -0.5) if action == 'surrender' else next(outcomes)
+                        for action in actions])
+
+    n = rewards.shape[1]
+    means = rewards.mean(axis=1)
+    best = int(np.argmax(means))
+    results = {}
+    for a, action in enumerate(actions):
+        std_error = rewards[a].std(ddof=1) / math.sqrt(n) if n > 1 else 0.0
+        gaps = rewards[best] - rewards[a]
+        results[action] = {
+            'ev': float(means[a]),
+            'std_error': float(std_error),
+            'ci95': (float(means[a] - 1.96 * std_error), float(means[a] + 1.96 * std_error)),
+            'rollouts': n,
+            'gap': float(gaps.mean()),
+            'gap_std_error': float(gaps.std(ddof=1) / math.sqrt(n)) if n > 1 else 0.0,
+        }
+    return results
+
+
+if __name__ == '__main__':
+    import copy
+    import time
+
+    from basic_strategy import BasicStrategy
+    from rules import Rules
+    from simulation import play_round
+
+    # Deal seeded rounds until a hard 16 against a ten comes up
+    rules = Rules(num_decks=6, late_surrender=True)
+    game = Game(Dealer(rules), Player(BasicStrategy(), rules), rules, seed=7)
+    game.reshuffle()
+    while True:
+        if game.needs_shuffle():
+            game.reshuffle()
+        game.new_round()
+        player = game.player
+        if (not game.dealer_peek() and player.get_total() == 16 and not player.state[0][2]
+                and game.dealer.hand[0].point_value == 10):
+            break
+        play_round(game)
+
+    hand = ', '.join(card.get_rank() for card in player.hands[0])
+    print(f"{hand} against a {game.dealer.hand[0].get_rank()}, {len(game.deck)} cards left in the shoe")
+    start = time.perf_counter()
+    results = evaluate_actions(game, num_rollouts=20_000, processes=4)
+    elapsed = time.perf_counter() - start
+    for action, r in results.items():
+        print(f"{action:>12}: EV {r['ev']:+.4f}  95% CI [{r['ci95'][0]:+.4f}, {r['ci95'][1]:+.4f}]"
+              f"  behind best {r['gap']:.4f} +/- {r['gap_std_error']:.4f}")
+    print(f"20,000 rollouts per action in {elapsed:.2f} s")
+
+    plain = Game(Dealer(), Player(BasicStrategy()))  # deepcopy cannot copy a seeded shuffler
+    plain.reshuffle()
+    plain.new_round()
+    repeats = 2000
+    start = time.perf_counter()
+    for _ in range(repeats):
+        plain.restore(plain.snapshot())
+    snapshot_us = (time.perf_counter() - start) / repeats * 1e6
+    start = time.perf_counter()
+    for _ in range(repeats // 10):
+        copy.deepcopy(plain)
+    deepcopy_us = (time.perf_counter() - start) / (repeats // 10) * 1e6
+    print(f"snapshot + restore {snapshot_us:.0f} us, copy.deepcopy {deepcopy_us:.0f} us")
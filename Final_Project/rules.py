@@ -0,0 +1,75 @@
+class Rules:
+    """
+    Table rule set shared by Game, Dealer and the strategies.
+
+    The defaults reproduce the rules the project has always played:
+    a single 52-card deck, dealer hits soft 17, 3:2 blackjack and a
+    reshuffle once 75% of the shoe has been dealt.
+    """
+
+    def __init__(self, num_decks=1, dealer_hits_soft_17=True, double_after_split=True,
+                 max_splits=3, late_surrender=False, blackjack_payout=1.5,
+                 penetration=0.75):
+        if num_decks < 1:
+            raise ValueError("num_decks must be at least 1")
+        if not 0.0 < penetration <= 1.0:
+            raise ValueError("penetration must be in (0, 1]")
+        if max_splits < 0:
+            raise ValueError("max_splits cannot be negative")
+
+        self.num_decks = num_decks
+        self.dealer_hits_soft_17 = dealer_hits_soft_17
+        self.double_after_split = double_after_split
+        self.max_splits = max_splits          # number of re-splits allowed (hands = max_splits + 1)
+        self.late_surrender = late_surrender
+        self.blackjack_payout = blackjack_payout
+        self.penetration = penetration
+
+    def shoe_size(self):
+        return 52 * self.num_decks
+
+    def reshuffle_threshold(self):
+        """Number of remaining cards below which the shoe is reshuffled."""
+        return int(round(self.shoe_size() * (1.0 - self.penetration)))
+
+    def as_tuple(self):
+        return (self.num_decks, self.dealer_hits_soft_17, self.double_after_split,
+                self.max_splits, self.late_surrender, self.blackjack_payout,
+                self.penetration)
+
+    def as_dict(self):
+        return {
+            'num_decks': self.num_decks,
+            'dealer_hits_soft_17': self.dealer_hits_soft_17,
+            'double_after_split': self.double_after_split,
+            'max_splits': self.max_splits,
+            'late_surrender': self.late_surrender,
+            'blackjack_payout': self.blackjack_payout,
+            'penetration': self.penetration,
+        }
+
+    def label(self):
+        """Short human-readable name, e.g. '6D H17 DAS RSP3 LS 3:2 75%'."""
+        parts = [f"{self.num_decks}D", "H17" if self.dealer_hits_soft_17 else "S17"]
+        if self.double_after_split:
+            parts.append("DAS")
+        parts.append(f"RSP{self.max_splits}")
+        if self.late_surrender:
+            parts.append("LS")
+        payout = {1.5: "3:2", 1.2: "6:5", 1.0: "1:1"}.get(self.blackjack_payout,
+                                                           str(self.blackjack_payout))
+        parts.append(payout)
+        parts.append(f"{int(self.penetration * 100)}%")
+        return " ".join(parts)
+
+    def __eq__(self, other):
+        return isinstance(other, Rules) and self.as_tuple() == other.as_tuple()
+
+    def __hash__(self):
+        return hash(self.as_tuple())
+
+    def __repr__(self):
+        return f"Rules({self.label()})"
+
+
+DEFAULT_RULES = Rules()
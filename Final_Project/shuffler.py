@@ -0,0 +1,66 @@
+from functools import lru_cache
+
+import numpy as np
+
+
+class ShoeShuffler:
+    """
+    Seeded, counter-based shoe shuffling on numpy's Philox generator.
+
+    The card order of shoe N is a pure function of (seed, N): shoes are
+    generated in blocks of `block_size`, and block B is produced by a Philox
+    stream whose counter starts at B. Any worker or replay can jump straight
+    to any shoe without replaying the ones before it, and different seeds
+    give independent streams.
+    """
+
+    BLOCK_SIZE = 64
+
+    def __init__(self, seed=0, num_cards=52, block_size=BLOCK_SIZE):
+        if not 0 <= seed < 2 ** 128:
+            raise ValueError("seed must be a non-negative integer below 2**128")
+        self.seed = seed
+        self.num_cards = num_cards
+        self.block_size = block_size
+        self._identity = np.tile(np.arange(num_cards, dtype=np.int16), (block_size, 1))
+        self._block = lru_cache(maxsize=256)(self._generate_block)
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def shared(cls, seed, num_cards=52):
+        """One shuffler per (seed, shoe size) per process, so callers share its block cache."""
+        return cls(seed, num_cards)
+
+    def generator(self, block_index):
+        """Independent Generator for one block: the block index is the high word of the Philox counter."""
+        bit_generator = np.random.Philox(key=self.seed, counter=[0, 0, 0, block_index])
+        return np.random.Generator(bit_generator)
+
+    def _generate_block(self, block_index):
+        block = self.generator(block_index).permuted(self._identity, axis=1)
+        block.setflags(write=False)
+        return block
+
+    def shoe(self, shoe_index):
+        """Permutation (array of card positions) for shoe number `shoe_index`."""
+        block_index, row = divmod(shoe_index, self.block_size)
+        return self._block(block_index)[row]
+
+    def shoes(self, start, count):
+        """Permutations for shoes start .. start+count-1, generated block by block."""
+        rows = []
+        first_block = start // self.block_size
+        last_block = (start + count - 1) // self.block_size
+        for block_index in range(first_block, last_block + 1):
+            block = self._block(block_index)
+            lo = max(start - block_index * self.block_size, 0)
+            hi = min(start + count - block_index * self.block_size, self.block_size)
+            rows.append(block[lo:hi])
+        return np.concatenate(rows) if rows else np.empty((0, self.num_cards), dtype=np.int16)
+
+    def shuffle(self, deck, shoe_index):
+        """Reorder `deck` (a full shoe in its initial order) in place into shoe `shoe_index`."""
+        if len(deck) != self.num_cards:
+            raise ValueError(f"expected a {self.num_cards}-card shoe, got {len(deck)} cards")
+        ordered = list(deck)
+        deck[:] = [ordered[i] for i in self.shoe(shoe_index).tolist()]
@@ -0,0 +1,154 @@
+import math
+
+from dealer import Dealer
+from player import Player
+from game import Game
+from strategy import ACTION_BITS
+
+
+def play_round(game):
+    """
+    Play one complete round: deal, every player hand (including splits), dealer, settlement.
+
+    Returns:
+        float: net result in units of the initial bet
+    """
+    player, dealer = game.player, game.dealer
+    strategy = player.strategy
+    game.new_round()
+    upcard = dealer.hand[0]
+
+    # The dealer peeks for blackjack, and naturals settle before any decision
+    if game.dealer_peek() or game.is_player_blackjack(0):
+        return sum(game.settle())
+    if (game.rules.late_surrender
+            and hasattr(strategy, 'should_surrender')
+            and not player.state[0][2]
+            and strategy.should_surrender(player.get_total(), upcard)):
+        return sum(game.surrender())
+    return play_out(game)
+
+
+def play_out(game, action=None):
+    """
+    Finish a round from the player's current hand: that hand, any later split
+    hands, dealer, settlement. play_round calls this right after the deal;
+    rollouts call it on a restored Game.snapshot().
+
+    Args:
+        action: if given, played instead of the strategy's next decision
+            (it must be legal on the current hand)
+
+    Returns:
+        float: net result of the whole round in units of the initial bet
+    """
+    player, dealer = game.player, game.dealer
+    upcard = dealer.hand[0]
+    forced = action
+    hand_index = player.current_hand_index
+    while hand_index < len(player.hands):
+        player.current_hand_index = hand_index
+        if len(player.get_current_hand()) == 1:
+            # Second card for a hand created by a split
+            player.get_current_hand().extend(dealer.deal_cards(game.deck, 1))
+        player.update_state(upcard)
+
+        while player.get_total() <= 21:
+            # Player passes the strategy a legal-action mask, so the action is always allowed
+            if forced is None:
+                action = player.determine_action()
+            else:
+                action, forced = forced, None
+                if not player.legal_actions() & ACTION_BITS.get(action, 0):
+                    raise ValueError(f"{action!r} is not legal on the current hand")
+            if action == 'stand':
+                break
+            elif action == 'double down':
+                player.double_down(game.deck)
+                player.update_state(upcard)
+                break
+            elif action == 'split':
+                player.split()
+                player.get_current_hand().extend(dealer.deal_cards(game.deck, 1))
+                player.update_state(upcard)
+            else:
+                if not player.hit(game.deck):
+                    break  # Deck is empty
+                player.update_state(upcard)
+        hand_index += 1
+
+    return sum(game.settle())
+
+
+def simulate_games(strategy, num_games, rules=None, seed=None, cache=None, cache_rewards=True,
+                   infinite_deck=False, events=None):
+    """
+    Simulate `num_games` rounds of `strategy` under `rules`.
+
+    When a seed is given, shoes come from the shared ShoeShuffler for that seed,
+    so the run is reproducible and comparable across strategies and rule
+    variants (which also reuse the shuffler's cached blocks of shoes).
+
+    Seeded runs can be served from a ResultCache: identical requests return the
+    stored result instead of re-simulating. With cache_rewards=False only the
+    aggregate statistics are stored, and a hit returns no 'rewards' list.
+
+    With infinite_deck, cards are drawn i.i.d. instead of from a shoe (the
+    seed then seeds the card sampler); the rules' deck count is ignored.
+
+    `events` (an events.Events) sees every round as it is played; the run is
+    then never served from the cache, and batched subscribers are flushed at the end.
+
+    Returns:
+        dict with wins, losses, draws, win_rate, avg_reward, std_error and rewards
+    """
+    key = None
+    if cache is not None and seed is not None and events is None:
+        from result_cache import cache_key
+        key = cache_key(strategy, rules, seed, num_games, infinite_deck)
+        cached = cache.get(key, with_rewards=cache_rewards) if key is not None else None
+        if cached is not None:
+            return cached
+
+    result = _simulate(strategy, num_games, rules, seed, infinite_deck, events)
+    if key is not None:
+        cache.put(key, result, store_rewards=cache_rewards)
+    return result
+
+
+def _simulate(strategy, num_games, rules, seed, infinite_deck=False, events=None):
+    dealer = Dealer(rules)
+    player = Player(strategy, rules)
+    game = Game(dealer, player, rules, seed=seed, infinite_deck=infinite_deck, events=events)
+
+    game.reshuffle()
+    wins = losses = draws = 0
+    rewards = []
+    for _ in range(num_games):
+        if game.needs_shuffle():
+            game.reshuffle()
+        reward = play_round(game)
+        rewards.append(reward)
+        if reward > 0:
+            wins += 1
+            player.update_game_status('win')
+        elif reward < 0:
+            losses += 1
+            player.update_game_status('loss')
+        else:
+            draws += 1
+            player.update_game_status('push')
+    game.events.flush()
+
+    n = len(rewards)
+    mean = sum(rewards) / n if n else 0.0
+    variance = sum((r - mean) ** 2 for r in rewards) / (n - 1) if n > 1 else 0.0
+    return {
+        'wins': wins,
+        'losses': losses,
+        'draws': draws,
+        'win_rate': wins / n if n else 0.0,
+        'avg_reward': mean,
+        'std_error': math.sqrt(variance / n) if n else 0.0,
+        'rewards': rewards,
+    }
@@ -1,7 +1,43 @@
 from abc import ABC, abstractmethod
+from rules import DEFAULT_RULES
+
+# Legal-action bitmask: Player.legal_actions() sets one bit per action allowed right now
+ACTION_BITS = {'hit': 1, 'stand': 2, 'double down': 4, 'split': 8}
+HIT_OR_STAND = ACTION_BITS['hit'] | ACTION_BITS['stand']
+ALL_ACTIONS = HIT_OR_STAND | ACTION_BITS['double down'] | ACTION_BITS['split']
+
+
+def legal_names(legal):
+    """The action names a bitmask allows, in ACTION_BITS order."""
+    return [action for action, bit in ACTION_BITS.items() if legal & bit]
+
+
+def fallback_action(action, legal):
+    """
+    Make a mask-unaware answer legal: illegal doubles and splits become a hit,
+    anything unknown stands.
+    """
+    action = action.lower()
+    if legal & ACTION_BITS.get(action, 0):
+        return action
+    return 'hit' if action in ('double down', 'split') else 'stand'
+
+
+def legal_action(strategy, state, legal):
+    """Ask any strategy-like object for a legal action, through determine_legal_action() if it has one."""
+    if hasattr(strategy, 'determine_legal_action'):
+        return strategy.determine_legal_action(state, legal)
+    return fallback_action(strategy.determine_action(state), legal)
+
 
 class Strategy(ABC):
     """Abstract base class for blackjack strategies"""
+
+    rules = DEFAULT_RULES
+
+    def set_rules(self, rules):
+        """Called by Game so rule-dependent strategies can adapt to the table."""
+        self.rules = rules
     
     @abstractmethod
     def determine_action(self, state):
@@ -15,3 +51,27 @@ class Strategy(ABC):
             str: One of 'hit', 'stand', 'double down', 'split'
         """
         return str()  # Default action
+
+    def determine_actions(self, states):
+        """
+        Batch decision path: one action per state. Strategies that are cheaper
+        per batch than per call (e.g. neural Q-functions) override this.
+        """
+        return [self.determine_action(state) for state in states]
+
+    def determine_legal_action(self, state, legal):
+        """
+        Choose among the actions allowed by the `legal` bitmask (ACTION_BITS).
+
+        Player calls this at every decision. Strategies that can use the mask
+        (sampling or masked argmax) override it; by default the answer of
+        determine_action() is made legal with fallback_action().
+        """
+        return fallback_action(self.determine_action(state), legal)
+
+    def determine_legal_actions(self, states, legals):
+        """
+        Batch form of determine_legal_action(): one action per state, each
+        chosen among the actions allowed by the matching bitmask in `legals`.
+        """
+        return [self.determine_legal_action(state, legal) for state, legal in zip(states, legals)]
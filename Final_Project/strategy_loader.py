@@ -0,0 +1,28 @@
+"""
+Strategies by name or saved-policy path, for the CLI and the job runner.
+Heavy modules are only imported for the kind of policy being loaded.
+"""
+
+
+def load_strategy(spec):
+    """
+    'basic', 'random', or a path to a saved policy: a .npz with a Q table
+    (tabular learners, search checkpoints) or with MLP weights (NeuralQStrategy).
+    """
+    if spec == 'basic':
+        from basic_strategy import BasicStrategy
+        return BasicStrategy()
+    if spec == 'random':
+        from random_strategy import RandomStrategy
+        return RandomStrategy()
+
+    import numpy as np
+    with np.load(spec) as data:
+        keys = set(data.files)
+    if 'Q' in keys:
+        from tabular import TabularStrategy
+        return TabularStrategy.load(spec)
+    if 'W0' in keys:
+        from neural_q import NeuralQStrategy
+        return NeuralQStrategy.load(spec)
+    raise ValueError(f"{spec}: not a saved policy (expected a Q table or MLP weights)")
@@ -0,0 +1,213 @@
+"""
+Where a strategy loses money: per-cell error cost against optimal play.
+
+Every decision cell (context, total, soft, pair, upcard) is reached some
+expected number of times per round when the strategy plays; each visit
+costs the EV gap between the best action and the one the strategy takes,
+both followed by optimal play (exact_ev). By the performance difference
+identity the cell costs add up to exactly EV(optimal) - EV(strategy), so the
+ranking shows which decisions account for the shortfall.
+
+    report = error_cost_report(strategy, rules)
+    write_report(report, 'errors.json', heatmap='errors.png')
+"""
+import json
+
+from card import Card
+from exact_ev import P_RANK, P_VALUE, VALUES, exact_ev, hand_total
+from rules import DEFAULT_RULES
+from strategy import ACTION_BITS, fallback_action, legal_action
+from tabular import UPCARDS
+
+UPCARD_NAMES = {up: 'A' if up == 11 else str(up) for up in UPCARDS}
+PAIR_NAMES = {v: 'A' if v == 1 else str(v) for v in VALUES}
+ACTION_LETTERS = {'hit': 'H', 'stand': 'S', 'double down': 'D', 'split': 'P', 'surrender': 'R'}
+
+
+class _Decisions:
+    """The strategy's action per cell, asked with the legal-action mask as Player asks it, once per cell."""
+
+    def __init__(self, strategy, ev):
+        self.strategy = strategy
+        self.ev = ev
+        self.upcards = {up: Card('Spades', 'Ace' if up == 11 else str(up)) for up in UPCARDS}
+        self._cache = {}
+
+    def __call__(self, context, total, soft, up, pair=None, splits=0):
+        key = (context, total, soft, up, pair, splits)
+        if key not in self._cache:
+            self._cache[key] = self._decide(*key)
+        return self._cache[key]
+
+    def _decide(self, context, total, soft, up, pair, splits):
+        strategy, card = self.strategy, self.upcards[up]
+        legal = self.ev.actions(context, total, soft, up, pair, splits)
+        if 'surrender' in legal and hasattr(strategy, 'should_surrender') \
+                and strategy.should_surrender(total, card):
+            return 'surrender'
+        mask = sum(ACTION_BITS[action] for action in legal if action in ACTION_BITS)
+        if pair is not None and 'split' in legal and hasattr(strategy, 'determine_action_for_pair'):
+            rank = 'Ace' if pair == 1 else str(pair)
+            return fallback_action(strategy.determine_action_for_pair(rank, card), mask)
+        return legal_action(strategy, (total, card, soft), mask)
+
+
+def error_cost_report(strategy, rules=None):
+    """
+    Per-cell error costs of a deterministic `strategy` on an infinite deck.
+
+    Returns:
+        dict with optimal_ev, strategy_ev, total_cost (EV per round) and
+        cells: one entry per reachable decision cell, most costly first, with
+        reach (expected visits per round), chosen and best action, loss per
+        visit, cost (reach * loss) and the EV of every action
+    """
+    rules = rules if rules is not None else DEFAULT_RULES
+    if hasattr(strategy, 'set_rules'):
+        strategy.set_rules(rules)
+    ev = exact_ev(rules)
+    decide = _Decisions(strategy, ev)
+    cells = {}
+
+    def visit(context, total, soft, up, mass, pair=None, splits=0):
+        """Record `mass` visits to a cell and return the strategy's action there."""
+        action = decide(context, total, soft, up, pair, splits)
+        values = ev.actions(context, total, soft, up, pair, splits)
+        best = max(values, key=values.get)
+        key = (context, total, soft, PAIR_NAMES[pair] if pair else None, UPCARD_NAMES[up])
+        cell = cells.setdefault(key, {'reach': 0.0, 'cost': 0.0, 'chosen': action, 'best': best,
+                                      'loss': values[best] - values[action], 'ev': values})
+        cell['reach'] += mass
+        cell['cost'] += mass * (values[best] - values[action])
+        return action
+
+    for up in UPCARDS:
+        drawn = {}    # (hard, has_ace) -> visits still to play with hit or stand
+        singles = {}  # (split card value, splits made) -> single-card hands
+
+        def play(context, hard, has_ace, mass, pair=None, splits=0):
+            total = hand_total(hard, has_ace)
+            action = visit(context, total, has_ace and hard + 10 <= 21, up, mass, pair, splits)
+            if action == 'hit':
+                for v in VALUES:
+                    if hard + v <= 21:
+                        key = (hard + v, has_ace or v == 1)
+                        drawn[key] = drawn.get(key, 0.0) + mass * P_VALUE[v]
+            elif action == 'split':
+                key = (pair, splits + 1)
+                singles[key] = singles.get(key, 0.0) + 2 * mass
+
+        p_up = P_VALUE[1 if up == 11 else up] * (1 - ev.dealer_blackjack[up])
+        for a in VALUES:
+            for b in VALUES:
+                if {a, b} == {1, 10}:
+                    continue  # a natural, paid before any decision
+                p = p_up * P_VALUE[a] * P_VALUE[b]
+                if a == b:
+                    same_rank = p_up * 4 * P_RANK * P_RANK if a == 10 else p
+                    play('deal', 2 * a, a == 1, same_rank, pair=a if ev.can_split(0) else None)
+                    p -= same_rank
+                if p > 1e-15:
+                    play('deal', a + b, a == 1 or b == 1, p)
+
+        # Split hands: each single card draws its second card, possibly making a new pair
+        depth = 1
+        while singles:
+            current = {key: mass for key, mass in singles.items() if key[1] == depth}
+            for key in current:
+                del singles[key]
+            for (value, splits), mass in current.items():
+                for v in VALUES:
+                    hard, has_ace = value + v, value == 1 or v == 1
+                    p = P_VALUE[v]
+                    if v == value:
+                        play('split', hard, has_ace, mass * P_RANK,
+                             pair=value if ev.can_split(splits) else None, splits=splits)
+                        p -= P_RANK
+                    if p > 1e-15:
+                        play('split', hard, has_ace, mass * p, splits=splits)
+            depth += 1
+
+        # Drawn hands only grow, so their visits are complete once lower totals are played
+        while drawn:
+            hard, has_ace = min(drawn)
+            play('drawn', hard, has_ace, drawn.pop((hard, has_ace)))
+
+    ranked = sorted(cells.items(), key=lambda item: -item[1]['cost'])
+    total_cost = sum(cell['cost'] for _, cell in ranked)
+    optimal = ev.round_ev()
+    return {
+        'rules': rules.as_dict(),
+        'optimal_ev': optimal,
+        'strategy_ev': optimal - total_cost,
+        'total_cost': total_cost,
+        'cells': [dict(context=context, total=total, soft=soft, pair=pair, upcard=upcard, **cell)
+                  for (context, total, soft, pair, upcard), cell in ranked],
+    }
+
+
+def write_report(report, path, heatmap=None, top=None):
+    """Write the report as JSON (optionally only the `top` most costly cells) and a heatmap PNG."""
+    output = dict(report, cells=report['cells'][:top] if top else report['cells'])
+    with open(path, 'w') as f:
+        json.dump(output, f, indent=1)
+    if heatmap:
+        plot_report(report, heatmap)
+
+
+def plot_report(report, path):
+    """
+    Heatmap of cost per round by hand and upcard: hard totals, soft totals and
+    pairs, all contexts summed. Cells show the first decision the strategy
+    makes there, with the best action after a slash where they differ.
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import numpy as np
+
+    upcards = list(UPCARD_NAMES.values())
+    panels = [('Hard totals', [str(t) for t in range(5, 21)]),
+              ('Soft totals', [f"A,{t - 11}" for t in range(13, 21)]),
+              ('Pairs', [f"{p},{p}" for p in PAIR_NAMES.values()])]
+
+    def row_of(cell):
+        if cell['pair'] is not None:
+            return 2, f"{cell['pair']},{cell['pair']}"
+        if cell['soft']:
+            return 1, f"A,{cell['total'] - 11}"
+        return 0, str(cell['total'])
+
+    grids = [np.zeros((len(rows), len(upcards))) for _, rows in panels]
+    labels = [[[''] * len(upcards) for _ in rows] for _, rows in panels]
+    for cell in report['cells']:
+        panel, row = row_of(cell)
+        rows = panels[panel][1]
+        if row not in rows:
+            continue
+        i, j = rows.index(row), upcards.index(cell['upcard'])
+        grids[panel][i, j] += cell['cost']
+        if cell['context'] == 'deal' or not labels[panel][i][j]:
+            label = ACTION_LETTERS[cell['chosen']]
+            if cell['chosen'] != cell['best']:
+                label += '/' + ACTION_LETTERS[cell['best']]
+            labels[panel][i][j] = label
+
+    vmax = max(grid.max() for grid in grids) * 100 or 1e-6
+    fig, axes = plt.subplots(1, 3, figsize=(18, 8))
+    for ax, (title, rows), grid, text in zip(axes, panels, grids, labels):
+        image = ax.imshow(grid * 100, cmap='Reds', vmin=0, vmax=vmax, aspect='auto', origin='lower')
+        ax.set_xticks(range(len(upcards)))
+        ax.set_xticklabels(upcards)
+        ax.set_yticks(range(len(rows)))
+        ax.set_yticklabels(rows)
+        ax.set_xlabel('Dealer upcard')
+        ax.set_title(title)
+        for i in range(len(rows)):
+            for j in range(len(upcards)):
+                ax.text(j, i, text[i][j], ha='center', va='center', fontsize=7)
+    fig.colorbar(image, ax=axes, label='Cost (% of a bet per round)')
+    fig.suptitle(f"EV {report['strategy_ev'] * 100:+.3f}% vs optimal {report['optimal_ev'] * 100:+.3f}% "
+                 f"(cost {report['total_cost'] * 100:.3f}% per round)")
+    plt.savefig(path, dpi=150, bbox_inches='tight')
+    plt.close(fig)
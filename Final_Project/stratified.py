@@ -0,0 +1,187 @@
+"""
+Stratified evaluation over the initial deal.
+
+Most of the spread in a strategy's results comes from the player's first two
+cards and the dealer's upcard. Here every (player two-card hand, upcard)
+combination by point value is a stratum with its exact probability; hands are
+allocated across strata by Neyman allocation from a pilot run, each stratum
+is played from a fresh shoe conditioned on its three cards, and the stratum
+means are combined with their probabilities as weights.
+
+The estimate is the expected result of a hand dealt off the top of a fresh
+shoe (for an infinite deck, simply the expected result per hand).
+"""
+import math
+from itertools import combinations_with_replacement
+
+import numpy as np
+
+import hand_fsm as fsm
+from rules import DEFAULT_RULES
+from table_engine import PolicyTables, _play_round
+
+# Point-value classes in rank-index order: 2..9 singly, the four ten-valued ranks, Ace
+VALUE_RANKS = [[r] for r in range(8)] + [[8, 9, 10, 11], [fsm.ACE]]
+VALUE_NAMES = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'A']
+PILOT_PRIOR = 10  # weight, in hands, of the pooled variance in each stratum's pilot variance
+
+
+def initial_deal_strata(num_decks=1, infinite_deck=False):
+    """
+    Every (upcard value, player value a, player value b) with a <= b, and its probability.
+
+    Returns:
+        list of ((upcard, a, b), probability) with values as indices into VALUE_RANKS
+    """
+    cards = [len(ranks) * (1 if infinite_deck else 4 * num_decks) for ranks in VALUE_RANKS]
+    total = sum(cards)
+
+    def ordered(values):
+        p, left, used = 1.0, total, {}
+        for v in values:
+            available = cards[v] - (0 if infinite_deck else used.get(v, 0))
+            p *= available / left
+            left -= 0 if infinite_deck else 1
+            used[v] = used.get(v, 0) + 1
+        return p
+
+    strata = []
+    for up in range(len(VALUE_RANKS)):
+        for a, b in combinations_with_replacement(range(len(VALUE_RANKS)), 2):
+            p = ordered((up, a, b)) + (ordered((up, b, a)) if a != b else 0.0)
+            strata.append(((up, a, b), p))
+    return strata
+
+
+class _ConditionedShoe:
+    """
+    Shoe for one round of a stratum: deals the fixed upcard and player cards in
+    Game order (upcard, hole, player, player) and everything else, hole card
+    included, at random from the cards left. Pops like the rank lists of table_engine.
+    """
+
+    def __init__(self, rng, num_decks=1, infinite_deck=False, buffer_size=65_536):
+        self.rng = rng
+        self.infinite_deck = infinite_deck
+        self.full = [1 if infinite_deck else 4 * num_decks] * fsm.NUM_RANKS
+        self.buffer_size = buffer_size
+        self._uniforms = []
+        self._prefix = []
+
+    def _uniform(self):
+        if not self._uniforms:
+            self._uniforms = self.rng.random(self.buffer_size).tolist()
+        return self._uniforms.pop()
+
+    def _take(self, ranks):
+        """A random card among `ranks`, in proportion to how many are left, removed from the shoe."""
+        counts = self.counts
+        target = self._uniform() * sum(counts[r] for r in ranks)
+        for rank in ranks:
+            target -= counts[rank]
+            if target < 0:
+                break
+        if not self.infinite_deck:
+            counts[rank] -= 1
+            self.left -= 1
+        return rank
+
+    def deal(self, up, a, b):
+        self.counts = list(self.full)
+        self.left = sum(self.full)
+        d1, p1, p2 = (self._take(VALUE_RANKS[v]) for v in (up, a, b))
+        self._prefix = [p2, p1, None, d1]  # popped from the end; None is the hole card
+
+    def pop(self):
+        if self._prefix:
+            rank = self._prefix.pop()
+            if rank is not None:
+                return rank
+        return self._take(range(fsm.NUM_RANKS))
+
+    def __bool__(self):
+        return self.infinite_deck or self.left > 0
+
+
+def simulate_stratified(strategy, num_games, rules=None, seed=None, pilot=20, policy=None,
+                        infinite_deck=False):
+    """
+    Stratified estimate of the expected result per hand of a deterministic strategy.
+
+    Args:
+        num_games: total hands to play, pilot included
+        pilot: hands per stratum in the pilot run that measures each stratum's
+            spread for Neyman allocation (at most a tenth of num_games).
+            Pilot hands only decide the allocation: reusing them in the
+            estimate would bias it toward strata whose pilot looked calm.
+        policy: optional precomputed PolicyTables for `strategy`
+
+    Returns:
+        dict with avg_reward, std_error, ci95, hands, strata, and the
+        plain_std_error a simple random sample of the same size would have
+        (estimated from the strata) with the resulting variance_reduction
+    """
+    rules = rules if rules is not None else DEFAULT_RULES
+    policy = policy if policy is not None else PolicyTables(strategy, rules)
+    strata = initial_deal_strata(rules.num_decks, infinite_deck)
+    probabilities = np.array([p for _, p in strata])
+    pilot = min(pilot, num_games // (10 * len(strata)))
+    if pilot < 2:
+        raise ValueError(f"stratified evaluation needs at least {20 * len(strata)} hands")
+
+    rng = np.random.Generator(np.random.Philox(np.random.SeedSequence(seed)))
+    shoe = _ConditionedShoe(rng, rules.num_decks, infinite_deck)
+    lookup = (fsm.next_state.tolist(), fsm.total.tolist(), fsm.soft.tolist(), fsm.count.tolist(),
+              fsm.pair_rank.tolist(), fsm.single_card.tolist())
+    stands = fsm.dealer_stands[rules.dealer_hits_soft_17].tolist()
+    n = np.zeros(len(strata), dtype=np.int64)
+    sums = np.zeros(len(strata))
+    squares = np.zeros(len(strata))
+
+    def play(h, hands):
+        cards = strata[h][0]
+        total = square = 0.0
+        for _ in range(hands):
+            shoe.deal(*cards)
+            reward = _play_round(shoe, policy, rules, stands, lookup)
+            total += reward
+            square += reward * reward
+        n[h] += hands
+        sums[h] += total
+        squares[h] += square
+
+    for h in range(len(strata)):
+        play(h, pilot)
+
+    # Neyman allocation: hands in proportion to probability times standard deviation,
+    # with at least two per stratum so every stratum has its own variance estimate
+    pilot_variance = np.maximum(squares / n - (sums / n) ** 2, 0.0) * n / (n - 1)
+    # Small pilots are noisy: shrink each stratum's variance toward the pooled one
+    pooled = float(probabilities @ pilot_variance)
+    spread = np.sqrt(((pilot - 1) * pilot_variance + PILOT_PRIOR * pooled) / (pilot - 1 + PILOT_PRIOR))
+    share = probabilities * spread
+    budget = num_games - int(n.sum()) - 2 * len(strata)
+    target = 2 + (np.floor(budget * share / share.sum()).astype(np.int64) if share.sum() > 0 else 0)
+    n[:] = 0
+    sums[:] = 0.0
+    squares[:] = 0.0
+    for h in range(len(strata)):
+        play(h, int(target[h]))
+
+    means = sums / n
+    variances = np.maximum(squares / n - means ** 2, 0.0) * n / (n - 1)
+    mean = float(probabilities @ means)
+    std_error = math.sqrt(float((probabilities ** 2 * variances / n).sum()))
+    hands = int(n.sum()) + pilot * len(strata)
+    # A plain sample has variance E[within-stratum variance] + variance of the stratum means
+    plain_variance = float(probabilities @ (variances + (means - mean) ** 2))
+    plain_std_error = math.sqrt(plain_variance / hands)
+    return {
+        'avg_reward': mean,
+        'std_error': std_error,
+        'ci95': (mean - 1.96 * std_error, mean + 1.96 * std_error),
+        'hands': hands,
+        'strata': len(strata),
+        'plain_std_error': plain_std_error,
+        'variance_reduction': (plain_std_error / std_error) ** 2 if std_error > 0 else float('inf'),
+    }
@@ -0,0 +1,100 @@
+import itertools
+import os
+from multiprocessing import Pool
+
+from rules import Rules
+from dealer_odds import dealer_bust_probability
+from simulation import simulate_games
+
+
+def rule_grid(num_decks=(1, 2, 6, 8), dealer_hits_soft_17=(True, False),
+              double_after_split=(True,), max_splits=(3,), late_surrender=(False,),
+              blackjack_payout=(1.5,), penetration=(0.75,)):
+    """Cartesian product of rule options as a list of Rules."""
+    return [Rules(*combo) for combo in itertools.product(
+        num_decks, dealer_hits_soft_17, double_after_split, max_splits,
+        late_surrender, blackjack_payout, penetration)]
+
+
+def evaluate_rules(strategy, rules, num_games, seed=0, cache_dir=None, infinite_deck=False):
+    """
+    House edge of `strategy` under one rule set, plus the dealer's exact bust rate.
+    With infinite_deck, cards are drawn i.i.d. and the rules' deck count is ignored.
+    """
+    cache = None
+    if cache_dir is not None:
+        from result_cache import ResultCache
+        cache = ResultCache(cache_dir)
+    result = simulate_games(strategy, num_games, rules=rules, seed=seed,
+                            cache=cache, cache_rewards=False, infinite_deck=infinite_deck)
+    return {
+        'rules': rules.as_dict(),
+        'label': rules.label(),
+        'hands': num_games,
+        'infinite_deck': infinite_deck,
+        'avg_reward': result['avg_reward'],
+        'house_edge': -result['avg_reward'],
+        'std_error': result['std_error'],
+        'win_rate': result['win_rate'],
+        'dealer_bust_probability': dealer_bust_probability(rules),
+    }
+
+
+def _evaluate_group(task):
+    strategy, group, num_games, seed, cache_dir, infinite_deck = task
+    return [evaluate_rules(strategy, rules, num_games, seed, cache_dir, infinite_deck) for rules in group]
+
+
+def _group_key(rules):
+    # Grid points sharing a shoe size and dealer rule share seeded shoes and dealer distributions
+    return (rules.num_decks, rules.dealer_hits_soft_17)
+
+
+def run_sweep(strategy, grid, num_games=100_000, seed=0, processes=None, cache_dir=None,
+              infinite_deck=False):
+    """
+    Evaluate `strategy` on every rule set in `grid` in parallel.
+
+    All grid points use the same seed, so variants are compared on identical
+    shoes (common random numbers). Grid points are grouped by (num_decks,
+    dealer_hits_soft_17) and each group runs as one task in one worker, so the
+    blocks of seeded shoes and dealer distributions a group needs are built
+    once and reused by all its grid points.
+    With `cache_dir`, finished grid points are stored in a ResultCache and
+    re-requested ones are not simulated again. With infinite_deck every grid
+    point is played from an infinite deck (its cache entries are kept apart).
+
+    Returns:
+        list of per-rule-set result dicts, in the order of `grid`
+    """
+    grid = list(grid)
+    groups = {}
+    for i, rules in enumerate(grid):
+        groups.setdefault(_group_key(rules), []).append(i)
+    tasks = [(strategy, [grid[i] for i in members], num_games, seed, cache_dir, infinite_deck)
+             for members in groups.values()]
+
+    if processes == 1 or len(tasks) <= 1:
+        results = [_evaluate_group(task) for task in tasks]
+    else:
+        with Pool(min(len(tasks), processes or os.cpu_count() or 1)) as pool:
+            results = pool.map(_evaluate_group, tasks, chunksize=1)
+
+    ordered = [None] * len(grid)
+    for members, group_results in zip(groups.values(), results):
+        for position, result in zip(members, group_results):
+            ordered[position] = result
+    return ordered
+
+
+def print_sweep(results):
+    print(f"{'Rules':<32} {'House edge':>11} {'± s.e.':>8} {'Dealer bust':>12}")
+    for r in sorted(results, key=lambda r: r['house_edge']):
+        print(f"{r['label']:<32} {r['house_edge']:>10.2%} {r['std_error']:>8.4f} "
+              f"{r['dealer_bust_probability']:>11.2%}")
+
+
+if __name__ == '__main__':
+    from basic_strategy import BasicStrategy
+
+    print_sweep(run_sweep(BasicStrategy(), rule_grid(), num_games=20_000))
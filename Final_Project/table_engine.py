@@ -0,0 +1,201 @@
+import math
+import random
+
+import hand_fsm as fsm
+from card import Card
+from rules import DEFAULT_RULES
+from strategy import ACTION_BITS, HIT_OR_STAND, legal_action
+
+HIT, STAND, DOUBLE, SPLIT, UNKNOWN = range(5)
+ACTION_CODES = {'hit': HIT, 'stand': STAND, 'double down': DOUBLE, 'split': SPLIT}
+
+RANK_NAMES = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'Jack', 'Queen', 'King', 'Ace']
+
+
+class PolicyTables:
+    """
+    A deterministic strategy tabulated once over hand states and upcards.
+
+    Strategies that choose at random (RandomStrategy, exploring learners) are
+    frozen into one fixed choice per state and should not be tabulated.
+
+    Decisions are asked through the legal-action mask as Player asks them:
+    `action` where doubling is allowed, `drawn_action` where only hitting or
+    standing is.
+    """
+
+    def __init__(self, strategy, rules=None):
+        rules = rules if rules is not None else DEFAULT_RULES
+        if hasattr(strategy, 'set_rules'):
+            strategy.set_rules(rules)
+        upcards = [Card('Spades', name) for name in RANK_NAMES]
+
+        decisions = {}
+        self.action = []        # action[up][state], doubling allowed
+        self.drawn_action = []  # drawn_action[up][state], hit or stand only
+        self.pair_action = None
+        self.surrender = None
+        for up, card in enumerate(upcards):
+            for table, legal in ((self.action, HIT_OR_STAND | ACTION_BITS['double down']),
+                                 (self.drawn_action, HIT_OR_STAND)):
+                row = []
+                for state in range(fsm.NUM_HAND_STATES):
+                    key = (int(fsm.total[state]), bool(fsm.soft[state]), up, legal)
+                    if key not in decisions:
+                        if key[0] > 21:
+                            decisions[key] = STAND
+                        else:
+                            action = legal_action(strategy, (key[0], card, key[1]), legal).lower()
+                            decisions[key] = ACTION_CODES.get(action, UNKNOWN)
+                    row.append(decisions[key])
+                table.append(row)
+
+        if hasattr(strategy, 'determine_action_for_pair'):
+            self.pair_action = [[ACTION_CODES.get(strategy.determine_action_for_pair(name, card).lower(),
+                                                  UNKNOWN) for card in upcards]
+                                for name in RANK_NAMES]
+        if rules.late_surrender and hasattr(strategy, 'should_surrender'):
+            self.surrender = [[bool(strategy.should_surrender(total, card)) for card in upcards]
+                              for total in range(22)]
+
+
+def _play_round(deck, policy, rules, stands, lookup, dealer_sampler=None):
+    """
+    One round dealt from `deck` (rank indices, next card last). Mirrors simulation.play_round.
+    With a DealerSampler the dealer's final total is sampled instead of drawn.
+    """
+    next_state, total, soft, count, pair_rank, single_card = lookup
+    draw = deck.pop
+    d1, d2, p1, p2 = draw(), draw(), draw(), draw()
+    dealer = next_state[next_state[fsm.EMPTY][d1]][d2]
+    player = next_state[next_state[fsm.EMPTY][p1]][p2]
+
+    # Dealer peek and naturals
+    if d1 >= 8 and total[dealer] == 21:
+        return 0.0 if total[player] == 21 else -1.0
+    if total[player] == 21:
+        return rules.blackjack_payout
+    if policy.surrender is not None and not soft[player] and policy.surrender[total[player]][d1]:
+        return -0.5
+
+    action = policy.action[d1]
+    drawn_action = policy.drawn_action[d1]
+    pair_action = policy.pair_action
+    max_splits = rules.max_splits
+    hands = [player]
+    doubled = [False]
+    i = 0
+    while i < len(hands):
+        state = hands[i]
+        if count[state] == 1 and deck:
+            state = next_state[state][draw()]
+        while total[state] <= 21:
+            rank = pair_rank[state]
+            can_split = rank >= 0 and len(hands) <= max_splits
+            can_double = count[state] == 2 and (len(hands) == 1 or rules.double_after_split)
+            if can_split and pair_action is not None:
+                a = pair_action[rank][d1]
+            else:
+                a = action[state] if can_double else drawn_action[state]
+            if a == STAND:
+                break
+            if a == DOUBLE and can_double:
+                if deck:
+                    state = next_state[state][draw()]
+                doubled[i] = True
+                break
+            if a == SPLIT and can_split:
+                hands.append(single_card[rank])
+                doubled.append(False)
+                state = single_card[rank]
+                if deck:
+                    state = next_state[state][draw()]
+                continue
+            if a == UNKNOWN or not deck:
+                break
+            state = next_state[state][draw()]
+        hands[i] = state
+        i += 1
+
+    dealer_total = total[dealer]
+    if any(total[h] <= 21 for h in hands):
+        if dealer_sampler is not None:
+            dealer_total = dealer_sampler.final_total(dealer)
+        else:
+            while not stands[dealer] and deck:
+                dealer = next_state[dealer][draw()]
+            dealer_total = total[dealer]
+
+    reward = 0.0
+    for hand, was_doubled in zip(hands, doubled):
+        stake = 2.0 if was_doubled else 1.0
+        player_total = total[hand]
+        if player_total > 21:
+            reward -= stake
+        elif dealer_total > 21 or player_total > dealer_total:
+            reward += stake
+        elif player_total < dealer_total:
+            reward -= stake
+    return reward
+
+
+def simulate_table_games(strategy, num_games, rules=None, seed=None, policy=None,
+                         infinite_deck=False, sample_dealer=False):
+    """
+    Table-driven equivalent of simulation.simulate_games() for deterministic strategies.
+
+    Hands are packed hand_fsm states and every card is one table lookup. With
+    a seed the shoes are the same seeded shoes Game deals, so the results
+    match simulate_games() hand for hand.
+
+    With infinite_deck, ranks are drawn i.i.d. (alias method, bulk buffers);
+    sample_dealer additionally replaces dealer drawing by sampling the final
+    total from the cached infinite-deck outcome table.
+
+    Returns:
+        dict with wins, losses, draws, win_rate, avg_reward, std_error and rewards
+    """
+    from shuffler import ShoeShuffler
+
+    rules = rules if rules is not None else DEFAULT_RULES
+    policy = policy if policy is not None else PolicyTables(strategy, rules)
+    seed = seed if seed is not None else random.getrandbits(64)
+    shuffler = None if infinite_deck else ShoeShuffler.shared(seed, rules.shoe_size())
+    dealer_sampler = None
+    if infinite_deck:
+        from infinite_deck import AliasSampler, InfiniteDeck, DealerSampler
+        deck = InfiniteDeck(AliasSampler(seed=seed))
+        if sample_dealer:
+            dealer_sampler = DealerSampler(rules.dealer_hits_soft_17, seed=[seed, 1])
+    elif sample_dealer:
+        raise ValueError("dealer results can only be sampled in infinite-deck mode")
+    minimum = max(rules.reshuffle_threshold(), 10)  # as Game.needs_shuffle
+    lookup = (fsm.next_state.tolist(), fsm.total.tolist(), fsm.soft.tolist(), fsm.count.tolist(),
+              fsm.pair_rank.tolist(), fsm.single_card.tolist())
+    stands = fsm.dealer_stands[rules.dealer_hits_soft_17].tolist()
+
+    shoe_index = 0
+    if shuffler is not None:
+        deck = []
+    rewards = []
+    for _ in range(num_games):
+        if len(deck) < minimum:
+            # Card i of a fresh Game shoe has rank i % 13; both deal from the end
+            deck = (shuffler.shoe(shoe_index) % fsm.NUM_RANKS).tolist()
+            shoe_index += 1
+        rewards.append(_play_round(deck, policy, rules, stands, lookup, dealer_sampler))
+
+    n = len(rewards)
+    wins = sum(1 for r in rewards if r > 0)
+    losses = sum(1 for r in rewards if r < 0)
+    mean = sum(rewards) / n if n else 0.0
+    variance = sum((r - mean) ** 2 for r in rewards) / (n - 1) if n > 1 else 0.0
+    return {
+        'wins': wins,
+        'losses': losses,
+        'draws': n - wins - losses,
+        'win_rate': wins / n if n else 0.0,
+        'avg_reward': mean,
+        'std_error': math.sqrt(variance / n) if n else 0.0,
+        'rewards': rewards,
+    }
@@ -0,0 +1,97 @@
+import hashlib
+
+import numpy as np
+
+from strategy import ACTION_BITS, Strategy
+
+# Table layout shared by the tabular learners: Q[total, soft, upcard, action]
+TOTALS = range(4, 22)        # player totals 4..21
+UPCARDS = range(2, 12)       # dealer upcard values 2..11 (11 = Ace)
+ACTIONS = ('hit', 'stand', 'double down')
+ACTION_INDEX = {action: i for i, action in enumerate(ACTIONS)}
+HIT, STAND, DOUBLE = 0, 1, 2
+Q_SHAPE = (len(TOTALS), 2, len(UPCARDS), len(ACTIONS))
+NUM_STATES = len(TOTALS) * 2 * len(UPCARDS)
+ACTION_MASK_BITS = np.array([ACTION_BITS[action] for action in ACTIONS])
+
+
+def legal_mask(legal):
+    """Boolean array over ACTIONS from a legal-action bitmask."""
+    return (ACTION_MASK_BITS & legal) > 0
+
+
+def masked_argmax(q, legal):
+    """Index of the best action in `q` among those the bitmask allows."""
+    return int(np.argmax(np.where(legal_mask(legal), q, -np.inf)))
+
+
+def upcard_value(card):
+    """Dealer upcard as an integer 2-11, from a Card or an int."""
+    if isinstance(card, (int, np.integer)):
+        return int(card)
+    rank = card.rank
+    if rank in ["King", "Queen", "Jack"]:
+        return 10
+    if rank == "Ace":
+        return 11
+    return int(rank)
+
+
+def state_index(state):
+    """(total, dealer_card, usable_ace) -> index tuple into the first three Q axes."""
+    total, dealer_card, usable_ace = state
+    total = min(max(total, TOTALS[0]), TOTALS[-1])
+    return total - TOTALS[0], int(bool(usable_ace)), upcard_value(dealer_card) - UPCARDS[0]
+
+
+def flat_state_index(total, soft, upcard):
+    """Vectorized flat state number 0..NUM_STATES-1 from totals, soft flags and upcard values."""
+    total = np.clip(total, TOTALS[0], TOTALS[-1])
+    return ((total - TOTALS[0]) * 2 + soft) * len(UPCARDS) + (upcard - UPCARDS[0])
+
+
+def decode_flat_states(flat):
+    """Inverse of flat_state_index: (totals, soft flags, upcard values) arrays."""
+    rest, upcard = np.divmod(np.asarray(flat), len(UPCARDS))
+    total, soft = np.divmod(rest, 2)
+    return total + TOTALS[0], soft, upcard + UPCARDS[0]
+
+
+class TabularStrategy(Strategy):
+    """Greedy policy over a Q-table indexed by (total, soft, upcard, action)."""
+
+    def __init__(self, q_table=None):
+        self.Q = np.zeros(Q_SHAPE) if q_table is None else np.asarray(q_table, dtype=float)
+
+    def determine_action(self, state):
+        return ACTIONS[int(np.argmax(self.Q[state_index(state)]))]
+
+    def determine_legal_action(self, state, legal):
+        return ACTIONS[masked_argmax(self.Q[state_index(state)], legal)]
+
+    def get_Q(self, state, action):
+        return float(self.Q[state_index(state) + (ACTION_INDEX[action],)])
+
+    def get_Q_table(self):
+        return self.Q
+
+    def policy_table(self):
+        """Greedy action index for every (total, soft, upcard)."""
+        return np.argmax(self.Q, axis=-1)
+
+    def policy_digest(self):
+        """
+        Short hash of the greedy policy as it plays, where doubling is allowed
+        and where only hitting or standing is; identical policies share a digest.
+        """
+        drawn = np.argmax(self.Q[..., :STAND + 1], axis=-1)
+        played = np.stack([self.policy_table(), drawn]).astype(np.int8)
+        return hashlib.sha256(played.tobytes()).hexdigest()[:16]
+
+    def save(self, path):
+        np.savez(path, Q=self.Q)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data['Q'])
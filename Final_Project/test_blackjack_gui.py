@@ -0,0 +1,45 @@
+import unittest
+from basic_strategy import BasicStrategy
+from blackjack_gui import BlackjackGUI
+from simulation import simulate_games
+
+
+def headless_table(strategy, seats=1, seed=None):
+    """A BlackjackGUI with its seats, dealer and shoe but no Tk window."""
+    gui = BlackjackGUI.__new__(BlackjackGUI)
+    gui._setup_table(strategy, None, seats, seed)
+    return gui
+
+
+def play_rounds(gui, num_rounds):
+    """Run the round script to completion `num_rounds` times; rewards per round and seat."""
+    rewards = []
+    for _ in range(num_rounds):
+        for _ in gui._round_script():
+            pass
+        rewards.append([seat.reward for seat in gui.seats])
+    return rewards
+
+
+class TestBlackjackGUI(unittest.TestCase):
+    """Headless smoke test of the GUI's round script"""
+
+    def test_round_script_matches_simulation(self):
+        """One seat on a seeded shoe plays exactly the hands simulate_games plays"""
+        gui = headless_table(BasicStrategy(), seed=3)
+        rewards = [seat_rewards[0] for seat_rewards in play_rounds(gui, 500)]
+        self.assertEqual(rewards, simulate_games(BasicStrategy(), 500, seed=3)['rewards'])
+        self.assertEqual(gui.round, 500)
+        self.assertAlmostEqual(gui.seats[0].bankroll, sum(rewards))
+
+    def test_several_seats_share_the_shoe(self):
+        """Every seat is settled each round and the table keeps dealing through reshuffles"""
+        gui = headless_table(BasicStrategy(), seats=3, seed=1)
+        rounds = play_rounds(gui, 300)
+        self.assertTrue(all(len(seat_rewards) == 3 for seat_rewards in rounds))
+        for seat in gui.seats:
+            self.assertEqual(sum(seat.player.game_status), 300)
+
+
+if __name__ == '__main__':
+    unittest.main()
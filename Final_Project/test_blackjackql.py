@@ -0,0 +1,38 @@
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import unittest
+import blackjackql
+
+
+class TestCommandLine(unittest.TestCase):
+    """Test the headless blackjackql entry point"""
+
+    def run_cli(self, *argv):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            code = blackjackql.main(list(argv))
+        self.assertEqual(code, 0)
+        return json.loads(out.getvalue())
+
+    def test_simulate_outputs_json(self):
+        """simulate prints one JSON document with the aggregate results"""
+        result = self.run_cli('simulate', '--strategy', 'basic', '--hands', '300', '--decks', '2')
+        self.assertEqual(result['wins'] + result['losses'] + result['draws'], 300)
+        self.assertEqual(result['rules']['num_decks'], 2)
+        self.assertNotIn('rewards', result)
+
+    def test_heavy_modules_are_not_imported_at_startup(self):
+        """Importing the CLI and running an unseeded simulation loads no numpy, scipy, matplotlib or tkinter"""
+        code = ("import sys, blackjackql; blackjackql.main(['simulate', '--hands', '50']); "
+                "print(sorted(m for m in ('numpy', 'scipy', 'matplotlib', 'tkinter') if m in sys.modules))")
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(blackjackql.__file__))).stdout
+        self.assertEqual(output.strip().splitlines()[-1], '[]')
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
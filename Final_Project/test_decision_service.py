@@ -0,0 +1,97 @@
+import os
+import tempfile
+import threading
+import unittest
+import numpy as np
+from basic_strategy import BasicStrategy
+from decision_service import DecisionService, ServiceStrategy, DecisionClient, serve_unix
+from rules import Rules
+from simulation import simulate_games
+from strategy import HIT_OR_STAND, Strategy
+from tabular import Q_SHAPE, TabularStrategy
+
+
+class CountingStrategy(BasicStrategy):
+    """BasicStrategy that records the size of every batch it is asked for"""
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def determine_legal_actions(self, states, legals):
+        self.batch_sizes.append(len(states))
+        return super().determine_legal_actions(states, legals)
+
+
+class FailingStrategy(Strategy):
+    """Strategy whose decisions always fail"""
+
+    def determine_action(self, state):
+        raise RuntimeError("broken policy")
+
+
+class TestDecisionService(unittest.TestCase):
+    """Test the micro-batching decision service"""
+
+    def test_service_plays_like_the_strategy(self):
+        """Routing decisions through the service does not change a single hand"""
+        with DecisionService(BasicStrategy(), max_delay=0.0005) as service:
+            served = simulate_games(ServiceStrategy(service), 300, seed=1)
+        self.assertEqual(served, simulate_games(BasicStrategy(), 300, seed=1))
+
+    def test_service_keeps_the_masked_policy(self):
+        """A tabular policy served remotely still takes its argmax among the legal actions"""
+        table = TabularStrategy(np.random.default_rng(0).normal(size=Q_SHAPE))
+        with DecisionService(table, max_delay=0.0005) as service:
+            served = simulate_games(ServiceStrategy(service), 2000, seed=1)
+        direct = simulate_games(table, 2000, seed=1)
+        self.assertEqual(served['avg_reward'], direct['avg_reward'])
+        self.assertTrue(served['rewards'] == direct['rewards'])
+
+    def test_table_rules_reach_the_served_strategy(self):
+        """Under non-default rules the served strategy still plays exactly like the direct one"""
+        rules = Rules(num_decks=6, dealer_hits_soft_17=False, double_after_split=False, late_surrender=True)
+        with DecisionService(BasicStrategy(), max_delay=0.0005) as service:
+            served = simulate_games(ServiceStrategy(service), 2000, rules=rules, seed=4)
+        direct = simulate_games(BasicStrategy(), 2000, rules=rules, seed=4)
+        self.assertEqual(served['avg_reward'], direct['avg_reward'])
+        self.assertTrue(served['rewards'] == direct['rewards'])
+
+    def test_concurrent_tables_are_batched(self):
+        """Requests from many tables are answered together"""
+        strategy = CountingStrategy()
+        with DecisionService(strategy, max_batch=8, max_delay=0.02) as service:
+            threads = [threading.Thread(target=simulate_games, args=(ServiceStrategy(service), 50),
+                                        kwargs={'seed': t}) for t in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            stats = service.stats()
+        self.assertGreater(stats['mean_batch'], 1.0)
+        self.assertLessEqual(max(strategy.batch_sizes), 8)
+        self.assertEqual(stats['decisions'], sum(strategy.batch_sizes))
+
+    def test_errors_reach_the_caller(self):
+        """A failing strategy raises in the requesting table, not in the service thread"""
+        with DecisionService(FailingStrategy()) as service:
+            with self.assertRaises(RuntimeError):
+                service.request((12, 10, False))
+
+    def test_unix_socket_client(self):
+        """A client in another process gets the same decisions over the socket"""
+        with tempfile.TemporaryDirectory() as directory, DecisionService(BasicStrategy()) as service:
+            path = os.path.join(directory, 'decisions.sock')
+            server = serve_unix(service, path)
+            client = DecisionClient(path)
+            try:
+                for state in [(16, 10, False), (11, 6, False), (18, 9, True)]:
+                    self.assertEqual(client.determine_action(state), BasicStrategy().determine_action(state))
+                self.assertEqual(client.determine_legal_action((11, 6, False), HIT_OR_STAND), 'hit')
+            finally:
+                client.close()
+                server.shutdown()
+                server.server_close()
+
+
+if __name__ == '__main__':
+    unittest.main()
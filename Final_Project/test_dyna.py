@@ -0,0 +1,54 @@
+import unittest
+import numpy as np
+from dyna import END, DynaQStrategy, hands_to_reach
+from qlearning_strategy import QLearningStrategy
+from tabular import ACTIONS, flat_state_index
+
+
+class TestDynaQ(unittest.TestCase):
+    """Test the Dyna-Q learner and its model"""
+
+    def test_model_counts_real_transitions(self):
+        """The model counts each real hand's end once in the END column"""
+        learner = DynaQStrategy(planning_steps=0, seed=0).train(2000)
+        counts = learner.next_counts
+        # Naturals end before any decision and never reach the model
+        self.assertTrue(1700 < counts[:, END].sum() < 2000)
+        stand = ACTIONS.index('stand')
+        standing = counts.reshape(-1, len(ACTIONS), counts.shape[1])[:, stand]
+        self.assertEqual(standing[:, :END].sum(), 0)  # standing always ends the hand
+        self.assertTrue(np.all(np.abs(learner.reward_sum) <= 2 * counts[:, END]))
+
+    def test_no_planning_is_q_learning(self):
+        """With no planning budget the learner is plain batched Q-learning"""
+        config = dict(learning_rate=0.05, exploration_rate=0.3, seed=4)
+        plain = QLearningStrategy(**config).train(10_000)
+        dyna = DynaQStrategy(planning_steps=0, **config).train(10_000)
+        np.testing.assert_array_equal(dyna.get_Q_table(), plain.get_Q_table())
+        self.assertEqual(dyna.planning_updates, 0)
+
+    def test_prioritized_sweeping_converges_on_model(self):
+        """Expected backups drive every model TD error under the threshold"""
+        learner = DynaQStrategy(planning_steps=0, prioritized=True, seed=1).train(20_000)
+        self.assertGreater(np.abs(learner.model_td_errors()).max(), 0.01)
+        learner.plan(10 ** 6, 1000)
+        self.assertLess(np.abs(learner.model_td_errors()).max(), learner.priority_threshold)
+        # Standing on 20 against a 6 is valued at its observed average result
+        cell = flat_state_index(20, 0, 6) * len(ACTIONS) + ACTIONS.index('stand')
+        counts = learner.next_counts[cell]
+        self.assertAlmostEqual(learner.Q.reshape(-1)[cell], learner.reward_sum[cell] / counts.sum())
+
+    def test_planning_saves_real_hands(self):
+        """Planning reaches a given policy quality with fewer real hands"""
+        config = dict(learning_rate=0.05, exploration_rate=0.5, exploration_decay=0.99,
+                      min_exploration_rate=0.05, seed=0)
+        plain = DynaQStrategy(planning_steps=0, **config).train(60_000, evaluate_every=20_000)
+        dyna = DynaQStrategy(planning_steps=5, **config).train(60_000, evaluate_every=20_000)
+        self.assertEqual([entry['real_hands'] for entry in dyna.history], [20_000, 40_000, 60_000])
+        self.assertGreater(dyna.planning_updates, 5 * 60_000)
+        target = max(entry['strategy_ev'] for entry in plain.history)
+        self.assertLess(hands_to_reach(dyna.history, target), 60_000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+import numpy as np
+from card import Card
+from eligibility_traces import QLambdaStrategy, SarsaLambdaStrategy
+from qlearning_strategy import QLearningStrategy
+from tabular import state_index
+
+
+class TestEligibilityTraces(unittest.TestCase):
+    """Test the SARSA(lambda) and Watkins Q(lambda) learners"""
+
+    def setUp(self):
+        self.ten = Card('Hearts', '10')
+        self.steps = [((12, self.ten, False), 'hit'), ((15, self.ten, False), 'hit'),
+                      ((19, self.ten, False), 'stand')]
+
+    def test_terminal_reward_reaches_every_decision(self):
+        """With lambda = 1 one hand's reward updates each decision it made"""
+        learner = SarsaLambdaStrategy(trace_decay=1.0, learning_rate=1.0)
+        learner.update_episode(self.steps, 1.0)
+        for state, action in self.steps:
+            self.assertAlmostEqual(learner.get_Q(state, action), 1.0)
+        # With lambda = 0 only the last decision sees the reward
+        one_step = SarsaLambdaStrategy(trace_decay=0.0, learning_rate=1.0)
+        one_step.update_episode(self.steps, 1.0)
+        self.assertEqual(one_step.get_Q(self.steps[0][0], 'hit'), 0.0)
+        self.assertAlmostEqual(one_step.get_Q(self.steps[-1][0], 'stand'), 1.0)
+
+    def test_watkins_cuts_trace_after_exploration(self):
+        """Q(lambda) stops the trace at a non-greedy action; SARSA(lambda) does not"""
+        # Q(lambda) bootstraps the first decision from standing on 15; SARSA carries the loss back
+        for cls, reached in [(QLambdaStrategy, 0.5), (SarsaLambdaStrategy, -1.0)]:
+            learner = cls(trace_decay=1.0, learning_rate=1.0)
+            # Make hitting on 15 clearly non-greedy, then explore it
+            learner.Q[state_index(self.steps[1][0])] = [-0.5, 0.5, -1.0]
+            steps = [self.steps[0], ((15, self.ten, False), 'hit')]
+            learner.update_episode(steps, -1.0)
+            self.assertAlmostEqual(learner.get_Q(self.steps[0][0], 'hit'), reached)
+
+    def test_zero_lambda_is_one_step_q_learning(self):
+        """Watkins Q(0) reproduces the one-step batched Q-learning update"""
+        config = dict(learning_rate=0.05, exploration_rate=0.3, seed=4)
+        plain = QLearningStrategy(**config).train(10_000)
+        traced = QLambdaStrategy(trace_decay=0.0, **config).train(10_000)
+        np.testing.assert_allclose(traced.get_Q_table(), plain.get_Q_table(), atol=1e-9)
+        with self.assertRaises(ValueError):
+            SarsaLambdaStrategy(trace_decay=1.5)
+
+    def test_train_learns(self):
+        """A trained trace learner stands on 20 and hits 8 against a ten"""
+        learner = QLambdaStrategy(trace_decay=0.5, learning_rate=0.05, exploration_rate=0.5,
+                                  exploration_decay=0.99, min_exploration_rate=0.05, seed=1)
+        greedy = learner.train(100_000).greedy()
+        self.assertEqual(learner.episodes, 100_000)
+        self.assertEqual(greedy.determine_action((20, self.ten, False)), 'stand')
+        self.assertEqual(greedy.determine_action((8, self.ten, False)), 'hit')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+from basic_strategy import BasicStrategy
+from dealer import Dealer
+from events import Events
+from game import Game
+from player import Player
+from rules import Rules
+from simulation import play_round, simulate_games
+from strategy import legal_names
+
+
+class TestEvents(unittest.TestCase):
+    """Test the observer hooks on the round lifecycle"""
+
+    def seeded_game(self, rules=None, events=None):
+        game = Game(Dealer(rules), Player(BasicStrategy(), rules), rules, seed=3, events=events)
+        game.reshuffle()
+        return game
+
+    def test_unsubscribed_events_are_none(self):
+        """Nothing is dispatched until a callback subscribes, and unsubscribing restores None"""
+        events = Events()
+        self.assertIsNone(events.card_drawn)
+        callback = events.subscribe('card_drawn', lambda card: None)
+        self.assertIs(events.card_drawn, callback)
+        events.unsubscribe('card_drawn', callback)
+        self.assertIsNone(events.card_drawn)
+        with self.assertRaises(ValueError):
+            events.subscribe('shuffle', print)
+
+    def test_round_events_match_the_table(self):
+        """Every card on the table was announced once, and decisions and settlements line up"""
+        game = self.seeded_game(Rules(late_surrender=True))
+        log = {event: [] for event in ('deal', 'decision', 'card_drawn', 'dealer_reveal', 'settle')}
+        for event, calls in log.items():
+            game.events.subscribe(event, lambda *args, calls=calls: calls.append(args))
+        # Hands are passed live, so look at the deal while it happens
+        game.events.subscribe('deal', lambda hand, upcard: self.assertEqual(len(hand), 2))
+        for _ in range(300):
+            if game.needs_shuffle():
+                game.reshuffle()
+            drawn_before = len(log['card_drawn'])
+            settled_before = len(log['settle'])
+            reward = play_round(game)
+            on_table = game.dealer.hand + [card for hand in game.player.hands for card in hand]
+            drawn = [card for (card,) in log['card_drawn'][drawn_before:]]
+            self.assertCountEqual(map(id, drawn), map(id, on_table))
+            self.assertEqual(len(log['settle']), settled_before + 1)
+            self.assertEqual(sum(log['settle'][-1][0]), reward)
+        self.assertEqual(len(log['deal']), 300)
+        for state, legal, action in log['decision']:
+            self.assertIn(action, legal_names(legal))
+        self.assertTrue(any(action == 'split' for _, _, action in log['decision']))
+        for hole_card, hand in log['dealer_reveal']:
+            self.assertIs(hand[1], hole_card)
+
+    def test_two_subscribers_both_called(self):
+        """A second subscriber is fanned out to alongside the first"""
+        events = Events()
+        first, second = [], []
+        events.subscribe('settle', first.append)
+        events.subscribe('settle', second.append)
+        simulate_games(BasicStrategy(), 50, seed=1, events=events)
+        self.assertEqual(len(first), 50)
+        self.assertEqual(first, second)
+
+    def test_batched_delivery_and_flush(self):
+        """Batches arrive batch_size at a time and simulate_games flushes the remainder"""
+        events = Events()
+        batches = []
+        events.subscribe_batched('settle', batches.append, batch_size=16)
+        simulate_games(BasicStrategy(), 100, seed=1, events=events)
+        self.assertEqual([len(batch) for batch in batches], [16] * 6 + [4])
+        self.assertTrue(all(len(args) == 1 for batch in batches for args in batch))
+
+    def test_subscribers_do_not_change_results(self):
+        """Observing a run leaves its rewards bit-identical"""
+        events = Events()
+        events.subscribe('card_drawn', lambda card: None)
+        events.subscribe('decision', lambda state, legal, action: None)
+        observed = simulate_games(BasicStrategy(), 2000, seed=5, events=events)
+        plain = simulate_games(BasicStrategy(), 2000, seed=5)
+        self.assertEqual(observed['rewards'], plain['rewards'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from basic_strategy import BasicStrategy
+from batch_engine import run_episodes
+from hand_index import HandIndex, index_episodes, index_hand_log
+from hand_recorder import record_hands
+from rules import Rules
+
+
+class TestHandIndex(unittest.TestCase):
+    """Test indexed queries over recorded hand histories"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        log = record_hands(BasicStrategy(), 3000, os.path.join(cls.tmp.name, 'hands'),
+                           rules=Rules(late_surrender=True), seed=4)
+        cls.rewards = np.array([log.record(n).reward for n in range(len(log))])
+        index_hand_log(log, os.path.join(cls.tmp.name, 'index'))
+        cls.index = HandIndex(os.path.join(cls.tmp.name, 'index'))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_unfiltered_query_covers_every_hand(self):
+        """With no filter the EV is the average reward of the whole run"""
+        result = self.index.query()
+        self.assertEqual(result['count'], len(self.rewards))
+        self.assertAlmostEqual(result['ev'], self.rewards.mean(), places=6)
+
+    def test_filters_match_brute_force(self):
+        """Indexed lookups agree with a full scan of the decision columns"""
+        rows = self.index.decisions(total=12, soft=False, upcard=[2, 3])
+        keys = set(self.index.matching_keys(total=12, soft=False, upcard=[2, 3]))
+        expected = [i for i, key in enumerate(self.index.key) if key in keys]
+        self.assertEqual(sorted(rows), expected)
+
+    def test_surrendered_hands_lose_half(self):
+        """Outcome fields are consistent with the recorded rewards"""
+        result = self.index.query(action='surrender')
+        self.assertGreater(result['count'], 0)
+        self.assertEqual(result['ev'], -0.5)
+        self.assertEqual(self.index.query(outcome='win', action='surrender')['count'], 0)
+
+    def test_episode_index(self):
+        """Batch engine output can be indexed directly"""
+        states, actions, rewards = run_episodes(np.random.default_rng(0), 2000,
+                                                lambda s, first: np.ones(s.size, dtype=int))
+        index = index_episodes(states, actions, rewards, os.path.join(self.tmp.name, 'episodes'))
+        self.assertEqual(index.query(action='hit')['count'], 0)
+        self.assertEqual(index.query(action='stand')['count'], int((states[0] >= 0).sum()))
+
+
+if __name__ == '__main__':
+    unittest.main()
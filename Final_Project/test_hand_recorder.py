@@ -0,0 +1,52 @@
+import os
+import tempfile
+import unittest
+from basic_strategy import BasicStrategy
+from hand_recorder import record_hands, replay, HandLog
+from rules import Rules
+from simulation import simulate_games
+
+
+class TestHandRecorder(unittest.TestCase):
+    """Test binary hand recording and deterministic replay"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.prefix = os.path.join(self.tmp.name, 'hands')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_recording_matches_simulation(self):
+        """Recorded rewards are the rewards simulate_games() produces for the same seed"""
+        rules = Rules(num_decks=2, late_surrender=True)
+        log = record_hands(BasicStrategy(), 300, self.prefix, rules=rules, seed=5)
+        result = simulate_games(BasicStrategy(), 300, rules=rules, seed=5)
+        self.assertEqual(len(log), 300)
+        self.assertEqual([log.record(n).reward for n in range(300)], result['rewards'])
+
+    def test_random_access_replay(self):
+        """Any range replays identically, starting mid-shoe"""
+        record_hands(BasicStrategy(), 300, self.prefix, seed=2)
+        log = HandLog(self.prefix)
+        rewards = replay(log, 137, 160)
+        self.assertEqual(rewards, [log.record(n).reward for n in range(137, 160)])
+
+    def test_fractional_payout_round_trip(self):
+        """6:5 blackjacks are stored exactly, so recording and replay agree with simulation"""
+        rules = Rules(blackjack_payout=1.2)
+        log = record_hands(BasicStrategy(), 300, self.prefix, rules=rules, seed=3)
+        result = simulate_games(BasicStrategy(), 300, rules=rules, seed=3)
+        recorded = [log.record(n).reward for n in range(300)]
+        self.assertIn(1.2, recorded)
+        self.assertEqual(recorded, result['rewards'])
+        self.assertEqual(replay(log), recorded)
+
+    def test_unseeded_recording_rejected(self):
+        """Without a seed the shoes could not be regenerated"""
+        with self.assertRaises(ValueError):
+            record_hands(BasicStrategy(), 10, self.prefix, seed=None)
+
+
+if __name__ == '__main__':
+    unittest.main()
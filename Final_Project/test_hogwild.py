@@ -0,0 +1,34 @@
+import os
+import tempfile
+import unittest
+from multiprocessing import shared_memory
+import numpy as np
+from hogwild import HogwildTrainer, SharedTables
+
+
+class TestHogwild(unittest.TestCase):
+    """Test lock-free parallel Q-learning on shared memory"""
+
+    def test_workers_share_one_table(self):
+        """All workers' episodes land in the same table, and snapshots are written"""
+        with tempfile.TemporaryDirectory() as directory:
+            trainer = HogwildTrainer(num_workers=2, batch_size=500, snapshot_dir=directory)
+            learner = trainer.train(20_000)
+            self.assertEqual(learner.episodes, 20_000)
+            self.assertGreater(trainer.visits.sum(), 20_000 * 0.9)
+            self.assertGreater(np.abs(learner.Q).sum(), 0.0)
+            with np.load(os.path.join(directory, 'snapshot.npz')) as snapshot:
+                np.testing.assert_array_equal(snapshot['Q'], learner.Q)
+            self.assertTrue(trainer.reports)
+
+    def test_shared_block_is_released(self):
+        """The shared memory block is unlinked once training ends"""
+        tables = SharedTables(1)
+        name = tables.name
+        tables.close()
+        with self.assertRaises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+
+
+if __name__ == '__main__':
+    unittest.main()
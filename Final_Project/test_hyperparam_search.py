@@ -0,0 +1,40 @@
+import os
+import tempfile
+import unittest
+from card import Card
+from hyperparam_search import (Trial, sample_configs, successive_halving, hyperband,
+                               write_results, load_checkpoint)
+from qlearning_strategy import QLearningStrategy
+
+
+class TestHyperparameterSearch(unittest.TestCase):
+    """Test successive halving / Hyperband over Q-learning settings"""
+
+    def test_successive_halving_keeps_best_third(self):
+        """After each rung only the best 1/eta configurations keep training"""
+        trials = [Trial(i, c) for i, c in enumerate(sample_configs(9, seed=1))]
+        trials = successive_halving(trials, min_episodes=2_000, eta=3, eval_hands=500)
+        by_rung = {}
+        for t in trials:
+            by_rung.setdefault(t.rung, []).append(t)
+        self.assertEqual(sorted(len(v) for v in by_rung.values()), [1, 2, 6])
+        finalist = [t for t in trials if t.finalist]
+        self.assertEqual(len(finalist), 1)
+        self.assertEqual(finalist[0].episodes, 18_000)
+
+    def test_results_table_and_checkpoint(self):
+        """The search writes a ranked CSV and a loadable best checkpoint"""
+        trials = hyperband(max_episodes=15_000, eval_hands=300)
+        with tempfile.TemporaryDirectory() as tmp:
+            best = write_results(trials, tmp)
+            with open(os.path.join(tmp, 'results.csv')) as f:
+                self.assertEqual(len(f.readlines()), len(trials) + 1)
+            strategy = load_checkpoint(os.path.join(tmp, 'best_checkpoint.npz'))
+        self.assertIsInstance(strategy, QLearningStrategy)
+        self.assertEqual(strategy.learning_rate, best.config['learning_rate'])
+        self.assertIn(strategy.greedy().determine_action((20, Card('Hearts', '9'), False)),
+                      ['hit', 'stand', 'double down'])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,69 @@
+import unittest
+import numpy as np
+from basic_strategy import BasicStrategy
+from importance_sampling import (NCardTwentyOne, RareEvent, SLOTS, TiltedDeck,
+                                 cross_entropy_tilt, estimate)
+
+
+class AceUpcard(RareEvent):
+    """The dealer shows an Ace: probability exactly 1/13 on an infinite deck."""
+
+    def reset(self):
+        self._ace = 0
+
+    def observe(self, game, reward):
+        self._ace = int(game.dealer.hand[0].rank == 'Ace')
+
+    def score(self):
+        return self._ace
+
+
+class TestImportanceSampling(unittest.TestCase):
+    """Test tilted dealing, likelihood-ratio weights and cross-entropy tuning"""
+
+    def test_untilted_is_plain_monte_carlo(self):
+        """Without a tilt every weight is one"""
+        result = estimate(AceUpcard(), BasicStrategy(), 2000, seed=0)
+        self.assertAlmostEqual(result['mean_weight'], 1.0)
+        self.assertAlmostEqual(result['probability'], result['hits'] / 2000)
+
+    def test_tilted_estimate_is_unbiased(self):
+        """A tilt toward Aces still estimates the normal probability, with less variance"""
+        tilt = np.ones((len(SLOTS), 13))
+        tilt[0, 12] = 10.0
+        result = estimate(AceUpcard(), BasicStrategy(), 20_000, tilt=tilt, seed=1)
+        self.assertLess(abs(result['probability'] - 1 / 13), 4 * result['std_error'])
+        self.assertGreater(result['variance_reduction'], 2.0)
+        self.assertAlmostEqual(result['mean_weight'], 1.0, delta=0.05)
+
+    def test_finite_shoe_weights(self):
+        """Tilted draws from a finite shoe keep average weight one and stay unbiased"""
+        tilt = np.ones((len(SLOTS), 13))
+        tilt[2, :4] = 3.0
+        result = estimate(AceUpcard(), BasicStrategy(), 20_000, tilt=tilt, seed=2, shoe=True)
+        self.assertAlmostEqual(result['mean_weight'], 1.0, delta=0.05)
+        self.assertLess(abs(result['probability'] - 1 / 13), 4 * result['std_error'])
+        # A strong upcard tilt must not deplete the shoe the next trial starts from
+        tilt = np.ones((len(SLOTS), 13))
+        tilt[0, 12] = 50.0
+        result = estimate(AceUpcard(), BasicStrategy(), 5000, tilt=tilt, seed=3, shoe=True)
+        self.assertLess(abs(result['probability'] - 1 / 13), 4 * result['std_error'])
+        with self.assertRaises(TypeError):
+            RareEvent()
+        with self.assertRaises(ValueError):
+            TiltedDeck(np.ones((2, 13)), np.random.default_rng(0))
+
+    def test_cross_entropy_finds_rare_event(self):
+        """Cross-entropy tuning reaches the event level and agrees with plain Monte Carlo"""
+        event = NCardTwentyOne(5)
+        tilt, history = cross_entropy_tilt(event, BasicStrategy(), iterations=5, trials=4000, seed=0)
+        self.assertEqual(history[-1][0], 5)
+        tuned = estimate(event, BasicStrategy(), 10_000, tilt=tilt, seed=3)
+        plain = estimate(event, BasicStrategy(), 40_000, seed=4)
+        self.assertGreater(tuned['hits'], 10 * plain['hits'] / 4)
+        difference = abs(tuned['probability'] - plain['probability'])
+        self.assertLess(difference, 4 * np.hypot(tuned['std_error'], plain['std_error']))
+
+
+if __name__ == '__main__':
+    unittest.main()
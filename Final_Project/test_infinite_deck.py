@@ -0,0 +1,60 @@
+import unittest
+import numpy as np
+import hand_fsm as fsm
+from basic_strategy import BasicStrategy
+from batch_engine import play_dealer
+from infinite_deck import AliasSampler, DEALER_TOTALS, DealerSampler, dealer_outcome_table
+from simulation import simulate_games
+from table_engine import simulate_table_games
+
+
+class TestInfiniteDeck(unittest.TestCase):
+    """Test infinite-deck card sampling and sampled dealer results"""
+
+    def test_alias_sampler_frequencies(self):
+        """Draw frequencies follow the weights"""
+        draws = AliasSampler([1, 0, 3], seed=0).sample(200_000)
+        frequencies = np.bincount(draws, minlength=3) / draws.size
+        np.testing.assert_allclose(frequencies, [0.25, 0.0, 0.75], atol=0.005)
+
+    def test_dealer_table_matches_drawn_dealer(self):
+        """Cached outcome probabilities agree with actually drawing dealer cards"""
+        rng = np.random.default_rng(1)
+        hard = np.full(200_000, 16)  # hard 16, e.g. 10-6
+        finals = play_dealer(rng, hard, np.zeros(hard.size, dtype=bool), True)
+        drawn = [(np.minimum(finals, 22) == t).mean() for t in DEALER_TOTALS]
+        expected = dealer_outcome_table(True)[fsm.hand_state([8, 4])]
+        np.testing.assert_allclose(drawn, expected, atol=0.005)
+
+    def test_game_infinite_mode(self):
+        """Game never runs out of cards and seeded runs are reproducible"""
+        first = simulate_games(BasicStrategy(), 2000, seed=5, infinite_deck=True)
+        self.assertEqual(first, simulate_games(BasicStrategy(), 2000, seed=5, infinite_deck=True))
+        self.assertNotEqual(first, simulate_games(BasicStrategy(), 2000, seed=5))
+
+    def test_sampled_dealer_needs_infinite_deck(self):
+        """Dealer results are only sampled when cards are i.i.d."""
+        with self.assertRaises(ValueError):
+            simulate_table_games(BasicStrategy(), 10, seed=1, sample_dealer=True)
+        sampled = simulate_table_games(BasicStrategy(), 200_000, seed=1, infinite_deck=True, sample_dealer=True)
+        played = simulate_table_games(BasicStrategy(), 200_000, seed=2, infinite_deck=True)
+        difference = abs(sampled['avg_reward'] - played['avg_reward'])
+        self.assertLess(difference, 4 * np.hypot(sampled['std_error'], played['std_error']))
+
+    def test_sampled_dealer_outcomes(self):
+        """DealerSampler draws final totals as often as a played-out dealer reaches them"""
+        rng = np.random.default_rng(3)
+        # Rank indices: 10-6 (hard 16), Ace-6 (soft 17), 5-5 (hard 10)
+        for ranks, hard, has_ace in [([8, 4], 16, False), ([12, 4], 7, True), ([3, 3], 10, False)]:
+            for hits_soft_17 in (True, False):
+                sampler = DealerSampler(hits_soft_17, seed=0)
+                state = fsm.hand_state(ranks)
+                sampled = np.array([sampler.final_total(state) for _ in range(50_000)])
+                finals = play_dealer(rng, np.full(50_000, hard), np.full(50_000, has_ace), hits_soft_17)
+                for t in DEALER_TOTALS:
+                    self.assertAlmostEqual((sampled == t).mean(), (np.minimum(finals, 22) == t).mean(),
+                                           delta=0.01, msg=f"{ranks} H17={hits_soft_17} total {t}")
+
+
+if __name__ == '__main__':
+    unittest.main()
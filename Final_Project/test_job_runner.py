@@ -0,0 +1,89 @@
+import os
+import tempfile
+import unittest
+from basic_strategy import BasicStrategy
+from job_runner import (create_job, run_worker, run_job, collect, shard_result, shard_seed,
+                        _try_lock, _shard_path)
+from simulation import simulate_games
+
+
+class TestJobRunner(unittest.TestCase):
+    """Test resumable sharded jobs"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def job_dir(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def test_resumed_job_matches_uninterrupted_run(self):
+        """A job stopped part way and resumed by several workers gives the same totals"""
+        for name in ('whole', 'resumed'):
+            create_job(self.job_dir(name), 'simulate', num_shards=6, seed=2,
+                       strategy='basic', hands_per_shard=300)
+        run_worker(self.job_dir('whole'))
+        self.assertEqual(run_worker(self.job_dir('resumed'), max_shards=2), 2)
+        self.assertFalse(collect(self.job_dir('resumed'))['done'])
+        self.assertEqual(run_job(self.job_dir('resumed'), processes=2), collect(self.job_dir('whole')))
+
+    def test_infinite_deck_shards(self):
+        """Infinite-deck jobs keep the mode in their params and simulate each shard with it"""
+        directory = self.job_dir('infinite')
+        job = create_job(directory, 'simulate', num_shards=2, seed=3, infinite_deck=True,
+                         strategy='basic', hands_per_shard=200)
+        self.assertTrue(job['params']['infinite_deck'])
+        with self.assertRaises(ValueError):
+            create_job(directory, 'simulate', num_shards=2, seed=3, strategy='basic', hands_per_shard=200)
+        run_worker(directory)
+        expected = simulate_games(BasicStrategy(), 200, seed=shard_seed(3, 1), infinite_deck=True)
+        self.assertEqual(shard_result(directory, 1)['wins'], expected['wins'])
+        self.assertAlmostEqual(shard_result(directory, 1)['sum'], sum(expected['rewards']))
+
+    def test_finished_shards_are_skipped(self):
+        """Restarting a finished job does no work"""
+        directory = self.job_dir('done')
+        create_job(directory, 'simulate', num_shards=2, strategy='basic', hands_per_shard=100)
+        run_worker(directory)
+        self.assertEqual(run_worker(directory), 0)
+
+    def test_locked_shard_is_left_alone(self):
+        """A shard locked by another worker is not run twice"""
+        directory = self.job_dir('locked')
+        create_job(directory, 'simulate', num_shards=3, strategy='basic', hands_per_shard=100)
+        lock = _try_lock(_shard_path(directory, 1, '.lock'))
+        try:
+            self.assertEqual(run_worker(directory), 2)
+            self.assertIsNone(shard_result(directory, 1))
+        finally:
+            lock.close()
+
+    def test_training_chain(self):
+        """Training shards continue from the previous checkpoint"""
+        directory = self.job_dir('train')
+        create_job(directory, 'train', num_shards=2, episodes_per_shard=1000, exploration_rate=0.5,
+                   exploration_decay=0.9)
+        summary = run_job(directory, processes=1)
+        self.assertEqual(summary['episodes'], 2000)
+        self.assertLess(shard_result(directory, 1)['exploration_rate'],
+                        shard_result(directory, 0)['exploration_rate'])
+
+    def test_infinite_deck_training_job(self):
+        """A train job accepts infinite_deck (training is infinite-deck anyway) and runs its shards"""
+        directory = self.job_dir('train-infinite')
+        job = create_job(directory, 'train', num_shards=1, infinite_deck=True, episodes_per_shard=500)
+        self.assertNotIn('infinite_deck', job['params'])
+        self.assertEqual(run_job(directory, processes=1)['episodes'], 500)
+
+    def test_different_job_in_same_directory_rejected(self):
+        """A job directory cannot be reused for a different definition"""
+        directory = self.job_dir('clash')
+        create_job(directory, 'simulate', num_shards=2, strategy='basic', hands_per_shard=100)
+        with self.assertRaises(ValueError):
+            create_job(directory, 'simulate', num_shards=3, strategy='basic', hands_per_shard=100)
+
+
+if __name__ == '__main__':
+    unittest.main()
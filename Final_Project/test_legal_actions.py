@@ -0,0 +1,75 @@
+import random
+import unittest
+import numpy as np
+from basic_strategy import BasicStrategy
+from card import Card
+from player import Player
+from qlearning_strategy import QLearningStrategy
+from random_strategy import RandomStrategy
+from rules import Rules
+from simulation import simulate_games
+from strategy import ACTION_BITS, ALL_ACTIONS, HIT_OR_STAND, fallback_action, legal_names
+from tabular import TabularStrategy, state_index
+
+DOUBLE = ACTION_BITS['double down']
+SPLIT = ACTION_BITS['split']
+
+
+class TestLegalActions(unittest.TestCase):
+    """Test the legal-action mask Player passes to strategies"""
+
+    def player_with(self, *ranks, rules=None, strategy=None):
+        player = Player(strategy or BasicStrategy(), rules)
+        player.hands = [[Card('Hearts', rank) for rank in ranks]]
+        player.update_state(Card('Spades', '6'))
+        return player
+
+    def test_mask_follows_hand_and_rules(self):
+        """Double only on two cards, split only on a splittable pair, DAS and max splits respected"""
+        self.assertEqual(self.player_with('5', '6').legal_actions(), HIT_OR_STAND | DOUBLE)
+        self.assertEqual(self.player_with('8', '8').legal_actions(), HIT_OR_STAND | DOUBLE | SPLIT)
+        self.assertEqual(self.player_with('2', '3', '4').legal_actions(), HIT_OR_STAND)
+        # After a split: doubling needs DAS, and splitting stops at max_splits
+        no_das = self.player_with('8', '8', rules=Rules(double_after_split=False, max_splits=1))
+        no_das.split()
+        no_das.get_current_hand().append(Card('Clubs', '8'))
+        self.assertEqual(no_das.legal_actions(), HIT_OR_STAND)
+        self.assertEqual(legal_names(ALL_ACTIONS), ['hit', 'stand', 'double down', 'split'])
+
+    def test_legacy_strategies_fall_back(self):
+        """Answers that ignore the mask become legal as play_round always made them"""
+        self.assertEqual(fallback_action('Double Down', HIT_OR_STAND), 'hit')
+        self.assertEqual(fallback_action('split', HIT_OR_STAND | DOUBLE), 'hit')
+        self.assertEqual(fallback_action('surrender', ALL_ACTIONS), 'stand')
+        # BasicStrategy doubles 11, which becomes a hit on three cards
+        self.assertEqual(self.player_with('5', '6').determine_action(), 'double down')
+        self.assertEqual(self.player_with('2', '3', '6').determine_action(), 'hit')
+        # Pairs go to the pair chart
+        self.assertEqual(self.player_with('8', '8').determine_action(), 'split')
+
+    def test_random_strategy_only_picks_legal_actions(self):
+        """RandomStrategy samples uniformly among the legal actions"""
+        random.seed(0)
+        strategy = RandomStrategy()
+        picks = [strategy.determine_legal_action(None, HIT_OR_STAND | DOUBLE) for _ in range(3000)]
+        self.assertEqual(set(picks), {'hit', 'stand', 'double down'})
+        self.assertTrue(all(abs(picks.count(a) / 3000 - 1 / 3) < 0.05 for a in set(picks)))
+        self.assertEqual({strategy.determine_legal_action(None, HIT_OR_STAND) for _ in range(100)},
+                         {'hit', 'stand'})
+        simulate_games(strategy, 2000, seed=1)
+
+    def test_masked_argmax_for_learners(self):
+        """Tabular and Q-learning strategies choose the best or a random legal action"""
+        q = np.zeros((18, 2, 10, 3))
+        state = (11, Card('Spades', '6'), False)
+        q[state_index(state)] = [0.1, 0.2, 0.5]  # double > stand > hit
+        self.assertEqual(TabularStrategy(q).determine_legal_action(state, HIT_OR_STAND | DOUBLE), 'double down')
+        # Without doubling the next best action is taken, not a blind hit
+        self.assertEqual(TabularStrategy(q).determine_legal_action(state, HIT_OR_STAND), 'stand')
+        explorer = QLearningStrategy(q_table=q, exploration_rate=1.0, seed=0)
+        self.assertEqual({explorer.determine_legal_action(state, HIT_OR_STAND) for _ in range(100)},
+                         {'hit', 'stand'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+import numpy as np
+from card import Card
+from basic_strategy import BasicStrategy
+from batch_engine import run_episodes
+from monte_carlo import MonteCarloControl
+from simulation import simulate_games
+from tabular import TabularStrategy, STAND, ACTIONS
+
+
+class TestBatchEngine(unittest.TestCase):
+    """Test vectorized infinite-deck episodes"""
+
+    def test_always_stand_loses_about_sixteen_percent(self):
+        """Standing on every hand has a known house edge of roughly 16%"""
+        rng = np.random.default_rng(0)
+        _, _, rewards = run_episodes(rng, 200_000, lambda s, first: np.full(s.size, STAND))
+        self.assertAlmostEqual(rewards.mean(), -0.155, delta=0.02)
+
+
+class TestMonteCarloControl(unittest.TestCase):
+    """Test the Monte Carlo control trainer and its TabularStrategy output"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.trainer = MonteCarloControl(seed=1)
+        cls.strategy = cls.trainer.train(2_000_000)
+
+    def test_output_is_a_strategy(self):
+        """The trained policy plays through the regular simulator"""
+        self.assertIsInstance(self.strategy, TabularStrategy)
+        result = simulate_games(self.strategy, 500, seed=3)
+        self.assertEqual(result['wins'] + result['losses'] + result['draws'], 500)
+
+    def test_learns_obvious_decisions(self):
+        """Stand on hard 20, hit hard 6 vs 10, same as BasicStrategy"""
+        basic = BasicStrategy()
+        for state in [(20, Card('Hearts', 'King'), False), (6, Card('Hearts', '10'), False)]:
+            self.assertEqual(self.strategy.determine_action(state), basic.determine_action(state))
+            self.assertIn(self.strategy.determine_action(state), ACTIONS)
+
+    def test_process_pool_training(self):
+        """Episode generation can be spread over worker processes"""
+        trainer = MonteCarloControl(batch_size=20_000)
+        trainer.train(40_000, processes=2)
+        self.assertEqual(trainer.episodes, 40_000)
+        self.assertEqual(len(trainer.history), 4)  # 2 batches x 2 workers
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from card import Card
+from neural_q import NeuralQStrategy, encode_features
+from strategy import ALL_ACTIONS, HIT_OR_STAND
+from tabular import ACTIONS
+
+
+class TestNeuralQStrategy(unittest.TestCase):
+    """Test the NumPy MLP Q-function strategy"""
+
+    def setUp(self):
+        self.strategy = NeuralQStrategy(seed=0)
+        rng = np.random.default_rng(0)
+        self.features = encode_features(rng.integers(4, 22, 4096), rng.integers(0, 2, 4096),
+                                        rng.integers(2, 12, 4096))
+
+    def test_batch_decisions_match_single_decisions(self):
+        """determine_actions gives the same answer as one determine_action per state"""
+        states = [(t, Card('Hearts', '7'), soft) for t in range(12, 22) for soft in [False, True]]
+        batch = self.strategy.determine_actions(states)
+        self.assertEqual(batch, [self.strategy.determine_action(s) for s in states])
+        for action in batch:
+            self.assertIn(action, ACTIONS)
+
+    def test_batch_legal_decisions_match_single_decisions(self):
+        """determine_legal_actions applies each state's own mask, like determine_legal_action"""
+        states = [(t, Card('Hearts', '7'), soft) for t in range(12, 22) for soft in [False, True]]
+        legals = [HIT_OR_STAND if i % 2 else ALL_ACTIONS for i in range(len(states))]
+        batch = self.strategy.determine_legal_actions(states, legals)
+        self.assertEqual(batch, [self.strategy.determine_legal_action(s, l) for s, l in zip(states, legals)])
+        self.assertNotIn('double down', batch[1::2])
+
+    def test_training_reduces_td_loss(self):
+        """Mini-batch Adam training fits the stored transitions"""
+        losses = self.strategy.train(60_000)
+        self.assertLess(np.mean(losses[-20:]), np.mean(losses[:20]))
+
+    def test_save_and_load_weights(self):
+        """Weights round-trip through .npz"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'q.npz')
+            self.strategy.save(path)
+            loaded = NeuralQStrategy.load(path)
+        np.testing.assert_allclose(loaded.q_values(self.features), self.strategy.q_values(self.features))
+
+    def test_batch_scores_match_single_rows(self):
+        """Scoring 4096 states in one batch gives each row the values it gets on its own"""
+        batch = self.strategy.q_values(self.features)
+        self.assertEqual(batch.shape, (len(self.features), len(ACTIONS)))
+        for i in range(0, len(self.features), 409):
+            np.testing.assert_allclose(batch[i], self.strategy.q_values(self.features[i:i + 1])[0], rtol=1e-5, atol=1e-6)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
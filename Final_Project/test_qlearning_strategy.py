@@ -1,7 +1,6 @@
 import unittest
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.stats import ttest_ind
 
 from dealer import Dealer
 from player import Player
@@ -10,6 +9,9 @@ from basic_strategy import BasicStrategy
 from random_strategy import RandomStrategy
 from qlearning_strategy import QLearningStrategy
 from card import Card
+from strategy_report import error_cost_report
+from hyperparam_search import Trial, sample_configs, successive_halving, rank_trials
+from simulation import simulate_games
 
 
 class StrategyTestBase(unittest.TestCase):
@@ -107,43 +109,39 @@ class TestStrategyComparisonQlearning(StrategyTestBase):
     def setUp(self):
         self.num_games = 10_000  # Requirement: 10k games
 
-    def test_qlearning_outperforms_basic(self):
+    def test_trained_qlearning_matches_basic(self):
+        """
+        The best learner of a seeded hyperparameter search plays close to Basic Strategy.
+
+        The tabular learner cannot split or surrender, so its ceiling is about
+        0.8% of EV below Basic Strategy: its exact EV is held to within 1.5% of
+        Basic Strategy's, and 10k hands on common seeded shoes must show the
+        same gap as the exact values.
+        """
         print("\n" + "="*80)
         print("Q-LEARNING vs BASIC STRATEGY — PERFORMANCE TEST")
         print("="*80)
 
-        q_strategy = QLearningStrategy(learning_rate=0.1, discount_factor=0.95, exploration_rate=0.05)
+        trials = [Trial(i, c) for i, c in enumerate(sample_configs(9, seed=0))]
+        best = rank_trials(successive_halving(trials, min_episodes=30_000, eta=3, eval_hands=5_000))[0]
+        q_strategy = QLearningStrategy(q_table=best.q_table, **best.config).greedy()
         basic_strategy = BasicStrategy()
-
-        # Simulate games
-        print("\nSimulating Q-Learning Strategy...")
-        q_wins, q_losses, q_draws, q_win_rate, q_avg_reward, q_rewards = \
-            self.simulate_games(q_strategy, self.num_games)
-
-        print(f"Q-Learning:\n  Win Rate: {q_win_rate:.2%}\n  Avg Reward: {q_avg_reward:.4f}")
-
-        print("\nSimulating Basic Strategy...")
-        b_wins, b_losses, b_draws, b_win_rate, b_avg_reward, b_rewards = \
-            self.simulate_games(basic_strategy, self.num_games)
-
-        print(f"Basic Strategy:\n  Win Rate: {b_win_rate:.2%}\n  Avg Reward: {b_avg_reward:.4f}")
-
-        # ----------------------------------------------------------------------------------
-        # Statistical significance test (two-sample t-test)
-        # ----------------------------------------------------------------------------------
-        t_stat, p_value = ttest_ind(q_rewards, b_rewards, equal_var=False)
-        print("\nT-TEST COMPARISON (Q-Learning vs Basic)")
-        print(f"t-statistic: {t_stat:.4f}, p-value: {p_value:.6f}")
-
-        # p < 0.05 → significant difference
-        self.assertLess(p_value, 0.05,
-            "Q-Learning should differ significantly from Basic Strategy (p < 0.05).")
-
-        # Expect Q-learning to eventually outperform
-        self.assertGreater(q_win_rate, b_win_rate,
-            "Q-Learning should have a higher win rate than Basic Strategy.")
-        self.assertGreater(q_avg_reward, b_avg_reward,
-            "Q-Learning should have a higher average reward than Basic Strategy.")
+        print(f"\nBest searched configuration after {best.episodes:,} episodes: {best.config}")
+
+        q_ev = error_cost_report(q_strategy)['strategy_ev']
+        b_ev = error_cost_report(basic_strategy)['strategy_ev']
+        print(f"Exact EV: Q-Learning {q_ev:.4f}, Basic Strategy {b_ev:.4f}")
+        self.assertGreater(q_ev, b_ev - 0.015,
+            "Trained Q-Learning should be within 1.5% of Basic Strategy's exact EV.")
+
+        # Paired comparison: both strategies play the same seeded shoes
+        q_result = simulate_games(q_strategy, self.num_games, seed=0)
+        b_result = simulate_games(basic_strategy, self.num_games, seed=0)
+        gaps = np.array(q_result['rewards']) - np.array(b_result['rewards'])
+        std_error = gaps.std(ddof=1) / np.sqrt(len(gaps))
+        print(f"Simulated gap over {self.num_games:,} hands: {gaps.mean():.4f} ± {std_error:.4f}")
+        self.assertLess(abs(gaps.mean() - (q_ev - b_ev)), 3 * std_error,
+            "The simulated gap should agree with the exact one.")
 
 
 # ---------------------------------------------------------------------
@@ -0,0 +1,93 @@
+import tempfile
+import time
+import unittest
+import numpy as np
+from basic_strategy import BasicStrategy
+from decision_service import DecisionService, ServiceStrategy
+from hand_recorder import RecordingStrategy
+from qlearning_strategy import QLearningStrategy
+from random_strategy import RandomStrategy
+from result_cache import ResultCache, cache_key
+from rules import Rules
+from simulation import simulate_games
+from tabular import DOUBLE, HIT, Q_SHAPE, STAND, TabularStrategy
+
+
+class TestResultCache(unittest.TestCase):
+    """Test the content-addressed simulation result cache"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ResultCache(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_hit_returns_identical_result(self):
+        """A repeated seeded request is served from the cache"""
+        first = simulate_games(BasicStrategy(), 500, seed=3, cache=self.cache)
+        start = time.perf_counter()
+        second = simulate_games(BasicStrategy(), 500, seed=3, cache=self.cache)
+        self.assertLess(time.perf_counter() - start, 0.05)
+        self.assertEqual(first, second)
+
+    def test_key_depends_on_every_input(self):
+        """Rules, seed and hand count all change the key"""
+        strategy = BasicStrategy()
+        base = cache_key(strategy, None, 1, 100)
+        self.assertNotEqual(base, cache_key(strategy, Rules(num_decks=6), 1, 100))
+        self.assertNotEqual(base, cache_key(strategy, None, 2, 100))
+        self.assertNotEqual(base, cache_key(strategy, None, 1, 101))
+
+    def test_tables_keyed_on_their_hit_or_stand_choice(self):
+        """Tables with the same argmax but different play where doubling is illegal get different keys"""
+        q = np.zeros(Q_SHAPE)
+        q[..., DOUBLE] = 1.0
+        hits, stands = q.copy(), q.copy()
+        hits[..., HIT] = 0.5
+        stands[..., STAND] = 0.5
+        self.assertNotEqual(cache_key(TabularStrategy(hits), None, 1, 100),
+                            cache_key(TabularStrategy(stands), None, 1, 100))
+
+    def test_wrappers_keyed_on_the_wrapped_strategy(self):
+        """Wrapping a strategy keeps the wrapped strategy's identity in the key"""
+        basic = cache_key(RecordingStrategy(BasicStrategy()), None, 1, 100)
+        self.assertNotEqual(basic, cache_key(BasicStrategy(), None, 1, 100))
+        self.assertNotEqual(basic, cache_key(RecordingStrategy(TabularStrategy()), None, 1, 100))
+        with DecisionService(BasicStrategy()) as served, DecisionService(TabularStrategy()) as other:
+            self.assertNotEqual(cache_key(ServiceStrategy(served), None, 1, 100),
+                                cache_key(ServiceStrategy(other), None, 1, 100))
+
+    def test_global_random_strategies_are_not_cached(self):
+        """A strategy that draws from the random module is not reproducible from the seed"""
+        self.assertIsNone(cache_key(RandomStrategy(), None, 1, 100))
+        self.assertIsNone(cache_key(RecordingStrategy(RandomStrategy()), None, 1, 100))
+        simulate_games(RandomStrategy(), 100, seed=1, cache=self.cache)
+        self.assertEqual(self.cache.size(), 0)
+
+    def test_exploring_learners_are_not_cached(self):
+        """An epsilon-greedy learner plays from its own RNG, so only its non-exploring form is cached"""
+        self.assertIsNone(cache_key(QLearningStrategy(exploration_rate=0.1), None, 1, 100))
+        self.assertIsNone(cache_key(QLearningStrategy(exploration_rate=0.1, seed=3), None, 1, 100))
+        self.assertIsNotNone(cache_key(QLearningStrategy(exploration_rate=0.0), None, 1, 100))
+        simulate_games(QLearningStrategy(exploration_rate=0.1), 100, seed=1, cache=self.cache)
+        self.assertEqual(self.cache.size(), 0)
+
+    def test_unseeded_runs_are_not_cached(self):
+        """Runs without a seed are not reproducible and never stored"""
+        simulate_games(BasicStrategy(), 100, cache=self.cache)
+        self.assertEqual(self.cache.size(), 0)
+
+    def test_lru_eviction_keeps_size_bounded(self):
+        """Least recently used entries are evicted first"""
+        cache = ResultCache(self.tmp.name, max_bytes=1_000)
+        cache.put('old', {'avg_reward': 0.0, 'rewards': [0.0] * 100})
+        time.sleep(0.01)
+        cache.put('new', {'avg_reward': 1.0, 'rewards': [1.0] * 100})
+        self.assertLessEqual(cache.size(), 1_000)
+        self.assertIsNone(cache.get('old'))
+        self.assertEqual(cache.get('new', with_rewards=True)['rewards'], [1.0] * 100)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
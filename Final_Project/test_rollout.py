@@ -0,0 +1,172 @@
+import random
+import unittest
+import numpy as np
+from basic_strategy import BasicStrategy
+from card import Card
+from dealer import Dealer
+from game import Game
+from player import Player
+from rollout import _deal_unseen, _hole_candidates, evaluate_actions
+from rules import Rules
+from simulation import play_out, play_round
+
+
+RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'Jack', 'Queen', 'King', 'Ace']
+
+
+def fields(snapshot):
+    return [getattr(snapshot, name) for name in snapshot.__slots__]
+
+
+class TestGameSnapshot(unittest.TestCase):
+    """Test Game.snapshot() and Game.restore()"""
+
+    def dealt_game(self, seed=2, rules=None, **kwargs):
+        game = Game(Dealer(rules), Player(BasicStrategy(), rules), rules, seed=seed, **kwargs)
+        game.reshuffle()
+        for _ in range(5):
+            play_round(game)
+        game.new_round()
+        return game
+
+    def test_restore_replays_the_round(self):
+        """Playing out from the same snapshot twice deals the same cards and result"""
+        game = self.dealt_game()
+        snapshot = game.snapshot()
+        first = play_out(game)
+        after = fields(game.snapshot())
+        game.restore(snapshot)
+        self.assertEqual(fields(game.snapshot()), fields(snapshot))
+        self.assertEqual(play_out(game), first)
+        self.assertEqual(fields(game.snapshot()), after)
+
+    def test_snapshot_is_not_shared(self):
+        """Playing on after a restore never changes the snapshot"""
+        game = self.dealt_game()
+        snapshot = game.snapshot()
+        saved = fields(snapshot)
+        game.restore(snapshot)
+        game.player.hit(game.deck)
+        game.dealer.hand.append(game.deck.pop())
+        self.assertEqual(fields(snapshot), saved)
+        # A settled round restores settled: the dealer is not played again
+        play_out(game)
+        settled = game.snapshot()
+        game.restore(settled)
+        self.assertEqual(game.settle(), list(settled.settlement))
+        self.assertEqual(len(game.deck), len(settled.deck))
+
+    def test_rng_is_captured(self):
+        """Unseeded games restore the random module; infinite decks their sampler and draws"""
+        game = self.dealt_game(seed=None)
+        snapshot = game.snapshot()
+        expected = random.random()
+        game.restore(snapshot)
+        self.assertEqual(random.random(), expected)
+
+        game = self.dealt_game(seed=4, infinite_deck=True)
+        snapshot = game.snapshot()
+        draws = [game.deck.pop() for _ in range(70_000)]  # past the buffer, into fresh samples
+        game.restore(snapshot)
+        self.assertEqual([game.deck.pop() for _ in range(70_000)], draws)
+
+    def test_forced_action_must_be_legal(self):
+        """play_out refuses an action the current hand does not allow"""
+        game = self.dealt_game()
+        game.player.hands[0] += [Card('Clubs', '2')]
+        with self.assertRaises(ValueError):
+            play_out(game, 'double down')
+
+
+class TestRollouts(unittest.TestCase):
+    """Test the rollout evaluator"""
+
+    def decision(self, ranks, upcard, rules=None):
+        """A seeded game at the first decision with the given player cards and upcard."""
+        game = Game(Dealer(rules), Player(BasicStrategy(), rules), rules, seed=11)
+        game.reshuffle()
+        game.new_round()
+        game.player.hands = [[Card('Hearts', rank) for rank in ranks]]
+        game.dealer.hand[0] = Card('Spades', upcard)
+        game.player.update_state(game.dealer.hand[0])
+        return game
+
+    def test_clear_decisions(self):
+        """Standing on 20 beats hitting it, and every legal action is evaluated"""
+        game = self.decision(['10', '10'], '6')
+        results = evaluate_actions(game, num_rollouts=400, chunk_size=100)
+        self.assertEqual(list(results), ['hit', 'stand', 'double down', 'split'])
+        self.assertGreater(results['stand']['ev'], results['hit']['ev'])
+        self.assertEqual(results['stand']['gap'], 0.0)
+        for r in results.values():
+            self.assertEqual(r['rollouts'], 400)
+            self.assertLess(r['ci95'][0], r['ev'])
+            self.assertGreater(r['ci95'][1], r['ev'])
+
+    def test_game_untouched_and_pool_matches(self):
+        """The live game is not modified, and a process pool gives the same numbers"""
+        game = self.decision(['9', '7'], '10')
+        before = fields(game.snapshot())
+        serial = evaluate_actions(game, num_rollouts=200, actions=['hit', 'stand'], chunk_size=50)
+        self.assertEqual(fields(game.snapshot()), before)
+        pooled = evaluate_actions(game, num_rollouts=200, actions=['hit', 'stand'], chunk_size=50,
+                                  processes=2)
+        self.assertEqual(pooled, serial)
+
+    def test_peek_rules_out_a_dealer_natural(self):
+        """With an Ace up the hole card is never a ten, so standing on 20 never loses to 21 in two cards"""
+        game = self.decision(['10', 'Queen'], 'Ace')
+        results = evaluate_actions(game, num_rollouts=300, actions=['stand'])
+        # Without the peek about 4 in 13 rollouts would be dealer naturals and losses
+        self.assertGreater(results['stand']['ev'], 0.0)
+
+    def test_hole_card_does_not_skew_the_shoe(self):
+        """After the hole card is chosen, the next card is a ten as often as the rest of the shoe holds tens"""
+        unseen = [Card('Hearts', rank) for rank in RANKS] * 24  # six decks
+        upcard = Card('Spades', 'Ace')
+        candidates = _hole_candidates(unseen, upcard)
+        self.assertEqual(len(candidates), len(unseen) - 96)
+        rng = np.random.default_rng(0)
+        holes = tens = 0
+        for _ in range(20_000):
+            hole, order = _deal_unseen(rng, unseen, candidates)
+            holes += hole.point_value == 10
+            tens += order[-1].point_value == 10
+        self.assertEqual(holes, 0)
+        # 96 tens among the 311 cards left once a non-ten hole card is out
+        self.assertAlmostEqual(tens / 20_000, 96 / 311, delta=0.015)
+
+    def test_surrender_is_a_candidate(self):
+        """Under late surrender a first hard decision also weighs surrendering at exactly -0.5"""
+        rules = Rules(late_surrender=True)
+        game = self.decision(['10', '6'], '10', rules)
+        results = evaluate_actions(game, num_rollouts=300, chunk_size=100)
+        self.assertEqual(list(results), ['hit', 'stand', 'double down', 'surrender'])
+        self.assertEqual(results['surrender']['ev'], -0.5)
+        self.assertEqual(results['surrender']['std_error'], 0.0)
+        best = max(r['ev'] for r in results.values())
+        self.assertAlmostEqual(results['surrender']['gap'], best + 0.5)
+        # Not once the hand has drawn, nor on a soft hand
+        soft = self.decision(['Ace', '5'], '10', rules)
+        self.assertNotIn('surrender', evaluate_actions(soft, num_rollouts=10))
+        drawn = self.decision(['10', '4', '2'], '10', rules)
+        self.assertNotIn('surrender', evaluate_actions(drawn, num_rollouts=10))
+        with self.assertRaises(ValueError):
+            evaluate_actions(drawn, num_rollouts=10, actions=['surrender'])
+
+    def test_invalid_requests(self):
+        """No rollouts for illegal actions, settled rounds or infinite decks"""
+        game = self.decision(['10', '5', '2'], '9')
+        with self.assertRaises(ValueError):
+            evaluate_actions(game, num_rollouts=10, actions=['double down'])
+        play_out(game)
+        with self.assertRaises(ValueError):
+            evaluate_actions(game, num_rollouts=10)
+        infinite = Game(Dealer(), Player(BasicStrategy()), Rules(), seed=1, infinite_deck=True)
+        infinite.new_round()
+        with self.assertRaises(ValueError):
+            evaluate_actions(infinite, num_rollouts=10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+from card import Card
+from dealer import Dealer
+from player import Player
+from game import Game
+from rules import Rules
+from basic_strategy import BasicStrategy
+from dealer_odds import dealer_distribution
+from simulation import simulate_games
+from sweep import rule_grid, run_sweep
+
+
+class TestRulesConfiguration(unittest.TestCase):
+    """Test that Game, Dealer and strategies follow the configured rules"""
+
+    def test_shoe_size_follows_deck_count(self):
+        """A 6-deck game builds a 312-card shoe"""
+        rules = Rules(num_decks=6)
+        game = Game(Dealer(), Player(BasicStrategy()), rules)
+        self.assertEqual(len(game.deck), 312)
+        self.assertEqual(game.dealer.rules, rules)
+        self.assertEqual(game.player.strategy.rules, rules)
+
+    def test_dealer_soft_17_rule(self):
+        """Dealer hits soft 17 under H17 and stands under S17"""
+        for hits_soft_17 in [True, False]:
+            dealer = Dealer(Rules(dealer_hits_soft_17=hits_soft_17))
+            dealer.hand = [Card('Hearts', 'Ace'), Card('Clubs', '6')]
+            self.assertEqual(dealer.should_hit(), hits_soft_17)
+
+    def test_dealer_counts_ace_as_one_when_needed(self):
+        """Dealer A,A,9 is 21, not a bust"""
+        dealer = Dealer()
+        dealer.hand = [Card('Hearts', 'Ace'), Card('Clubs', 'Ace'), Card('Spades', '9')]
+        self.assertEqual(dealer.get_total(), 21)
+
+    def test_resplit_limit(self):
+        """No further splits once max_splits has been reached"""
+        player = Player(BasicStrategy(), Rules(max_splits=1))
+        player.hands = [[Card('Hearts', '8'), Card('Clubs', '8')]]
+        self.assertTrue(player.split())
+        player.hands[0].append(Card('Spades', '8'))
+        self.assertFalse(player.can_split())
+
+    def test_no_double_after_split(self):
+        """Doubling a split hand is refused without DAS"""
+        player = Player(BasicStrategy(), Rules(double_after_split=False))
+        player.hands = [[Card('Hearts', '5')], [Card('Clubs', '5')]]
+        player.hands[0].append(Card('Spades', '6'))
+        self.assertFalse(player.can_double())
+
+    def test_late_surrender_decision(self):
+        """BasicStrategy surrenders hard 16 vs 10 only when surrender is offered"""
+        strategy = BasicStrategy()
+        self.assertFalse(strategy.should_surrender(16, 10))
+        strategy.set_rules(Rules(late_surrender=True))
+        self.assertTrue(strategy.should_surrender(16, 10))
+
+    def test_dealer_distribution_sums_to_one(self):
+        """Each exact dealer distribution is a probability distribution"""
+        for upcard in range(2, 12):
+            dist = dealer_distribution(upcard, num_decks=2)
+            self.assertAlmostEqual(sum(dist.values()), 1.0, places=9)
+
+    def test_seeded_simulation_is_reproducible(self):
+        """The same seed gives the same rewards"""
+        first = simulate_games(BasicStrategy(), 300, seed=7)
+        second = simulate_games(BasicStrategy(), 300, seed=7)
+        self.assertEqual(first['rewards'], second['rewards'])
+
+    def test_sweep_returns_one_result_per_rule_set(self):
+        """The sweep keeps the grid order"""
+        grid = rule_grid(num_decks=(1, 2), dealer_hits_soft_17=(True, False))
+        results = run_sweep(BasicStrategy(), grid, num_games=200, processes=1)
+        self.assertEqual([r['label'] for r in results], [g.label() for g in grid])
+
+    def test_parallel_sweep_matches_serial(self):
+        """Grouping grid points per worker changes no result"""
+        grid = rule_grid(num_decks=(1, 2), dealer_hits_soft_17=(True, False), late_surrender=(False, True))
+        serial = run_sweep(BasicStrategy(), grid, num_games=200, seed=2, processes=1)
+        self.assertEqual(run_sweep(BasicStrategy(), grid, num_games=200, seed=2, processes=2), serial)
+
+    def test_sweep_infinite_deck(self):
+        """An infinite-deck sweep plays every grid point from an infinite deck"""
+        grid = rule_grid(num_decks=(1, 6), dealer_hits_soft_17=(True,))
+        results = run_sweep(BasicStrategy(), grid, num_games=300, seed=4, processes=1, infinite_deck=True)
+        for rules, result in zip(grid, results):
+            expected = simulate_games(BasicStrategy(), 300, rules=rules, seed=4, infinite_deck=True)
+            self.assertEqual(result['avg_reward'], expected['avg_reward'])
+            self.assertTrue(result['infinite_deck'])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,70 @@
+import unittest
+from card import Card
+from dealer import Dealer
+from player import Player
+from game import Game
+from basic_strategy import BasicStrategy
+
+
+def cards(*ranks):
+    return [Card('Spades', rank) for rank in ranks]
+
+
+class TestSettlement(unittest.TestCase):
+    """Test dealer peek, skipped dealer play and multi-hand settlement"""
+
+    def setUp(self):
+        self.dealer = Dealer()
+        self.player = Player(BasicStrategy())
+        self.game = Game(self.dealer, self.player)
+        self.game.deck = cards('5', '5', '5', '5')
+
+    def test_dealer_skips_drawing_when_every_hand_busted(self):
+        """No cards are drawn for the dealer once the player has busted"""
+        self.dealer.hand = cards('10', '6')
+        self.player.hands = [cards('10', '6', 'King')]
+        self.assertEqual(self.game.settle(), [-1.0])
+        self.assertEqual(len(self.dealer.hand), 2)
+        self.assertEqual(len(self.game.deck), 4)
+
+    def test_dealer_played_once(self):
+        """Repeated settlement (e.g. print_winner after determine_winner) never redraws"""
+        self.dealer.hand = cards('10', '2')
+        self.player.hands = [cards('10', '8')]
+        self.assertEqual(self.game.determine_winner(), 'player')  # 18 vs 10, 2, 5 = 17
+        self.game.determine_winner()
+        self.assertEqual(len(self.dealer.hand), 3)
+        self.assertEqual(len(self.game.deck), 3)
+
+    def test_peek_settles_naturals_without_drawing(self):
+        """A dealer blackjack beats everything but a player natural"""
+        self.dealer.hand = cards('Ace', 'King')
+        self.assertTrue(self.game.dealer_peek())
+        self.player.hands = [cards('Ace', 'Queen')]
+        self.assertEqual(self.game.settle(), [0.0])
+        self.dealer.hand = cards('Ace', 'King')
+        self.player.hands = [cards('10', '6')]
+        self.assertEqual(self.game.settle(), [-1.0])
+        self.assertEqual(len(self.game.deck), 4)
+
+    def test_new_hands_or_round_settle_afresh(self):
+        """The settlement is only reused for the same round and the same hands"""
+        self.dealer.hand = cards('10', '8')
+        self.player.hands = [cards('10', '9')]
+        self.assertEqual(self.game.settle(), [1.0])
+        self.player.hands = [cards('10', '7')]  # same dealer hand list, new player hands
+        self.assertEqual(self.game.settle(), [-1.0])
+        self.game.round += 1
+        self.player.hands[0].append(Card('Spades', '2'))
+        self.assertEqual(self.game.settle(), [1.0])
+
+    def test_all_split_and_doubled_hands_settled(self):
+        """Every hand is paid in one pass with its own stake"""
+        self.dealer.hand = cards('10', '7')
+        self.player.hands = [cards('8', '3', '9'), cards('8', '10', '5'), cards('8', '10')]
+        self.player.doubled_down = [True, False, False]
+        self.assertEqual(self.game.settle(), [2.0, -1.0, 1.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
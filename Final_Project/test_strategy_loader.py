@@ -0,0 +1,30 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from basic_strategy import BasicStrategy
+from random_strategy import RandomStrategy
+from strategy_loader import load_strategy
+from tabular import Q_SHAPE, TabularStrategy
+
+
+class TestStrategyLoader(unittest.TestCase):
+    """Test loading strategies by name or saved-policy path"""
+
+    def test_names_and_saved_tables(self):
+        """Named strategies and saved Q tables load; other files are rejected"""
+        self.assertIsInstance(load_strategy('basic'), BasicStrategy)
+        self.assertIsInstance(load_strategy('random'), RandomStrategy)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'policy.npz')
+            q = np.random.default_rng(0).normal(size=Q_SHAPE)
+            TabularStrategy(q).save(path)
+            np.testing.assert_array_equal(load_strategy(path).Q, q)
+            other = os.path.join(tmp, 'other.npz')
+            np.savez(other, x=np.zeros(3))
+            with self.assertRaises(ValueError):
+                load_strategy(other)
+
+
+if __name__ == '__main__':
+    unittest.main()
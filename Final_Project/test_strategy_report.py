@@ -0,0 +1,61 @@
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+from basic_strategy import BasicStrategy
+from exact_ev import exact_ev
+from rules import Rules
+from strategy_report import error_cost_report, write_report
+from table_engine import simulate_table_games
+from tabular import TabularStrategy
+
+
+class TestStrategyReport(unittest.TestCase):
+    """Test exact action EVs and the per-cell error-cost report"""
+
+    def test_exact_values(self):
+        """Known infinite-deck values: 16 v 10 is close, 11 v 6 doubles, 8,8 v 10 splits"""
+        ev = exact_ev(Rules())
+        values = ev.actions('deal', 16, False, 10)
+        self.assertAlmostEqual(values['stand'], -0.5404, places=3)
+        self.assertAlmostEqual(values['hit'], -0.5398, places=3)
+        self.assertEqual(ev.best('deal', 11, False, 6)[0], 'double down')
+        self.assertEqual(ev.best('deal', 16, False, 10, pair=8)[0], 'split')
+        self.assertNotIn('double down', ev.actions('drawn', 11, False, 6))
+
+    def test_optimal_play_costs_nothing(self):
+        """Following the hit/stand table costs nothing once a hand has drawn; only doubles are missed"""
+        strategy = TabularStrategy(exact_ev(Rules()).q_table('drawn'))
+        report = error_cost_report(strategy, Rules(max_splits=0))
+        drawn = [cell['cost'] for cell in report['cells'] if cell['context'] == 'drawn']
+        self.assertAlmostEqual(sum(drawn), 0.0, places=12)
+        worst = report['cells'][0]
+        self.assertEqual((worst['best'], worst['chosen']), ('double down', 'hit'))
+
+    def test_costs_add_up_to_the_ev_gap(self):
+        """Cell costs sum to optimal minus simulated strategy EV; the worst cell comes first"""
+        q = np.zeros((18, 2, 10, 3))
+        q[..., 1] = 1.0
+        q[:8, :, :, 0] = 2.0  # hit below 12, stand on 12 and up
+        strategy = TabularStrategy(q)
+        report = error_cost_report(strategy)
+        simulated = simulate_table_games(strategy, 300_000, seed=1, infinite_deck=True)
+        self.assertLess(abs(report['strategy_ev'] - simulated['avg_reward']), 4 * simulated['std_error'])
+        costs = [cell['cost'] for cell in report['cells']]
+        self.assertEqual(costs, sorted(costs, reverse=True))
+        self.assertAlmostEqual(sum(costs), report['optimal_ev'] - report['strategy_ev'])
+
+    def test_writes_json_and_heatmap(self):
+        """The report is saved as JSON and as a heatmap image"""
+        report = error_cost_report(BasicStrategy())
+        with tempfile.TemporaryDirectory() as directory:
+            path, image = os.path.join(directory, 'r.json'), os.path.join(directory, 'r.png')
+            write_report(report, path, heatmap=image, top=10)
+            with open(path) as f:
+                self.assertEqual(len(json.load(f)['cells']), 10)
+            self.assertGreater(os.path.getsize(image), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
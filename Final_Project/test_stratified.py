@@ -0,0 +1,39 @@
+import unittest
+from basic_strategy import BasicStrategy
+from rules import Rules
+from stratified import initial_deal_strata, simulate_stratified
+from table_engine import simulate_table_games
+
+
+class TestStratified(unittest.TestCase):
+    """Test stratified evaluation over the initial deal"""
+
+    def test_strata_probabilities(self):
+        """Strata cover every initial deal exactly once"""
+        for decks, infinite in [(1, False), (6, False), (1, True)]:
+            strata = initial_deal_strata(decks, infinite)
+            self.assertEqual(len(strata), 10 * 55)
+            self.assertAlmostEqual(sum(p for _, p in strata), 1.0)
+        # Ten up against a pair of Aces, one deck: 16/52 * 4/51 * 3/50
+        probabilities = dict(initial_deal_strata(1))
+        self.assertAlmostEqual(probabilities[(8, 9, 9)], 16 / 52 * 4 / 51 * 3 / 50)
+
+    def test_agrees_with_plain_simulation(self):
+        """The stratified estimate matches plain simulation within their errors"""
+        stratified = simulate_stratified(BasicStrategy(), 60_000, seed=1, infinite_deck=True)
+        plain = simulate_table_games(BasicStrategy(), 200_000, seed=2, infinite_deck=True)
+        difference = abs(stratified['avg_reward'] - plain['avg_reward'])
+        self.assertLess(difference, 4 * (stratified['std_error'] ** 2 + plain['std_error'] ** 2) ** 0.5)
+        self.assertLessEqual(stratified['hands'], 60_000)
+
+    def test_tighter_than_plain_sampling(self):
+        """Stratification removes the variance between initial deals"""
+        result = simulate_stratified(BasicStrategy(), 40_000, seed=3, rules=Rules(num_decks=6))
+        self.assertGreater(result['variance_reduction'], 1.1)
+        self.assertLess(result['std_error'], result['plain_std_error'])
+        with self.assertRaises(ValueError):
+            simulate_stratified(BasicStrategy(), 1000, seed=3)
+
+
+if __name__ == '__main__':
+    unittest.main()
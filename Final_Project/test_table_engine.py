@@ -0,0 +1,55 @@
+import unittest
+import hand_fsm as fsm
+from basic_strategy import BasicStrategy
+from rules import Rules
+from simulation import simulate_games
+from table_engine import simulate_table_games
+
+TEN, ACE = 8, 12
+
+
+class TestHandStateMachine(unittest.TestCase):
+    """Test the packed hand states and their lookup tables"""
+
+    def test_soft_totals_and_blackjack(self):
+        """Aces count 11 while that does not bust the hand"""
+        state = fsm.hand_state([ACE, 4])  # Ace, 6
+        self.assertEqual(fsm.total[state], 17)
+        self.assertTrue(fsm.soft[state])
+        state = int(fsm.next_state[state, TEN])
+        self.assertEqual(fsm.total[state], 17)
+        self.assertFalse(fsm.soft[state])
+        self.assertTrue(fsm.blackjack[fsm.hand_state([ACE, 11])])
+
+    def test_pairs_need_equal_ranks(self):
+        """Jack-King is not a pair; a split hand can pair up again"""
+        self.assertEqual(fsm.pair_rank[fsm.hand_state([9, 11])], -1)
+        self.assertEqual(fsm.pair_rank[fsm.hand_state([6, 6])], 6)
+        self.assertEqual(fsm.pair_rank[fsm.hand_state([6, 6, 2])], -1)
+        self.assertEqual(fsm.pair_rank[int(fsm.next_state[fsm.single_card[6], 6])], 6)
+
+    def test_bust_is_absorbing(self):
+        """Further cards leave a busted hand unchanged"""
+        state = fsm.hand_state([TEN, TEN, TEN])
+        self.assertGreater(fsm.total[state], 21)
+        self.assertEqual(fsm.next_state[state, 0], state)
+
+    def test_dealer_soft_17_rule(self):
+        """Dealer stands on soft 17 only under S17"""
+        soft_17 = fsm.hand_state([ACE, 4])
+        self.assertFalse(fsm.dealer_stands[True][soft_17])
+        self.assertTrue(fsm.dealer_stands[False][soft_17])
+
+
+class TestTableEngine(unittest.TestCase):
+    """The table-driven engine reproduces Game hand for hand"""
+
+    def test_matches_game_engine(self):
+        """Seeded runs give exactly the rewards of simulate_games()"""
+        for rules in (Rules(), Rules(num_decks=2, late_surrender=True, double_after_split=False, max_splits=1)):
+            expected = simulate_games(BasicStrategy(), 3000, rules=rules, seed=11)
+            self.assertEqual(simulate_table_games(BasicStrategy(), 3000, rules=rules, seed=11), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+import numpy as np
+from basic_strategy import BasicStrategy
+from card import Card
+from exact_ev import exact_ev
+from monte_carlo import MonteCarloControl
+from neural_q import NeuralQStrategy
+from qlearning_strategy import QLearningStrategy
+from strategy_report import error_cost_report
+from tabular import TabularStrategy
+from warm_start import chart_q_table, clone_policy, exact_q_table
+
+
+class TestWarmStart(unittest.TestCase):
+    """Test warm-starting the learners from a chart or exact EVs"""
+
+    def setUp(self):
+        self.basic = BasicStrategy()
+        self.chart = chart_q_table(self.basic)
+
+    def test_chart_table_plays_the_chart(self):
+        """The chart table's greedy policy makes the strategy's hit/stand/double decisions"""
+        table = TabularStrategy(self.chart)
+        for total in range(5, 22):
+            for soft in ([False, True] if total >= 13 else [False]):
+                for rank in ['2', '6', '10', 'Ace']:
+                    state = (total, Card('Clubs', rank), soft)
+                    self.assertEqual(table.determine_action(state), self.basic.determine_action(state))
+        # After a hit, soft 17 against a 6 falls back from double to hit
+        soft_17 = self.chart[17 - 4, 1, 6 - 2]
+        self.assertEqual(int(np.argmax(soft_17[:2])), 0)
+
+    def test_starts_at_chart_level(self):
+        """A warm-started learner plays as well as the chart before and during training"""
+        chart_ev = error_cost_report(TabularStrategy(self.chart))['strategy_ev']
+        cold = QLearningStrategy(learning_rate=0.01, exploration_rate=0.1, seed=0).train(50_000)
+        warm = QLearningStrategy(q_table=self.chart, learning_rate=0.01, exploration_rate=0.1,
+                                 seed=0).train(50_000)
+        warm_ev = error_cost_report(warm.greedy())['strategy_ev']
+        self.assertGreater(warm_ev, chart_ev - 0.002)
+        self.assertGreater(warm_ev, error_cost_report(cold.greedy())['strategy_ev'] + 0.01)
+
+    def test_exact_table_and_monte_carlo_prior(self):
+        """Exact EVs seed the table directly, and Monte Carlo as prior returns"""
+        exact = exact_q_table()
+        self.assertAlmostEqual(exact[20 - 4, 0, 10 - 2, 1], exact_ev().stand(20, 10))
+        self.assertTrue(np.all(np.isfinite(exact)))
+        trainer = MonteCarloControl(q_table=exact, prior_visits=50, batch_size=1000)
+        np.testing.assert_allclose(trainer.strategy().get_Q_table(), exact)
+        trainer.train(1000)
+        self.assertEqual(trainer.visits.min(), 25)  # halved prior where no hand goes (soft 5)
+
+    def test_clone_policy(self):
+        """Behaviour cloning makes the network play the chart"""
+        network = NeuralQStrategy(seed=0)
+        loss = clone_policy(network, self.chart)
+        self.assertLess(loss, 0.01)
+        table = TabularStrategy(self.chart)
+        for total in [8, 11, 12, 16, 18, 20]:
+            for rank in ['3', '7', 'King']:
+                state = (total, Card('Clubs', rank), False)
+                self.assertEqual(network.determine_action(state), table.determine_action(state))
+        with self.assertRaises(ValueError):
+            clone_policy(NeuralQStrategy(num_extra_features=1), self.chart)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+"""
+Initial Q-values for the learners, so training starts from a known policy
+instead of an all-zero table.
+
+    q = chart_q_table(BasicStrategy())          # the chart's action wins by `margin`
+    q = exact_q_table(rules)                    # exact per-action EVs (exact_ev)
+    learner = QLearningStrategy(q_table=q, ...)  # likewise DynaQStrategy, HogwildTrainer
+    clone_policy(NeuralQStrategy(), q)          # behaviour cloning for the network
+
+Tabular learners take the table as `q_table`; MonteCarloControl takes it as
+prior returns worth `prior_visits` visits per cell.
+"""
+import numpy as np
+
+from card import Card
+from exact_ev import exact_ev
+from neural_q import encode_features
+from rules import DEFAULT_RULES
+from strategy import ACTION_BITS, HIT_OR_STAND, legal_action
+from tabular import ACTION_INDEX, ACTIONS, Q_SHAPE, TOTALS, UPCARDS
+
+
+def chart_q_table(strategy, margin=1.0, rules=None):
+    """
+    Q-table whose greedy policy is `strategy`'s.
+
+    In every (total, soft, upcard) cell the strategy's action is worth 0 and
+    the others -margin, so the learner keeps the chart until what it learns
+    about an alternative overturns it. Where the chart doubles, its choice
+    when doubling is not allowed sits halfway, so hit-or-stand decisions
+    follow the chart too. Soft totals that cannot occur copy the hard cells.
+    """
+    rules = rules if rules is not None else DEFAULT_RULES
+    if hasattr(strategy, 'set_rules'):
+        strategy.set_rules(rules)
+    q = np.full(Q_SHAPE, -float(margin))
+    for i, total in enumerate(TOTALS):
+        for soft in (0, 1):
+            real_soft = bool(soft) and total >= 12
+            for j, up in enumerate(UPCARDS):
+                state = (total, Card('Spades', 'Ace' if up == 11 else str(up)), real_soft)
+                action = legal_action(strategy, state, HIT_OR_STAND | ACTION_BITS['double down'])
+                q[i, soft, j, ACTION_INDEX[action]] = 0.0
+                if action == 'double down':
+                    q[i, soft, j, ACTION_INDEX[legal_action(strategy, state, HIT_OR_STAND)]] = -margin / 2
+    return q
+
+
+def exact_q_table(rules=None):
+    """Exact EV of every action with optimal play afterwards, in the tabular layout."""
+    return exact_ev(rules).q_table('deal')
+
+
+def clone_policy(network, q_table, steps=3000, batch_size=256, seed=0):
+    """
+    Behaviour cloning: fit a NeuralQStrategy's network to a Q-table (e.g.
+    chart_q_table or exact_q_table) by regression over every state, then sync
+    its target network.
+
+    Returns:
+        mean squared error over the table after fitting
+    """
+    totals, soft, upcards = np.meshgrid(np.array(TOTALS), [0, 1], np.array(UPCARDS), indexing='ij')
+    features = encode_features(totals.ravel(), soft.ravel().astype(np.float32), upcards.ravel())
+    if network.num_features > features.shape[1]:
+        raise ValueError("clone_policy only fits networks without extra features")
+    targets = np.asarray(q_table, dtype=np.float32).reshape(-1, len(ACTIONS))
+    rng = np.random.default_rng(seed)
+    for _ in range(steps):
+        rows = rng.integers(0, len(targets), size=batch_size)
+        q, activations = network.network.forward(features[rows])
+        grads = network.network.backward(activations, 2.0 * (q - targets[rows]) / q.size)
+        network.network.adam_step(grads)
+    network.target.copy_from(network.network)
+    return float(np.mean((network.network.predict(features) - targets) ** 2))